@@ -0,0 +1,60 @@
+"""
+Concurrent login callbacks per worker: sync WristbandAuth.callback() vs AsyncWristbandAuth.acallback().
+
+A sync view under ASGI runs on Django's thread-sensitive executor, so concurrent callbacks queue up behind
+each other's token exchange and userinfo calls. The async path awaits those calls on the event loop. Each
+Wristband API call is simulated with a fixed latency so the numbers reflect scheduling, not the network.
+
+Usage:
+    python benchmarks/bench_async_callback.py [--concurrency 50] [--latency 0.05]
+"""
+
+import argparse
+import asyncio
+import time
+
+from asgiref.sync import sync_to_async
+from common import async_transport, auth_config_kwargs, callback_request, setup_django, sync_transport
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=50, help="Callbacks in flight at once")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per simulated Wristband API call")
+    args = parser.parse_args()
+
+    setup_django()
+
+    import httpx
+    from wristband.django_auth import AuthConfig, CompletedCallbackResult
+
+    from demo_app.async_auth import AsyncWristbandApiClient, AsyncWristbandAuth
+
+    auth = AsyncWristbandAuth(AuthConfig(**auth_config_kwargs()))
+    auth._wristband_api.client = httpx.Client(
+        headers=auth._wristband_api.headers, transport=sync_transport(args.latency)
+    )
+    auth._async_wristband_api = AsyncWristbandApiClient(auth._wristband_api, transport=async_transport(args.latency))
+
+    # Django runs sync views under ASGI with sync_to_async(thread_sensitive=True)
+    sync_callback = sync_to_async(auth.callback)
+
+    async def run(label: str, callback) -> None:  # type: ignore[no-untyped-def]
+        requests = [callback_request(auth) for _ in range(args.concurrency)]
+        start = time.perf_counter()
+        results = await asyncio.gather(*(callback(request) for request in requests))
+        elapsed = time.perf_counter() - start
+        assert all(isinstance(result, CompletedCallbackResult) for result in results)  # nosec B101
+        rate = args.concurrency / elapsed
+        print(f"{label:<28} {args.concurrency} callbacks in {elapsed:7.3f}s -> {rate:8.1f} callbacks/s")
+
+    async def bench() -> None:
+        print(f"Simulated Wristband latency: {args.latency * 1000:.0f}ms per call (token exchange + userinfo)")
+        await run("before: sync callback()", sync_callback)
+        await run("after:  async acallback()", auth.acallback)
+
+    asyncio.run(bench())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+N JWT hello operations as N calls to /api/drf/jwt-hello/ vs one call to /api/drf/batch/.
+
+Each single call pays for the middleware stack, DRF dispatch and JWT authentication; a batch pays for them
+once. Tokens are signed by a local stub of Wristband (see stub_wristband.py), which also serves the JWKS,
+so validation runs exactly as in production. With --no-jwt-cache every call verifies the token signature
+again, as it would for tokens the JWT cache hasn't seen.
+
+Usage:
+    python benchmarks/bench_batch.py [--rounds 200] [--sizes 1,5,10,25,50] [--no-jwt-cache]
+"""
+
+import argparse
+import os
+import time
+from typing import Any
+
+from common import setup_django
+from stub_wristband import StubWristbandServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=200, help="Repetitions per batch size")
+    parser.add_argument("--sizes", default="1,5,10,25,50", help="Comma-separated numbers of operations")
+    parser.add_argument("--no-jwt-cache", action="store_true", help="Verify the JWT signature on every call")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+
+    with StubWristbandServer() as server:
+        os.environ["APPLICATION_VANITY_DOMAIN"] = server.vanity_domain
+        setup_django()
+
+        from django.conf import settings
+        from django.test import Client
+
+        if args.no_jwt_cache:
+            settings.WRISTBAND_JWT_CACHE_SIZE = 0
+        settings.BATCH_MAX_OPERATIONS = max(settings.BATCH_MAX_OPERATIONS, *sizes)
+
+        token = server.sign_access_token("bench-user", 3600)
+        client = Client(HTTP_HOST="localhost", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+        # Warm up: JWKS fetch, lazy DRF imports and auth objects
+        _post(client, "/api/drf/jwt-hello/", {"action": "hello"})
+        _post(client, "/api/drf/batch/", [{"action": "hello"}])
+
+        print(f"JWT cache: {'off' if args.no_jwt_cache else 'on'}")
+        print(f"{'operations':>10}{'single us/op':>14}{'batch us/op':>13}{'speedup':>9}")
+        for size in sizes:
+            operations = [{"action": "hello"} for _ in range(size)]
+
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                for operation in operations:
+                    _post(client, "/api/drf/jwt-hello/", operation)
+            single_us = (time.perf_counter() - start) / (args.rounds * size) * 1_000_000
+
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                response = _post(client, "/api/drf/batch/", operations)
+            batch_us = (time.perf_counter() - start) / (args.rounds * size) * 1_000_000
+
+            assert all(result["status"] == 200 for result in response.json()["results"])  # nosec B101
+            print(f"{size:>10}{single_us:>14.1f}{batch_us:>13.1f}{single_us / batch_us:>8.1f}x")
+
+
+def _post(client: Any, path: str, body: Any) -> Any:
+    response = client.post(path, body, content_type="application/json")
+    assert response.status_code == 200, (path, response.status_code, response.content)  # nosec B101
+    return response
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Connections and TLS handshakes per login: the SDK's own HTTP clients vs the demo's pooled client.
+
+Runs a few complete logins (callback + logout) against a local HTTPS stub of Wristband, pausing between
+them the way real logins are spread out. The SDK's clients close connections that sit idle for 5 seconds
+and auto-configuration uses a separate client, so every login pays a new handshake. The pooled client keeps
+connections for WRISTBAND_AUTH["http_client"]["keepalive_expiry"] and shares them with auto-configuration.
+
+Usage:
+    python benchmarks/bench_connection_reuse.py [--logins 4] [--gap 6]
+"""
+
+import argparse
+import time
+from typing import Any
+
+from common import TENANT_NAME, auth_config_kwargs, callback_request, setup_django
+from stub_wristband import StubWristbandServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=4, help="Logins (callback + logout) per client")
+    parser.add_argument("--gap", type=float, default=6.0, help="Seconds between logins")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.test import RequestFactory
+    from wristband.django_auth import AuthConfig, CompletedCallbackResult, LogoutConfig, WristbandAuth
+
+    from demo_app.http_client import HttpClientConfig, PooledHttpClientMixin
+
+    class PooledWristbandAuth(PooledHttpClientMixin, WristbandAuth):
+        pass
+
+    with StubWristbandServer() as server:
+        config_kwargs = {
+            **auth_config_kwargs(),
+            "wristband_application_vanity_domain": server.vanity_domain,
+            "auto_configure_enabled": True,
+            "login_url": None,
+            "redirect_uri": None,
+        }
+
+        def run(label: str, auth: Any) -> None:
+            server.reset_counters()
+            durations = []
+            for index in range(args.logins):
+                if index:
+                    time.sleep(args.gap)
+                start = time.perf_counter()
+                result = auth.callback(callback_request(auth))
+                assert isinstance(result, CompletedCallbackResult)  # nosec B101
+                auth.logout(
+                    RequestFactory().get("/api/auth/logout/", HTTP_HOST="localhost"),
+                    LogoutConfig(refresh_token=result.callback_data.refresh_token, tenant_name=TENANT_NAME),
+                )
+                durations.append(time.perf_counter() - start)
+
+            counters = server.counters
+            average_ms = sum(durations) / len(durations) * 1000
+            print(
+                f"{label:<26} {counters['requests']:>3} requests, {counters['connections']:>3} connections, "
+                f"{counters['tls_handshakes']:>3} TLS handshakes, {average_ms:6.1f}ms per login"
+            )
+
+        print(f"{args.logins} logins, {args.gap:g}s apart, against {server.vanity_domain}")
+        run("before: SDK clients", WristbandAuth(AuthConfig(**config_kwargs)))
+        pooled = PooledWristbandAuth(AuthConfig(**config_kwargs), http_client_config=HttpClientConfig())
+        run("after:  pooled client", pooled)
+        print(f"Client-side counters: {pooled.connection_stats.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+JSON work per request for the hello APIs and the DRF session/token endpoints: stock Django/DRF vs fast_json.
+
+Times exactly what the views do with their payloads: parse the {"action": "hello"} body, format the
+timestamp, and encode the response, through JsonResponse (classic views) or JSONRenderer (DRF views).
+
+Usage:
+    python benchmarks/bench_json.py [--number 50000]
+"""
+
+import argparse
+import io
+import json
+import timeit
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from common import setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=50000, help="Iterations per case")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.http import JsonResponse
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from wristband.django_auth.models import SessionResponse, TokenResponse
+
+    from demo_app.drf_json import FastJSONParser, FastJSONRenderer
+    from demo_app.fast_json import HAS_ORJSON, FastJsonResponse, current_timestamp, loads
+
+    body = b'{"action": "hello"}'
+    session_data = SessionResponse(
+        tenant_id="bench-tenant", user_id="bench-user", metadata={"email": "bench-user@example.com"}
+    ).to_dict()
+    token_data = TokenResponse(access_token="eyJhbGciOiJSUzI1NiJ9." + "x" * 700, expires_at=1793000000000).to_dict()
+    drf_parser, drf_renderer = JSONParser(), JSONRenderer()
+    fast_parser, fast_renderer = FastJSONParser(), FastJSONRenderer()
+
+    def stock_timestamp() -> str:
+        return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    cases: List[Tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+        (
+            "classic hello (parse + response)",
+            lambda: JsonResponse(classic_hello(json.loads(body), stock_timestamp())),
+            lambda: FastJsonResponse(classic_hello(loads(body), current_timestamp())),
+        ),
+        (
+            "DRF jwt hello (parse + render)",
+            lambda: drf_renderer.render(jwt_hello(drf_parser.parse(io.BytesIO(body)), stock_timestamp())),
+            lambda: fast_renderer.render(jwt_hello(fast_parser.parse(io.BytesIO(body)), current_timestamp())),
+        ),
+        (
+            "DRF session endpoint (render)",
+            lambda: drf_renderer.render(session_data),
+            lambda: fast_renderer.render(session_data),
+        ),
+        (
+            "DRF token endpoint (render)",
+            lambda: drf_renderer.render(token_data),
+            lambda: fast_renderer.render(token_data),
+        ),
+    ]
+
+    print(f"fast_json backend: {'orjson' if HAS_ORJSON else 'stdlib json'}")
+    print(f"{'case':<36}{'before us':>11}{'after us':>10}{'speedup':>9}")
+    for label, before, after in cases:
+        before_us = timeit.timeit(before, number=args.number) / args.number * 1_000_000
+        after_us = timeit.timeit(after, number=args.number) / args.number * 1_000_000
+        print(f"{label:<36}{before_us:>11.2f}{after_us:>10.2f}{before_us / after_us:>8.1f}x")
+
+
+def classic_hello(data: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+    """The response the classic hello views build for a valid request."""
+    assert data["action"] == "hello"  # nosec B101
+    return {"message": "Hello World!", "timestamp": timestamp}
+
+
+def jwt_hello(data: Dict[str, Any], timestamp: str) -> Dict[str, Any]:
+    """The response DrfJwtHelloApi builds for a valid request."""
+    assert data["action"] == "hello"  # nosec B101
+    return {
+        "message": "Hello World from DRF JWT!",
+        "timestamp": timestamp,
+        "userId": "bench-user",
+        "tenantId": "bench-tenant",
+    }
+
+
+if __name__ == "__main__":
+    main()
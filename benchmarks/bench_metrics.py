@@ -0,0 +1,58 @@
+"""
+Cost of the /metrics instrumentation: recording an observation, and MetricsMiddleware around a trivial view.
+
+Usage:
+    python benchmarks/bench_metrics.py [--number 200000]
+"""
+
+import argparse
+import timeit
+
+from common import setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=200000, help="Iterations per case")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.http import HttpRequest, HttpResponse
+    from django.test import RequestFactory
+    from django.urls import resolve
+
+    from demo_app.metrics import AUTH_PHASE_DURATION, REQUEST_DURATION, MetricsMiddleware, render_metrics, timed_phase
+
+    response = HttpResponse()
+    request = RequestFactory().get("/api/drf/session/")
+    request.resolver_match = resolve(request.path_info)
+
+    def view(request: HttpRequest) -> HttpResponse:
+        return response
+
+    middleware = MetricsMiddleware(view)
+
+    def phase() -> None:
+        with timed_phase("bench"):
+            pass
+
+    cases = [
+        ("Histogram.observe()", lambda: AUTH_PHASE_DURATION.observe(0.0003, "bench")),
+        ("timed_phase() block", phase),
+        ("view without middleware", lambda: view(request)),
+        ("view with MetricsMiddleware", lambda: middleware(request)),
+    ]
+
+    print(f"{'case':<32}{'us/call':>9}")
+    for label, case in cases:
+        seconds = timeit.timeit(case, number=args.number)
+        print(f"{label:<32}{seconds / args.number * 1_000_000:>9.2f}")
+
+    render_seconds = timeit.timeit(render_metrics, number=1000) / 1000
+    print(f"{'render_metrics()':<32}{render_seconds * 1_000_000:>9.2f}")
+    print(f"series recorded: {len(REQUEST_DURATION.snapshot()) + len(AUTH_PHASE_DURATION.snapshot())}")
+
+
+if __name__ == "__main__":
+    main()
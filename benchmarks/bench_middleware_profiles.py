@@ -0,0 +1,101 @@
+"""
+Per-request overhead of the full middleware chain vs the jwt_api middleware profile on the JWT API routes.
+
+Each request carries a valid bearer token and, like a browser calling the API from the demo pages, the
+encrypted session cookie too. With the full chain, the request and response pass through session, CSRF, auth,
+messages and clickjacking middleware (the session is loaded lazily, so the cookie is only decrypted if
+something reads it); the jwt_api profile skips them (see demo_app/middleware_profiles.py). Requests go
+straight to a handler's middleware chain, without a test client or server in the way. Tokens are signed by
+the local Wristband stub (see stub_wristband.py), whose JWKS is fetched once during warm-up; verified tokens
+are then served from the JWT cache, as they would be for an SPA.
+
+Usage:
+    python benchmarks/bench_middleware_profiles.py [--requests 5000] [--rounds 10]
+"""
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict
+
+from common import setup_django, token_payload
+from stub_wristband import StubWristbandServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per route and chain")
+    parser.add_argument("--rounds", type=int, default=10, help="Rounds the requests are split into")
+    args = parser.parse_args()
+
+    with StubWristbandServer() as server:
+        os.environ["APPLICATION_VANITY_DOMAIN"] = server.vanity_domain
+        setup_django()
+
+        from django.conf import settings
+        from django.core.handlers.base import BaseHandler
+        from django.test import RequestFactory
+
+        from demo_app.sessions.backends.encrypted_cookies import SessionStore
+
+        access_token = server.sign_access_token("bench-user", 3600)
+        session = SessionStore()
+        session.update(
+            {
+                "is_authenticated": True,
+                "access_token": access_token,
+                "refresh_token": token_payload()["refresh_token"],
+                "expires_at": int(time.time() * 1000) + 3_600_000,
+                "user_id": "bench-user",
+                "tenant_id": "bench-tenant",
+                "tenant_name": "acme",
+                "email": "bench-user@example.com",
+                "given_name": "Bench",
+            }
+        )
+        session.save()
+
+        # The handlers build their middleware chains, from the settings of the time, in load_middleware()
+        profiles = settings.MIDDLEWARE_PROFILES
+        handlers: Dict[str, BaseHandler] = {}
+        for label, chain_profiles in (("full", {}), ("profile", profiles)):
+            settings.MIDDLEWARE_PROFILES = chain_profiles
+            handlers[label] = BaseHandler()
+            handlers[label].load_middleware()
+        settings.MIDDLEWARE_PROFILES = profiles
+
+        factory = RequestFactory(
+            HTTP_HOST="localhost",
+            HTTP_AUTHORIZATION=f"Bearer {access_token}",
+            HTTP_COOKIE=f"{settings.SESSION_COOKIE_NAME}={session.session_key}",
+        )
+        body = json.dumps({"action": "hello"})
+        routes = ["/api/classic/jwt-hello/", "/api/drf/jwt-hello/"]
+
+        print(f"{'route':<26}{'full us':>9}{'profile us':>12}{'saved us':>10}")
+        for path in routes:
+            timings: Dict[str, float] = dict.fromkeys(handlers, 0.0)
+            # Alternate the chains in rounds, so that drift in machine load affects both alike
+            for _ in range(args.rounds):
+                for label, handler in handlers.items():
+                    timings[label] += _time_requests(handler, factory, path, body, args.requests // args.rounds)
+            full, profile = (timings[label] / args.rounds for label in handlers)
+            print(f"{path:<26}{full:>9.1f}{profile:>12.1f}{full - profile:>10.1f}")
+
+
+def _time_requests(handler: Any, factory: Any, path: str, body: str, requests: int) -> float:
+    """Mean microseconds per POST of a path through the handler's middleware chain."""
+    response = handler.get_response(factory.post(path, body, content_type="application/json"))
+    assert response.status_code == 200, (path, response.status_code)  # nosec B101
+    elapsed = 0.0
+    for _ in range(requests):
+        request = factory.post(path, body, content_type="application/json")
+        start = time.perf_counter()
+        handler.get_response(request)
+        elapsed += time.perf_counter() - start
+    return elapsed / requests * 1_000_000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Page requests with and without FAST_PAGE_RENDERING: anonymous and logged-in pages, and 304 revalidations.
+
+The setting is read at startup, so each mode runs in its own process:
+
+Usage:
+    python benchmarks/bench_pages.py [--requests 2000]
+    python benchmarks/bench_pages.py --fast [--requests 2000]
+"""
+
+import argparse
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from common import setup_django, token_payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per case")
+    parser.add_argument("--fast", action="store_true", help="Enable FAST_PAGE_RENDERING")
+    args = parser.parse_args()
+
+    os.environ["FAST_PAGE_RENDERING"] = str(args.fast)
+    setup_django()
+
+    from django.conf import settings
+    from django.test import Client
+
+    from demo_app.sessions.backends.encrypted_cookies import SessionStore
+
+    # A session shaped like the one the callback view creates
+    session = SessionStore()
+    session.update(
+        {
+            "is_authenticated": True,
+            "access_token": token_payload()["access_token"],
+            "refresh_token": token_payload()["refresh_token"],
+            "expires_at": int(time.time() * 1000) + 3_600_000,
+            "user_id": "bench-user",
+            "tenant_id": "bench-tenant",
+            "tenant_name": "acme",
+            "identity_provider_name": "wristband",
+            "email": "bench-user@example.com",
+            "given_name": "Bench",
+        }
+    )
+    session.save()
+
+    anonymous = Client(HTTP_HOST="localhost", HTTP_ACCEPT_ENCODING="gzip, br")
+    user = Client(HTTP_HOST="localhost", HTTP_ACCEPT_ENCODING="gzip, br")
+    user.cookies[settings.SESSION_COOKIE_NAME] = session.session_key or ""
+
+    cases: List[Tuple[str, Any, str]] = [
+        ("anonymous home", anonymous, "/"),
+        ("logged-in home", user, "/"),
+        ("logged-in classic", user, "/classic/"),
+        ("logged-in drf", user, "/django-rest-framework/"),
+    ]
+
+    print(f"FAST_PAGE_RENDERING={settings.FAST_PAGE_RENDERING}")
+    print(f"{'case':<22}{'200 us':>9}{'bytes':>8}{'304 us':>9}")
+    for label, client, path in cases:
+        first = client.get(path)
+        assert first.status_code == 200, (path, first.status_code)  # nosec B101
+        full_us = _time_requests(client, path, {}, args.requests)
+
+        etag = first.get("ETag")
+        revalidate = (
+            f"{_time_requests(client, path, {'HTTP_IF_NONE_MATCH': etag}, args.requests):>9.1f}" if etag else "-"
+        )
+        print(f"{label:<22}{full_us:>9.1f}{len(first.content):>8}{revalidate:>9}")
+
+
+def _time_requests(client: Any, path: str, headers: Dict[str, str], requests: int) -> float:
+    """Mean microseconds per GET of a path."""
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get(path, **headers)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Session loads for an unchanged cookie: the SDK's encrypted cookie engine vs the cached engine.
+
+The DRF page sends its session and token requests back to back with the same cookie. Each one loads the
+session; the SDK engine decrypts the cookie every time, while the cached engine decrypts it once.
+
+Usage:
+    python benchmarks/bench_session_cache.py [--loads 20000]
+"""
+
+import argparse
+import time
+
+from common import setup_django, token_payload
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=20000, help="Session loads per engine")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from wristband.django_auth.sessions.backends.encrypted_cookies import SessionStore as EncryptedCookieSessionStore
+
+    from demo_app.sessions.backends.cached_encrypted_cookies import SessionStore as CachedSessionStore
+    from demo_app.sessions.backends.cached_encrypted_cookies import session_cache
+
+    # A session shaped like the one the callback view creates
+    session = EncryptedCookieSessionStore()
+    session.update(
+        {
+            "is_authenticated": True,
+            "access_token": token_payload()["access_token"],
+            "refresh_token": token_payload()["refresh_token"],
+            "expires_at": int(time.time() * 1000) + 3_600_000,
+            "user_id": "bench-user",
+            "tenant_id": "bench-tenant",
+            "tenant_name": "acme",
+            "identity_provider_name": "wristband",
+            "email": "bench-user@example.com",
+            "given_name": "Bench",
+        }
+    )
+    session.save()
+    cookie = session.session_key
+
+    for label, store_class in (
+        ("before: encrypted_cookies", EncryptedCookieSessionStore),
+        ("after:  cached", CachedSessionStore),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.loads):
+            store = store_class(cookie)
+            assert store["tenant_name"] == "acme"  # nosec B101
+        elapsed = time.perf_counter() - start
+        per_load = elapsed / args.loads * 1_000_000
+        print(f"{label:<28} {args.loads} loads in {elapsed:7.3f}s -> {per_load:6.1f}us per load")
+
+    print(f"Cache stats: {session_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Session cookie size and session load cost: the SDK's encrypted cookie engine vs the server-side engine.
+
+The encrypted cookie carries the whole session, so it's uploaded with every request the browser makes to the
+app (pages, static files, API calls) and decrypted whenever the session is loaded. The server-side engine's
+cookie is a signed session ID; loading the session checks the signature and looks the ID up in its store
+("memory", or "cache" with the default CACHES entry, a LocMemCache that pickles like Redis would).
+
+The session is shaped like the one the callback view creates, with a signed access token of realistic size
+from the local Wristband stub (see stub_wristband.py).
+
+Usage:
+    python benchmarks/bench_session_store.py [--loads 20000] [--requests-per-page 8]
+"""
+
+import argparse
+import time
+from typing import Any, Dict
+
+from common import setup_django, token_payload
+from stub_wristband import StubWristbandServer
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--loads", type=int, default=20000, help="Session loads per engine")
+    parser.add_argument(
+        "--requests-per-page", type=int, default=8, help="Requests carrying the cookie per page view (page, CSS, JS...)"
+    )
+    args = parser.parse_args()
+
+    with StubWristbandServer() as server:
+        access_token = server.sign_access_token("bench-user", 3600)
+    setup_django()
+
+    from django.conf import settings
+    from wristband.django_auth.sessions.backends.encrypted_cookies import SessionStore as EncryptedCookieSessionStore
+
+    from demo_app.sessions.backends.server_side import SessionStore as ServerSideSessionStore
+
+    session_data = {
+        "is_authenticated": True,
+        "access_token": access_token,
+        "refresh_token": token_payload()["refresh_token"],
+        "expires_at": int(time.time() * 1000) + 3_600_000,
+        "user_id": "bench-user",
+        "tenant_id": "bench-tenant",
+        "tenant_name": "acme",
+        "identity_provider_name": "wristband",
+        "email": "bench-user@example.com",
+        "given_name": "Bench",
+    }
+
+    engines: Dict[str, Any] = {
+        "encrypted_cookies": (EncryptedCookieSessionStore, None),
+        "server_side (memory)": (ServerSideSessionStore, "memory"),
+        "server_side (cache)": (ServerSideSessionStore, "cache"),
+    }
+
+    print(f"{'engine':<22}{'bytes/request':>14}{'bytes/page':>12}{'us/load':>9}")
+    for label, (store_class, store) in engines.items():
+        if store is not None:
+            settings.WRISTBAND_SESSION_STORE = store
+
+        session = store_class()
+        session.update(session_data)
+        session.save()
+        cookie = session.session_key
+        # What the browser sends on each request: "Cookie: sessionid=<value>"
+        header_bytes = len(f"Cookie: {settings.SESSION_COOKIE_NAME}={cookie}\r\n")
+
+        start = time.perf_counter()
+        for _ in range(args.loads):
+            loaded = store_class(cookie)
+            assert loaded["tenant_name"] == "acme"  # nosec B101
+        per_load = (time.perf_counter() - start) / args.loads * 1_000_000
+
+        print(f"{label:<22}{header_bytes:>14}{header_bytes * args.requests_per_page:>12}{per_load:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
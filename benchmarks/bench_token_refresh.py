@@ -0,0 +1,73 @@
+"""
+Concurrent session token refreshes: the SDK's refresh_token_if_expired() vs the single-flight coordinator.
+
+Simulates parallel requests (several tabs, or the DRF page's session and token fetches) that all carry the
+same session just as its access token expires. Each request thread asks for a refresh; the numbers show how
+many calls reach the Wristband token endpoint and how long the slowest request waited.
+
+Usage:
+    python benchmarks/bench_token_refresh.py [--concurrency 32] [--latency 0.1]
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import httpx
+from common import auth_config_kwargs, route_api_request, setup_django
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests needing a refresh at once")
+    parser.add_argument("--latency", type=float, default=0.1, help="Seconds per simulated token endpoint call")
+    args = parser.parse_args()
+
+    setup_django()
+
+    from wristband.django_auth import AuthConfig, WristbandAuth
+
+    from demo_app.token_refresh import SingleFlightRefreshMixin
+
+    class SingleFlightWristbandAuth(SingleFlightRefreshMixin, WristbandAuth):
+        pass
+
+    def run(label: str, auth: Any) -> None:
+        calls = 0
+        calls_lock = threading.Lock()
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal calls
+            with calls_lock:
+                calls += 1
+            time.sleep(args.latency)
+            return route_api_request(request)
+
+        auth._wristband_api.client = httpx.Client(
+            headers=auth._wristband_api.headers, transport=httpx.MockTransport(handler)
+        )
+        expired_at = int(time.time() * 1000) - 1
+        barrier = threading.Barrier(args.concurrency)
+
+        def request_refresh(_: int) -> float:
+            barrier.wait()
+            start = time.perf_counter()
+            assert auth.refresh_token_if_expired("bench-refresh-token", expired_at) is not None  # nosec B101
+            return time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            waits = list(executor.map(request_refresh, range(args.concurrency)))
+
+        print(f"{label:<24} {calls:>3} token endpoint calls, slowest request waited {max(waits) * 1000:7.1f}ms")
+
+    print(f"{args.concurrency} concurrent requests, {args.latency * 1000:.0f}ms per token endpoint call")
+    run("before: SDK", WristbandAuth(AuthConfig(**auth_config_kwargs())))
+    after = SingleFlightWristbandAuth(AuthConfig(**auth_config_kwargs()))
+    run("after:  single-flight", after)
+    print(f"Coordinator stats: {after.token_refresh_coordinator.stats()}")
+
+
+if __name__ == "__main__":
+    main()
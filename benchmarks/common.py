@@ -0,0 +1,133 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Benchmarks never talk to a real Wristband application. They configure Django with dummy credentials and
+answer Wristband API calls with canned responses that take a configurable amount of time.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+TENANT_NAME = "acme"
+VANITY_DOMAIN = "bench.wristband.test"
+CLIENT_ID = "bench-client-id"
+CLIENT_SECRET = "bench-client-secret-0123456789abcdef"  # nosec B105 - benchmark only
+
+
+def setup_django() -> None:
+    """Configure demo_project settings with dummy Wristband credentials."""
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "demo_project.settings")
+    os.environ.setdefault("CLIENT_ID", CLIENT_ID)
+    os.environ.setdefault("CLIENT_SECRET", CLIENT_SECRET)
+    os.environ.setdefault("APPLICATION_VANITY_DOMAIN", VANITY_DOMAIN)
+
+    import django
+
+    django.setup()
+
+    # Per-request logging from httpx and the SDK would dominate the timings
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("wristband").setLevel(logging.WARNING)
+
+
+def auth_config_kwargs() -> Dict[str, Any]:
+    """WristbandAuth config that needs no SDK auto-configuration round-trip."""
+    return {
+        "client_id": CLIENT_ID,
+        "client_secret": CLIENT_SECRET,
+        "wristband_application_vanity_domain": VANITY_DOMAIN,
+        "auto_configure_enabled": False,
+        "login_url": "http://localhost:6001/api/auth/login/",
+        "redirect_uri": "http://localhost:6001/api/auth/callback/",
+        "dangerously_disable_secure_cookies": True,
+        "scopes": ["openid", "offline_access", "email", "profile", "roles"],
+    }
+
+
+def token_payload() -> Dict[str, Any]:
+    return {
+        "access_token": "bench-access-token",
+        "token_type": "Bearer",
+        "expires_in": 1800,
+        "refresh_token": "bench-refresh-token",
+        "id_token": "bench-id-token",
+        "scope": "openid offline_access email profile roles",
+    }
+
+
+def userinfo_payload(user_id: str = "bench-user") -> Dict[str, Any]:
+    return {
+        "sub": user_id,
+        "tnt_id": "bench-tenant",
+        "app_id": "bench-app",
+        "idp_name": "wristband",
+        "email": f"{user_id}@example.com",
+        "given_name": "Bench",
+        "roles": [{"id": "r1", "name": "app:bench:owner", "displayName": "Owner"}],
+    }
+
+
+def route_api_request(request: httpx.Request) -> httpx.Response:
+    """Canned response for a Wristband API request, routed by path."""
+    path = request.url.path
+    if path.endswith("/oauth2/token"):
+        return httpx.Response(200, json=token_payload())
+    if path.endswith("/oauth2/userinfo"):
+        return httpx.Response(200, json=userinfo_payload())
+    if path.endswith("/oauth2/revoke"):
+        return httpx.Response(200)
+    return httpx.Response(404, json={"error": "not_found"})
+
+
+def sync_transport(latency: float) -> httpx.MockTransport:
+    """Transport that blocks the calling thread for `latency` seconds per request."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return route_api_request(request)
+
+    return httpx.MockTransport(handler)
+
+
+def async_transport(latency: float) -> httpx.MockTransport:
+    """Transport that awaits `latency` seconds per request without blocking the event loop."""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return route_api_request(request)
+
+    return httpx.MockTransport(handler)
+
+
+def start_login(auth: Any) -> Tuple[str, str, str]:
+    """Run the login endpoint once and return (state, login state cookie name, cookie value)."""
+    from django.test import RequestFactory
+
+    request = RequestFactory().get("/api/auth/login/", {"tenant_name": TENANT_NAME})
+    response = auth.login(request)
+    state = parse_qs(urlparse(response["Location"]).query)["state"][0]
+    cookie_name, morsel = next((name, m) for name, m in response.cookies.items() if name.startswith("login#"))
+    return state, cookie_name, morsel.value
+
+
+def callback_request(auth: Any) -> Any:
+    """Build a valid callback request, as served under ASGI, for a freshly started login."""
+    from django.test import AsyncRequestFactory
+
+    state, cookie_name, cookie_value = start_login(auth)
+    request = AsyncRequestFactory().get(
+        "/api/auth/callback/", {"code": "bench-code", "state": state, "tenant_name": TENANT_NAME}
+    )
+    request.COOKIES[cookie_name] = cookie_value
+    return request
@@ -0,0 +1,246 @@
+"""
+End-to-end load test of the demo app under uvicorn (ASGI) and gunicorn (WSGI).
+
+Starts a local HTTPS stub of Wristband (see stub_wristband.py), launches the app against it, and has a number
+of concurrent virtual users repeat the whole flow a real user goes through:
+
+    login -> (Wristband authorize) -> callback -> classic/ -> api/classic/session-hello/
+          -> api/drf/jwt-hello/ -> logout
+
+Each virtual user logs in as its own user, so callbacks also exercise user sync. Reports p50/p95/p99 latency
+and requests/sec for every app route. The app uses its configured database (db.sqlite3 by default), so the
+test users end up there; migrations are applied before the run.
+
+Usage:
+    python benchmarks/loadtest.py [--server both] [--users 8] [--iterations 10] [--workers 2] [--json out.json]
+"""
+
+import argparse
+import codecs
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess  # nosec B404 - launches the app servers under test
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple
+
+import httpx
+from common import BASE_DIR, CLIENT_ID, CLIENT_SECRET, TENANT_NAME
+from stub_wristband import StubWristbandServer
+
+ROUTES = ("login", "callback", "classic", "session-hello", "jwt-hello", "logout")
+
+SERVER_LABELS = {"uvicorn": "uvicorn (ASGI)", "gunicorn": "gunicorn (WSGI)"}
+
+ACCESS_TOKEN_PATTERN = re.compile(r"const accessToken = '([^']*)'")
+
+# (route, seconds, succeeded)
+Sample = Tuple[str, float, bool]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def server_command(server: str, port: int, workers: int, threads: int) -> List[str]:
+    if server == "uvicorn":
+        return [
+            *(sys.executable, "-m", "uvicorn", "demo_project.asgi:application"),
+            *("--host", "127.0.0.1", "--port", str(port), "--workers", str(workers)),
+            *("--log-level", "warning", "--no-access-log"),
+        ]
+    return [
+        *(sys.executable, "-m", "gunicorn", "demo_project.wsgi:application"),
+        *("--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", str(threads)),
+        *("--log-level", "warning"),
+    ]
+
+
+@contextmanager
+def app_server(command: List[str], env: Dict[str, str], base_url: str, verbose: bool) -> Iterator[None]:
+    """Run an app server until the block exits, waiting until it answers requests."""
+    output = None if verbose else subprocess.DEVNULL
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=output, stderr=output)  # nosec B603
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"{command[2]} exited with status {process.returncode}")
+            try:
+                if httpx.get(f"{base_url}/robots.txt").status_code == 200:
+                    break
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{command[2]} did not start within 30s")
+            time.sleep(0.2)
+        yield
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_flow(app: httpx.Client, stub: httpx.Client, user_id: str, samples: List[Sample]) -> None:
+    """One pass through the user flow, appending a sample per app request."""
+
+    def timed(route: str, expected_status: int, method: str, url: str, **kwargs: object) -> httpx.Response:
+        start = time.perf_counter()
+        response = app.request(method, url, **kwargs)  # type: ignore[arg-type]
+        samples.append((route, time.perf_counter() - start, response.status_code == expected_status))
+        return response
+
+    response = timed(
+        "login", 302, "GET", "/api/auth/login/", params={"tenant_name": TENANT_NAME, "login_hint": user_id}
+    )
+
+    # The authorize URL is on a tenant subdomain of the vanity domain; the stub serves it on its own address
+    authorize_url = httpx.URL(response.headers["Location"])
+    authorized = stub.get(authorize_url.raw_path.decode("ascii"))
+
+    timed("callback", 302, "GET", authorized.headers["Location"])
+
+    response = timed("classic", 200, "GET", "/classic/")
+    match = ACCESS_TOKEN_PATTERN.search(response.text)
+    access_token = codecs.decode(match.group(1), "unicode_escape") if match else ""
+
+    csrf_headers = {"X-CSRFToken": app.cookies.get("csrftoken", "")}
+    timed("session-hello", 200, "POST", "/api/classic/session-hello/", json={"action": "hello"}, headers=csrf_headers)
+
+    bearer_headers = {"Authorization": f"Bearer {access_token}"}
+    timed("jwt-hello", 200, "POST", "/api/drf/jwt-hello/", json={"action": "hello"}, headers=bearer_headers)
+
+    timed("logout", 302, "GET", "/api/auth/logout/")
+
+
+def run_load(
+    app_base_url: str, stub_base_url: str, users: int, iterations: int, warmup: int
+) -> Tuple[List[Sample], float]:
+    """Run every virtual user's flows concurrently; returns the samples and the wall-clock time they took."""
+    samples: List[Sample] = []
+    samples_lock = threading.Lock()
+    errors: List[BaseException] = []
+    barrier = threading.Barrier(users + 1)
+
+    def virtual_user(index: int) -> None:
+        user_id = f"loadtest-user-{index}"
+        local_samples: List[Sample] = []
+        try:
+            with (
+                httpx.Client(base_url=app_base_url, timeout=30) as app,
+                httpx.Client(base_url=stub_base_url, timeout=30) as stub,
+            ):
+                for _ in range(warmup):
+                    run_flow(app, stub, user_id, [])
+                barrier.wait()
+                for _ in range(iterations):
+                    run_flow(app, stub, user_id, local_samples)
+        except BaseException as e:
+            errors.append(e)
+            barrier.abort()
+        with samples_lock:
+            samples.extend(local_samples)
+
+    threads = [threading.Thread(target=virtual_user, args=(index,)) for index in range(users)]
+    for thread in threads:
+        thread.start()
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        pass
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    if errors:
+        raise RuntimeError(f"{len(errors)} virtual user(s) failed") from errors[0]
+    return samples, elapsed
+
+
+def summarize(samples: List[Sample], elapsed: float) -> Dict[str, Dict[str, float]]:
+    """Per-route count, errors, p50/p95/p99 latency in milliseconds and requests/sec."""
+    summary: Dict[str, Dict[str, float]] = {}
+    for route in ROUTES:
+        durations = sorted(seconds * 1000 for name, seconds, _ in samples if name == route)
+        if not durations:
+            continue
+        cuts = statistics.quantiles(durations, n=100, method="inclusive") if len(durations) > 1 else durations * 99
+        summary[route] = {
+            "count": len(durations),
+            "errors": sum(1 for name, _, ok in samples if name == route and not ok),
+            "p50_ms": round(cuts[49], 2),
+            "p95_ms": round(cuts[94], 2),
+            "p99_ms": round(cuts[98], 2),
+            "rps": round(len(durations) / elapsed, 1),
+        }
+    return summary
+
+
+def print_summary(label: str, summary: Dict[str, Dict[str, float]], elapsed: float) -> None:
+    total = sum(int(route["count"]) for route in summary.values())
+    print(f"\n{label}: {total} requests in {elapsed:.2f}s -> {total / elapsed:.1f} req/s")
+    print(f"  {'route':<15}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    for route, stats in summary.items():
+        print(
+            f"  {route:<15}{stats['count']:>7.0f}{stats['errors']:>8.0f}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['rps']:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", choices=("uvicorn", "gunicorn", "both"), default="both")
+    parser.add_argument("--users", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=10, help="Measured flows per virtual user")
+    parser.add_argument("--warmup", type=int, default=1, help="Unmeasured flows per virtual user")
+    parser.add_argument("--workers", type=int, default=2, help="Server worker processes")
+    parser.add_argument("--threads", type=int, default=4, help="Threads per gunicorn worker")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds the stub Wristband waits per request")
+    parser.add_argument("--json", dest="json_path", help="Also write the results to this file as JSON")
+    parser.add_argument("--verbose", action="store_true", help="Show the app server's own output")
+    args = parser.parse_args()
+
+    servers = ("uvicorn", "gunicorn") if args.server == "both" else (args.server,)
+    port = free_port()
+    app_base_url = f"http://localhost:{port}"
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+    with StubWristbandServer(latency=args.latency, app_base_url=app_base_url) as stub:
+        env = {
+            **os.environ,
+            "CLIENT_ID": CLIENT_ID,
+            "CLIENT_SECRET": CLIENT_SECRET,
+            "APPLICATION_VANITY_DOMAIN": stub.vanity_domain,
+            "SSL_CERT_FILE": str(stub.cert_path),
+            "DJANGO_SETTINGS_MODULE": "demo_project.settings",
+        }
+        subprocess.run([sys.executable, "manage.py", "migrate", "--verbosity", "0"], cwd=BASE_DIR, env=env, check=True)
+
+        print(
+            f"{args.users} users x {args.iterations} flows ({args.warmup} warm-up), {args.workers} workers, "
+            f"stub Wristband latency {args.latency * 1000:.0f}ms"
+        )
+        for server in servers:
+            command = server_command(server, port, args.workers, args.threads)
+            with app_server(command, env, app_base_url, args.verbose):
+                samples, elapsed = run_load(app_base_url, stub.base_url, args.users, args.iterations, args.warmup)
+            results[server] = summarize(samples, elapsed)
+            print_summary(SERVER_LABELS[server], results[server], elapsed)
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
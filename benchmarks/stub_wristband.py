@@ -0,0 +1,266 @@
+"""
+A local stand-in for the Wristband endpoints the demo app uses, served over HTTPS on 127.0.0.1.
+
+Point WRISTBAND_AUTH at it with `wristband_application_vanity_domain=server.vanity_domain`; the SDK builds
+`https://<vanity domain>/api/v1` URLs, so a "127.0.0.1:<port>" vanity domain routes every API call here. The
+certificate is self-signed and trusted by pointing SSL_CERT_FILE at it, which httpx honors by default.
+
+Endpoints: SDK auto-configuration, authorize, token, userinfo, JWKS, revoke and logout. Authorize redirects
+straight back to the app's callback with a code, and the token endpoint issues RS256 access tokens
+signed with a key published at the JWKS endpoint, so JWT-protected routes validate them like real ones. A
+`login_hint` on the authorize request becomes the user's ID.
+
+The server counts accepted connections and completed TLS handshakes, so benchmarks can show whether clients
+reuse connections.
+"""
+
+import base64
+import datetime
+import ipaddress
+import json
+import os
+import secrets
+import ssl
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from common import CLIENT_ID, TENANT_NAME, token_payload, userinfo_payload
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec, padding, rsa
+
+# (status, JSON body or None, extra headers)
+StubResponse = Tuple[int, Optional[Dict[str, Any]], Dict[str, str]]
+
+SIGNING_KEY_ID = "stub-signing-key"
+DEFAULT_USER_ID = "bench-user"
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64url_decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def generate_certificate(directory: Path) -> Tuple[Path, Path]:
+    """Write a self-signed certificate and key for 127.0.0.1/localhost, returning their paths."""
+    from cryptography import x509
+    from cryptography.x509.oid import NameOID
+
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "Stub Wristband")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName([x509.DNSName("localhost"), x509.IPAddress(ipaddress.ip_address("127.0.0.1"))]),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = directory / "stub-wristband.pem"
+    key_path = directory / "stub-wristband-key.pem"
+    cert_path.write_bytes(certificate.public_bytes(serialization.Encoding.PEM))
+    key_path.write_bytes(
+        key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption())
+    )
+    return cert_path, key_path
+
+
+class StubWristbandHandler(BaseHTTPRequestHandler):
+    """Routes requests to the stub's endpoints. HTTP/1.1, so connections stay open between requests."""
+
+    protocol_version = "HTTP/1.1"
+    server: "StubWristbandServer"
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _dispatch(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8") if length else ""
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        url = urlsplit(self.path)
+        self.server.count("requests")
+        route = self.server.routes.get((method, url.path))
+        if route is None:
+            self._send(404, {"error": "not_found"}, {})
+            return
+
+        params = dict(parse_qsl(url.query))
+        params.update(parse_qsl(body))
+        self._send(*route(params, self.headers.get("Authorization", "")))
+
+    def _send(self, status: int, body: Optional[Dict[str, Any]], headers: Dict[str, str]) -> None:
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class StubWristbandServer(ThreadingHTTPServer):
+    """
+    Threaded HTTPS server answering the Wristband calls made by the demo app and its users' browsers.
+
+    `app_base_url` is where the app under test runs; auto-configuration points its login and callback URLs
+    there. Use as a context manager: the server runs in a background thread until the block exits.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, latency: float = 0.0, app_base_url: str = "http://localhost:6001") -> None:
+        super().__init__(("127.0.0.1", 0), StubWristbandHandler)
+        self.latency = latency
+        self.app_base_url = app_base_url.rstrip("/")
+        self.counters: Dict[str, int] = {"connections": 0, "tls_handshakes": 0, "requests": 0}
+        self._counter_lock = threading.Lock()
+        self._codes: Dict[str, str] = {}
+        self._signing_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.cert_path, key_path = generate_certificate(Path(self._tempdir.name))
+        self._ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self._ssl_context.load_cert_chain(self.cert_path, key_path)
+        self._thread: Optional[threading.Thread] = None
+
+        api = "/api/v1"
+        self.routes: Dict[Tuple[str, str], Callable[[Dict[str, str], str], StubResponse]] = {
+            ("GET", f"{api}/clients/{CLIENT_ID}/sdk-configuration"): self.sdk_configuration,
+            ("GET", f"{api}/oauth2/authorize"): self.authorize,
+            ("POST", f"{api}/oauth2/token"): self.token,
+            ("GET", f"{api}/oauth2/userinfo"): self.userinfo,
+            ("GET", f"{api}/oauth2/jwks"): self.jwks,
+            ("POST", f"{api}/oauth2/revoke"): lambda params, authorization: (200, None, {}),
+            ("GET", f"{api}/logout"): lambda params, authorization: (200, None, {}),
+        }
+
+    @property
+    def vanity_domain(self) -> str:
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    @property
+    def base_url(self) -> str:
+        return f"https://{self.vanity_domain}"
+
+    # Endpoints
+
+    def sdk_configuration(self, params: Dict[str, str], authorization: str) -> StubResponse:
+        body = {
+            "loginUrl": f"{self.app_base_url}/api/auth/login/",
+            "redirectUri": f"{self.app_base_url}/api/auth/callback/",
+            "isApplicationCustomDomainActive": False,
+        }
+        return 200, body, {}
+
+    def authorize(self, params: Dict[str, str], authorization: str) -> StubResponse:
+        """Skip the login page: redirect back to the app with a code for the hinted (or default) user."""
+        code = secrets.token_urlsafe(16)
+        with self._counter_lock:
+            self._codes[code] = params.get("login_hint") or DEFAULT_USER_ID
+        query = urlencode({"code": code, "state": params.get("state", ""), "tenant_name": TENANT_NAME})
+        return 302, None, {"Location": f"{params['redirect_uri']}?{query}"}
+
+    def token(self, params: Dict[str, str], authorization: str) -> StubResponse:
+        # Codes not issued by authorize (e.g. canned ones from other benchmarks) log in the default user
+        with self._counter_lock:
+            user_id = self._codes.pop(params.get("code", ""), DEFAULT_USER_ID)
+
+        body = token_payload()
+        body["access_token"] = self.sign_access_token(user_id, body["expires_in"])
+        return 200, body, {}
+
+    def userinfo(self, params: Dict[str, str], authorization: str) -> StubResponse:
+        try:
+            claims = json.loads(_b64url_decode(authorization.removeprefix("Bearer ").split(".")[1]))
+            user_id = claims["sub"]
+        except (IndexError, KeyError, ValueError):
+            user_id = DEFAULT_USER_ID
+        return 200, userinfo_payload(user_id), {}
+
+    def jwks(self, params: Dict[str, str], authorization: str) -> StubResponse:
+        numbers = self._signing_key.public_key().public_numbers()
+        key = {
+            "kty": "RSA",
+            "kid": SIGNING_KEY_ID,
+            "use": "sig",
+            "alg": "RS256",
+            "n": _b64url(numbers.n.to_bytes((numbers.n.bit_length() + 7) // 8, "big")),
+            "e": _b64url(numbers.e.to_bytes((numbers.e.bit_length() + 7) // 8, "big")),
+        }
+        return 200, {"keys": [key]}, {}
+
+    def sign_access_token(self, user_id: str, expires_in: int) -> str:
+        """RS256 access token for a user, as the validator in require_jwt/DrfJwtAuth expects it."""
+        now = int(time.time())
+        header = {"alg": "RS256", "typ": "JWT", "kid": SIGNING_KEY_ID}
+        claims = {
+            "iss": self.base_url,
+            "sub": user_id,
+            "tnt_id": "bench-tenant",
+            "app_id": "bench-app",
+            "client_id": CLIENT_ID,
+            "iat": now,
+            "exp": now + expires_in,
+        }
+        signing_input = f"{_b64url(json.dumps(header).encode())}.{_b64url(json.dumps(claims).encode())}"
+        signature = self._signing_key.sign(signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256())
+        return f"{signing_input}.{_b64url(signature)}"
+
+    # Server plumbing
+
+    def count(self, counter: str) -> None:
+        with self._counter_lock:
+            self.counters[counter] += 1
+
+    def reset_counters(self) -> None:
+        with self._counter_lock:
+            self.counters = dict.fromkeys(self.counters, 0)
+
+    def get_request(self) -> Tuple[Any, Any]:
+        sock, address = super().get_request()
+        self.count("connections")
+        return sock, address
+
+    def finish_request(self, request: Any, client_address: Any) -> None:
+        # Handshake in the per-connection thread so a slow client can't stall the accept loop
+        tls_sock = self._ssl_context.wrap_socket(request, server_side=True)
+        self.count("tls_handshakes")
+        super().finish_request(tls_sock, client_address)
+
+    def __enter__(self) -> "StubWristbandServer":
+        os.environ["SSL_CERT_FILE"] = str(self.cert_path)
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+        self.server_close()
+        self._tempdir.cleanup()
@@ -18,8 +18,6 @@
 import logging
 from typing import Any, Callable
 
-import httpx
-
 logger = logging.getLogger(__name__)
 
 # 🚨 TOGGLE THIS FLAG FOR LOCAL DEVELOPMENT ONLY 🚨
@@ -27,6 +25,9 @@ logger = logging.getLogger(__name__)
 _DISABLE_SSL_FOR_WRISTBAND_DEV = False  # ⚠️ CHANGE TO False FOR PRODUCTION ⚠️
 
 if _DISABLE_SSL_FOR_WRISTBAND_DEV:
+    # Imported here so that loading the app doesn't import httpx unless the patch is enabled
+    import httpx
+
     logger.warning("🚨 WARNING: SSL verification is DISABLED for ALL httpx requests!")
     logger.warning("🚨 This is for Wristband internal development only!")
     logger.warning("🚨 DO NOT USE IN PRODUCTION!")
@@ -42,6 +43,16 @@ if _DISABLE_SSL_FOR_WRISTBAND_DEV:
 
     httpx.Client.__init__ = patched_httpx_client_init  # type: ignore[method-assign]
 
+    # Patch httpx.AsyncClient.__init__ the same way for the async auth views
+    original_httpx_async_client_init = httpx.AsyncClient.__init__
+
+    def patched_httpx_async_client_init(self: httpx.AsyncClient, *args: Any, **kwargs: Any) -> None:
+        if "verify" not in kwargs:
+            kwargs["verify"] = False
+        return original_httpx_async_client_init(self, *args, **kwargs)
+
+    httpx.AsyncClient.__init__ = patched_httpx_async_client_init  # type: ignore[method-assign]
+
     # Patch httpx module-level functions
     original_httpx_post: Callable[..., httpx.Response] = httpx.post
     original_httpx_get: Callable[..., httpx.Response] = httpx.get
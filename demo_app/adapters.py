@@ -1,6 +1,74 @@
+import threading
+from typing import Any, Dict, Iterable, NamedTuple
+
 from django.contrib.auth.models import Group, User
+from django.db import IntegrityError
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from wristband.django_auth import CallbackData, DefaultWristbandAuthBackendAdapter
 
+from .metrics import timed_phase
+
+
+class RoleMapping(NamedTuple):
+    """Django group and admin flags granted for a Wristband role."""
+
+    group_name: str
+    is_staff: bool
+    is_superuser: bool
+
+
+OWNER_MAPPING = RoleMapping(group_name="Owners", is_staff=True, is_superuser=True)
+VIEWER_MAPPING = RoleMapping(group_name="Viewers", is_staff=False, is_superuser=False)
+
+# Wristband role names look like "app:<app_name>:<role>". The lookup table is keyed by the trailing <role>
+# segment and lists mappings in priority order: the first one matched by any of the user's roles wins.
+# Users with no roles, or no matching role, fall back to the default mapping.
+ROLE_MAPPINGS: Dict[str, RoleMapping] = {
+    "owner": OWNER_MAPPING,
+}
+DEFAULT_ROLE_MAPPING = VIEWER_MAPPING
+_ROLE_PRIORITY = {role: priority for priority, role in enumerate(ROLE_MAPPINGS)}
+_MAPPINGS_BY_PRIORITY = [*ROLE_MAPPINGS.values(), DEFAULT_ROLE_MAPPING]
+
+# Process-wide cache of group name -> primary key, so logins don't look the groups up every time
+_group_ids: Dict[str, int] = {}
+_group_ids_lock = threading.Lock()
+
+
+def resolve_role_mapping(role_names: Iterable[str]) -> RoleMapping:
+    """Return the highest-priority mapping matched by the given Wristband role names."""
+    best_priority = len(_ROLE_PRIORITY)
+    for role_name in role_names:
+        if not role_name.startswith("app:"):
+            continue
+        priority = _ROLE_PRIORITY.get(role_name.rpartition(":")[2], best_priority)
+        if priority < best_priority:
+            best_priority = priority
+            if priority == 0:
+                break
+
+    return _MAPPINGS_BY_PRIORITY[best_priority]
+
+
+def get_group_id(group_name: str) -> int:
+    """Primary key of the named group, creating the group on first use."""
+    group_id = _group_ids.get(group_name)
+    if group_id is None:
+        with _group_ids_lock:
+            group_id = _group_ids.get(group_name)
+            if group_id is None:
+                group, _ = Group.objects.get_or_create(name=group_name)
+                group_id = _group_ids[group_name] = group.pk
+    return group_id
+
+
+@receiver(post_delete, sender=Group)
+def forget_group_ids(**kwargs: Any) -> None:
+    """Drop cached group IDs whenever a group is deleted."""
+    with _group_ids_lock:
+        _group_ids.clear()
+
 
 class MyWristbandAdapter(DefaultWristbandAuthBackendAdapter):
     """
@@ -11,35 +79,37 @@ class MyWristbandAdapter(DefaultWristbandAuthBackendAdapter):
         # First, populate basic fields from parent (optional)
         user = super().populate_user(user, callback_data, **kwargs)
 
-        # Now add custom role mapping (requires 'roles' scope)
-        user_info = callback_data.user_info
-        roles = user_info.roles
-
-        if not roles:
-            # No roles scope or no roles assigned - default permissions
-            user.groups.clear()
-            user.is_staff = False
-            user.is_superuser = False
-            viewer_group, _ = Group.objects.get_or_create(name="Viewers")
-            user.groups.add(viewer_group)
-        else:
-            # Check for owner role
-            role_names = [role.name for role in roles]
-            has_owner_role = any(
-                role_name.startswith("app:") and role_name.endswith(":owner") for role_name in role_names
-            )
-
-            if has_owner_role:
-                user.groups.clear()
-                user.is_staff = True
-                user.is_superuser = True
-                owner_group, _ = Group.objects.get_or_create(name="Owners")
-                user.groups.add(owner_group)
-            else:
-                user.groups.clear()
-                user.is_staff = False
-                user.is_superuser = False
-                viewer_group, _ = Group.objects.get_or_create(name="Viewers")
-                user.groups.add(viewer_group)
+        # Now add custom role mapping (requires 'roles' scope).
+        # No roles scope or no roles assigned means default permissions.
+        roles = callback_data.user_info.roles or []
+        mapping = resolve_role_mapping(role.name for role in roles)
+
+        user.is_staff = mapping.is_staff
+        user.is_superuser = mapping.is_superuser
+
+        with timed_phase("user_sync"):
+            try:
+                self._sync_group(user, mapping.group_name)
+            except IntegrityError:
+                # A cached group was deleted after we looked it up (e.g. via the admin in another worker)
+                forget_group_ids()
+                self._sync_group(user, mapping.group_name)
 
         return user
+
+    def _sync_group(self, user: User, group_name: str) -> None:
+        """
+        Make the mapped group the user's only group, writing only what differs.
+
+        Repeat logins with unchanged roles cost a single read and no writes.
+        """
+        target_id = get_group_id(group_name)
+        current_ids = set(user.groups.values_list("id", flat=True))
+        if current_ids == {target_id}:
+            return
+
+        stale_ids = current_ids - {target_id}
+        if stale_ids:
+            user.groups.remove(*stale_ids)
+        if target_id not in current_ids:
+            user.groups.add(target_id)
@@ -0,0 +1,213 @@
+"""
+__WRISTBAND__: Admission control: caps on concurrent requests per route class, with load shedding.
+
+A login storm sends many requests to the callback endpoint, and each one holds a worker (or, under ASGI, a
+sync view thread) for the whole token exchange with Wristband. Without a cap they crowd out everything else,
+including JWT API calls that take a fraction of a millisecond. AdmissionControlMiddleware gives each route
+class its own limit:
+
+    - up to `max_concurrent` requests of the class run at once
+    - up to `max_queue` more wait, each for at most `queue_timeout` seconds, for a slot to free up
+    - anything beyond that is shed right away with 503 Service Unavailable and a Retry-After header
+
+Route classes are configured by URL name in the ADMISSION_CONTROL setting; requests to other URLs are not
+limited. The names are reversed to paths once at startup, so matching a request is a dict lookup on its path
+rather than a URL resolution. Each class's in-flight, queued, admitted and shed counts are published on
+/metrics as demo_admission_<class>_<counter> (see demo_app/metrics.py). Limits are per worker process.
+"""
+
+import asyncio
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Mapping, Optional, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpRequest, HttpResponse
+from django.urls import NoReverseMatch, Resolver404, resolve, reverse
+
+from .metrics import register_stats
+
+
+class AdmissionGate:
+    """
+    Concurrency limit with a bounded wait queue for one route class.
+
+    Works from threads (acquire) and from the event loop (acquire_async). A process serves requests in one
+    of the two modes, so async waiters are only ever handed slots by releases on the event loop.
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._queued = 0
+        self._admitted = 0
+        self._shed = 0
+        self._lock = threading.Lock()
+        self._slot_freed = threading.Condition(self._lock)
+        self._async_waiters: Deque["asyncio.Future[None]"] = deque()
+
+    def _try_enter(self) -> Optional[bool]:
+        """With the lock held: True if admitted, False if shed, None if the caller should queue."""
+        if self._in_flight < self.max_concurrent:
+            self._in_flight += 1
+            self._admitted += 1
+            return True
+        if self._queued >= self.max_queue:
+            self._shed += 1
+            return False
+        self._queued += 1
+        return None
+
+    def acquire(self) -> bool:
+        """Take a slot, waiting in the queue if needed. False if the request should be shed."""
+        with self._lock:
+            admitted = self._try_enter()
+            if admitted is not None:
+                return admitted
+            try:
+                admitted = self._slot_freed.wait_for(
+                    lambda: self._in_flight < self.max_concurrent, timeout=self.queue_timeout
+                )
+            finally:
+                self._queued -= 1
+            if not admitted:
+                self._shed += 1
+                return False
+            self._in_flight += 1
+            self._admitted += 1
+            return True
+
+    async def acquire_async(self) -> bool:
+        """acquire() for the event loop: waiting in the queue doesn't block other requests."""
+        with self._lock:
+            admitted = self._try_enter()
+            if admitted is not None:
+                return admitted
+            waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+            self._async_waiters.append(waiter)
+
+        try:
+            await asyncio.wait((waiter,), timeout=self.queue_timeout)
+        except BaseException:
+            # Cancelled (e.g. the client went away): hand back a slot we were given meanwhile
+            with self._lock:
+                self._queued -= 1
+                given = waiter.done() and not waiter.cancelled()
+                waiter.cancel()
+            if given:
+                self.release()
+            raise
+
+        with self._lock:
+            self._queued -= 1
+            # release() hands its slot straight to a waiter, so a set result means we hold a slot
+            if waiter.done() and not waiter.cancelled():
+                self._admitted += 1
+                return True
+            waiter.cancel()
+            self._shed += 1
+            return False
+
+    def release(self) -> None:
+        with self._lock:
+            while self._async_waiters:
+                waiter = self._async_waiters.popleft()
+                if not waiter.done():
+                    waiter.set_result(None)
+                    return
+            self._in_flight -= 1
+            self._slot_freed.notify()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "in_flight": self._in_flight,
+                "queued": self._queued,
+                "admitted": self._admitted,
+                "shed": self._shed,
+            }
+
+
+class AdmissionControlMiddleware:
+    """
+    Limits concurrent requests per route class as configured in ADMISSION_CONTROL; sheds the excess with 503.
+
+    Place it after WhiteNoiseMiddleware, so static files are never limited, and before SessionMiddleware, so
+    shed requests don't pay for decrypting the session cookie.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        # Gates by path_info: the configured URLs take no arguments, so a dict lookup replaces resolve()
+        self.gates: Dict[str, AdmissionGate] = {}
+        self.retry_after: Dict[str, int] = {}
+        route_classes: Mapping[str, Mapping[str, Any]] = getattr(settings, "ADMISSION_CONTROL", {})
+        for route_class, config in route_classes.items():
+            gate = AdmissionGate(
+                route_class,
+                max_concurrent=int(config["max_concurrent"]),
+                max_queue=int(config.get("max_queue", 0)),
+                queue_timeout=float(config.get("queue_timeout", 0)),
+            )
+            self.retry_after[route_class] = int(config.get("retry_after", 1))
+            for view_name in config["views"]:
+                try:
+                    self.gates[reverse(view_name)] = gate
+                except NoReverseMatch as exc:
+                    raise ImproperlyConfigured(
+                        f'ADMISSION_CONTROL["{route_class}"] view {view_name} must be a URL name without arguments'
+                    ) from exc
+            register_stats(f"demo_admission_{route_class}", gate.stats)
+
+    def _gate(self, request: HttpRequest) -> Optional[AdmissionGate]:
+        return self.gates.get(request.path_info)
+
+    def _shed_response(self, request: HttpRequest, gate: AdmissionGate) -> HttpResponse:
+        # Label shed requests by URL name in demo_request_duration_seconds; the view never runs to resolve it
+        try:
+            request.resolver_match = resolve(request.path_info)
+        except Resolver404:
+            pass
+        response = HttpResponse(
+            "Server busy, please retry shortly.", status=503, content_type="text/plain; charset=utf-8"
+        )
+        response["Retry-After"] = str(self.retry_after[gate.name])
+        response["Cache-Control"] = "no-store"
+        return response
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        gate = self._gate(request)
+        if gate is None:
+            return self.get_response(request)
+        if not gate.acquire():
+            return self._shed_response(request, gate)
+        try:
+            return self.get_response(request)
+        finally:
+            gate.release()
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        get_response = cast(Callable[[HttpRequest], Awaitable[HttpResponse]], self.get_response)
+        gate = self._gate(request)
+        if gate is None:
+            return await get_response(request)
+        if not await gate.acquire_async():
+            return self._shed_response(request, gate)
+        try:
+            return await get_response(request)
+        finally:
+            gate.release()
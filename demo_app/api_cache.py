@@ -0,0 +1,77 @@
+"""
+__WRISTBAND__: HTTP caching for the session-backed endpoints the frontend polls (SessionEndpoint, TokenEndpoint).
+
+Their data only changes on login, token refresh and logout, yet frontend SDKs ask for it on every page load
+and before API calls. ConditionalSessionApiMixin lets browsers and SPA fetch wrappers reuse their copy:
+
+    - ETag: a digest of the session fields the endpoint returns and the token's expires_at, which changes on
+      every login and refresh. A matching If-None-Match gets a 304 before the response is built.
+    - Cache-Control: private, max-age=N, where N runs out WRISTBAND_TOKEN_REFRESH_SKEW seconds before the
+      access token expires (when session auth would refresh it), capped at WRISTBAND_SESSION_API_MAX_AGE.
+      Set the cap to 0 to have clients revalidate every time.
+    - Vary: Cookie. Login, refresh and logout all change the session cookie, so a cached copy is never used
+      across them.
+
+Authentication still runs on every request, 304s included.
+"""
+
+import hashlib
+import time
+from typing import Any, Optional, Tuple
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import SessionBase
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework.request import Request
+
+from .token_refresh import DEFAULT_REFRESH_SKEW
+
+DEFAULT_MAX_AGE = 300
+
+
+def session_api_etag(session: SessionBase, endpoint: str, fields: Tuple[str, ...]) -> str:
+    """Strong ETag for an endpoint's response: the same session fields give the same body."""
+    digest = hashlib.sha256(endpoint.encode("utf-8"))
+    for field in fields:
+        digest.update(f"\0{session.get(field)}".encode("utf-8"))
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def session_api_max_age(expires_at: Optional[int]) -> int:
+    """Seconds a client may reuse the response: until the token is due for refresh, within the configured cap."""
+    if not expires_at:
+        return 0
+    skew = getattr(settings, "WRISTBAND_TOKEN_REFRESH_SKEW", DEFAULT_REFRESH_SKEW)
+    remaining = int(expires_at / 1000 - time.time() - skew)
+    return max(0, min(remaining, getattr(settings, "WRISTBAND_SESSION_API_MAX_AGE", DEFAULT_MAX_AGE)))
+
+
+class ConditionalSessionApiMixin:
+    """
+    APIView mixin for GET endpoints built from session fields: ETag, Cache-Control and 304 responses.
+
+    Subclasses list the session fields their response depends on in `etag_fields` and build the response in
+    render_response(). expires_at is always part of the ETag.
+    """
+
+    etag_fields: Tuple[str, ...] = ()
+
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> HttpResponse:
+        session = request.session
+        etag = session_api_etag(session, type(self).__name__, (*self.etag_fields, "expires_at"))
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            response = self.render_response(request)
+
+        response["ETag"] = etag
+        max_age = session_api_max_age(session.get("expires_at"))
+        if max_age:
+            patch_cache_control(response, private=True, max_age=max_age)
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Cookie",))
+        return response
+
+    def render_response(self, request: Request) -> HttpResponse:
+        raise NotImplementedError
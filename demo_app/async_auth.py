@@ -0,0 +1,275 @@
+"""
+__WRISTBAND__: Async extensions to the Wristband Django Auth SDK.
+
+The SDK's WristbandAuth talks to Wristband through a synchronous httpx.Client, so under ASGI every login
+callback and logout blocks a thread for the whole round-trip to Wristband. AsyncWristbandAuth adds async
+counterparts of the login, callback and logout flows that share one httpx.AsyncClient per event loop.
+
+Under WSGI, Django runs async views through async_to_sync, which starts a new event loop for every request.
+A per-loop client would then open a new connection for every login, so requests that didn't come in over
+ASGI use the sync client (and its connection pool) from a thread instead.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import replace
+from typing import Any
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponse
+from wristband.django_auth import (
+    AuthConfig,
+    CallbackData,
+    CallbackFailureReason,
+    CallbackResult,
+    CompletedCallbackResult,
+    LoginConfig,
+    LogoutConfig,
+    RedirectRequiredCallbackResult,
+    UserInfo,
+    WristbandAuth,
+    WristbandError,
+)
+from wristband.django_auth.client import WristbandApiClient
+from wristband.django_auth.exceptions import InvalidGrantError
+from wristband.django_auth.models import RawUserInfo, WristbandTokenResponse
+from wristband.django_auth.utils import map_userinfo_claims
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWristbandApiClient:
+    """
+    Async counterpart of the SDK's WristbandApiClient for the calls made during login and logout.
+
+    Reuses the base URL and Basic auth headers of the sync client. One httpx.AsyncClient is kept per running
+    event loop, so every request served on that loop shares the same connection pool.
+    """
+
+    def __init__(self, api_client: WristbandApiClient, **client_options: Any) -> None:
+        self.base_url = api_client.base_url
+        self.headers = dict(api_client.headers)
+        self._client_options = {"timeout": 15.0, **client_options}
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared httpx.AsyncClient for the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(headers=self.headers, **self._client_options)
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self) -> None:
+        """Close the client bound to the running event loop, if any."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def get_tokens(self, code: str, redirect_uri: str, code_verifier: str) -> WristbandTokenResponse:
+        """Exchange an authorization code for tokens. See WristbandApiClient.get_tokens()."""
+        if not code or not code.strip():
+            raise ValueError("Authorization code is required")
+        if not redirect_uri or not redirect_uri.strip():
+            raise ValueError("Redirect URI is required")
+        if not code_verifier or not code_verifier.strip():
+            raise ValueError("Code verifier is required")
+
+        response = await self.client.post(
+            self.base_url + "/oauth2/token",
+            data={
+                "grant_type": "authorization_code",
+                "code": code,
+                "redirect_uri": redirect_uri,
+                "code_verifier": code_verifier,
+            },
+        )
+
+        if response.status_code != 200:
+            data = response.json()
+            if data.get("error") == "invalid_grant":
+                raise InvalidGrantError(data.get("error_description", "Invalid grant"))
+
+            error = data.get("error") or "unknown_error"
+            error_description = data.get("error_description") or "Unknown error"
+            raise WristbandError(error, error_description)
+
+        return WristbandTokenResponse.from_api_response(response.json())
+
+    async def get_userinfo(self, access_token: str) -> UserInfo:
+        """Retrieve user information for an access token. See WristbandApiClient.get_userinfo()."""
+        try:
+            response = await self.client.get(
+                self.base_url + "/oauth2/userinfo",
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            response.raise_for_status()
+            return map_userinfo_claims(RawUserInfo.from_api_response(response.json()))
+        except Exception as e:
+            raise WristbandError("unexpected_error", str(e))
+
+    async def revoke_refresh_token(self, refresh_token: str) -> None:
+        """Revoke a refresh token. See WristbandApiClient.revoke_refresh_token()."""
+        response = await self.client.post(self.base_url + "/oauth2/revoke", data={"token": refresh_token})
+        response.raise_for_status()
+
+
+class AsyncWristbandAuth(WristbandAuth):
+    """
+    WristbandAuth with async login, callback and logout methods for async views.
+
+    The async methods follow the same flow as their sync counterparts but perform the outbound calls to
+    Wristband with an AsyncWristbandApiClient, so they never occupy a thread while waiting on the network.
+    All sync methods, decorators, mixins and DRF auth classes are inherited unchanged.
+    """
+
+    def __init__(self, auth_config: AuthConfig) -> None:
+        super().__init__(auth_config)
+        self._async_wristband_api = AsyncWristbandApiClient(self._wristband_api)
+
+    async def alogin(self, request: HttpRequest, config: LoginConfig = LoginConfig()) -> HttpResponse:
+        """Async version of login(). Building the authorize redirect needs no I/O once configs are loaded."""
+        await self._apreload_sdk_config()
+        return self.login(request, config)
+
+    async def acallback(self, request: HttpRequest) -> CallbackResult:
+        """
+        Async version of callback().
+
+        Validates the callback parameters and login state exactly like callback(), then exchanges the
+        authorization code and fetches userinfo over the shared async client.
+        """
+        if not isinstance(request, ASGIRequest):
+            return await sync_to_async(self.callback)(request)
+
+        await self._apreload_sdk_config()
+
+        # Fetch our SDK configs
+        login_url = self._config_resolver.get_login_url()
+        parse_tenant_from_root_domain = self._config_resolver.get_parse_tenant_from_root_domain()
+        token_expiration_buffer = self._config_resolver.get_token_expiration_buffer()
+
+        # Extract and validate callback parameters
+        code = self._assert_single_param(request, "code")
+        param_state = self._assert_single_param(request, "state")
+        error = self._assert_single_param(request, "error")
+        error_description = self._assert_single_param(request, "error_description")
+        tenant_custom_domain_param = self._assert_single_param(request, "tenant_custom_domain")
+
+        if not param_state:
+            raise TypeError("Invalid query parameter [state] passed from Wristband during callback")
+
+        # Resolve and validate tenant name
+        resolved_tenant_name = self._resolve_tenant_name(request, parse_tenant_from_root_domain)
+        if not resolved_tenant_name:
+            if parse_tenant_from_root_domain:
+                raise WristbandError("missing_tenant_subdomain", "Callback request URL is missing a tenant subdomain")
+            else:
+                raise WristbandError("missing_tenant_name", "Callback request is missing the [tenant_name] param")
+
+        # Build the tenant login URL in case we need to redirect
+        tenant_login_url = self._build_tenant_login_url(
+            login_url=login_url,
+            tenant_name=resolved_tenant_name,
+            tenant_custom_domain=tenant_custom_domain_param,
+            parse_tenant_from_root_domain=parse_tenant_from_root_domain,
+        )
+
+        # Check if Wristband gave an error
+        if error:
+            if error.lower() == "login_required":
+                return RedirectRequiredCallbackResult(
+                    redirect_url=tenant_login_url,
+                    reason=CallbackFailureReason.LOGIN_REQUIRED,
+                )
+            raise WristbandError(error, error_description or "")
+
+        # Retrieve, decrypt and validate the login state cookie
+        _, login_state_cookie_val = self._get_login_state_cookie(request)
+        if not login_state_cookie_val:
+            return RedirectRequiredCallbackResult(
+                redirect_url=tenant_login_url,
+                reason=CallbackFailureReason.MISSING_LOGIN_STATE,
+            )
+
+        login_state = self._decrypt_login_state(login_state_cookie_val)
+        if param_state != login_state.state:
+            return RedirectRequiredCallbackResult(
+                redirect_url=tenant_login_url,
+                reason=CallbackFailureReason.INVALID_LOGIN_STATE,
+            )
+
+        if not code:
+            raise ValueError("Invalid query parameter [code] passed from Wristband during callback")
+
+        try:
+            token_response = await self._async_wristband_api.get_tokens(
+                code=code,
+                redirect_uri=login_state.redirect_uri,
+                code_verifier=login_state.code_verifier,
+            )
+            userinfo = await self._async_wristband_api.get_userinfo(token_response.access_token)
+        except InvalidGrantError:
+            return RedirectRequiredCallbackResult(
+                redirect_url=tenant_login_url,
+                reason=CallbackFailureReason.INVALID_GRANT,
+            )
+
+        # Calculate token expiry buffer
+        expires_in = token_response.expires_in - (token_expiration_buffer or 0)
+        expires_at = int((time.time() + expires_in) * 1000)
+
+        return CompletedCallbackResult(
+            callback_data=CallbackData(
+                access_token=token_response.access_token,
+                id_token=token_response.id_token,
+                expires_in=expires_in,
+                expires_at=expires_at,
+                tenant_name=resolved_tenant_name,
+                user_info=userinfo,
+                custom_state=login_state.custom_state,
+                refresh_token=token_response.refresh_token,
+                return_url=login_state.return_url,
+                tenant_custom_domain=tenant_custom_domain_param,
+            )
+        )
+
+    async def alogout(self, request: HttpRequest, config: LogoutConfig = LogoutConfig()) -> HttpResponse:
+        """
+        Async version of logout().
+
+        Revokes the refresh token over the shared async client, then lets logout() build the redirect to
+        the Wristband Logout Endpoint without revoking a second time.
+        """
+        if not isinstance(request, ASGIRequest):
+            return await sync_to_async(self.logout)(request, config)
+
+        await self._apreload_sdk_config()
+
+        if config.refresh_token:
+            try:
+                await self._async_wristband_api.revoke_refresh_token(config.refresh_token)
+            except Exception as e:
+                # No need to block logout execution if revoking fails
+                logger.debug(f"Revoking refresh token failed during logout: {e}")
+
+        return self.logout(request, replace(config, refresh_token=None))
+
+    async def _apreload_sdk_config(self) -> None:
+        """
+        Load auto-configured SDK values off the event loop.
+
+        The SDK fetches them with a blocking HTTP call the first time a config getter needs them, and caches
+        them for the life of the process. Doing that fetch in a worker thread keeps it off the event loop.
+        """
+        resolver = self._config_resolver
+        if resolver.get_auto_configure_enabled() and resolver.sdk_config_cache is None:
+            await sync_to_async(resolver.preload_sdk_config, thread_sensitive=False)()
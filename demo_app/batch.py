@@ -0,0 +1,74 @@
+"""
+__WRISTBAND__: Operations for the JWT batch endpoint (POST /api/drf/batch/, see DrfJwtBatchApi).
+
+A batch is a JSON array of operations, each an object with an "action" and that action's fields:
+
+    [{"action": "hello"}, {"action": "hello"}]
+
+The batch is authenticated once, with DrfJwtAuth, and each operation is run by the handler registered for its
+action. Every operation gets its own status and body, so one failing operation doesn't fail the others:
+
+    {"results": [{"status": 200, "body": {...}}, {"status": 400, "body": {"error": "..."}}]}
+
+Handlers take the operation and the batch's JWTAuthResult and return (status, body):
+
+    @batch_action("hello")
+    def hello(operation: Dict[str, Any], auth: JWTAuthResult) -> Tuple[int, Dict[str, Any]]:
+        ...
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
+from wristband.django_auth import JWTAuthResult
+
+from .fast_json import current_timestamp
+
+logger = logging.getLogger(__name__)
+
+BatchHandler = Callable[[Dict[str, Any], JWTAuthResult], Tuple[int, Dict[str, Any]]]
+
+_handlers: Dict[str, BatchHandler] = {}
+
+
+def batch_action(action: str) -> Callable[[BatchHandler], BatchHandler]:
+    """Register the decorated function as the handler for operations with this action."""
+
+    def register(handler: BatchHandler) -> BatchHandler:
+        _handlers[action] = handler
+        return handler
+
+    return register
+
+
+def run_batch(operations: List[Any], auth: JWTAuthResult) -> List[Dict[str, Any]]:
+    """Run each operation with its handler; one {"status", "body"} result per operation, in order."""
+    results = []
+    for operation in operations:
+        if not isinstance(operation, dict):
+            status, body = 400, {"error": "Each operation must be an object."}
+        elif operation.get("action") not in _handlers:
+            status, body = 400, {"error": f"Unknown action. Expected one of: {', '.join(sorted(_handlers))}."}
+        else:
+            try:
+                status, body = _handlers[operation["action"]](operation, auth)
+            except Exception:
+                logger.exception("Batch operation %r failed", operation["action"])
+                status, body = 500, {"error": "Operation failed."}
+        results.append({"status": status, "body": body})
+    return results
+
+
+def jwt_hello(auth: JWTAuthResult) -> Dict[str, Any]:
+    """The DRF JWT hello API's response body."""
+    return {
+        "message": "Hello World from DRF JWT!",
+        "timestamp": current_timestamp(),
+        "userId": auth.payload.get("sub"),
+        "tenantId": auth.payload.get("tnt_id"),
+    }
+
+
+@batch_action("hello")
+def hello(operation: Dict[str, Any], auth: JWTAuthResult) -> Tuple[int, Dict[str, Any]]:
+    return 200, jwt_hello(auth)
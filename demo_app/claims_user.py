@@ -0,0 +1,118 @@
+"""
+__WRISTBAND__: A request user built from verified JWT claims, for the JWT-protected routes.
+
+By default the SDK leaves request.user to AuthenticationMiddleware on require_jwt/JwtRequiredMixin routes, and
+DrfJwtAuth calls django.contrib.auth.get_user(): both decrypt the session cookie, if the client sent one, and
+query the database for the User. A bearer token already says who the caller is, so ClaimsUserMixin sets a
+ClaimsUser instead:
+
+    - request.user.id / .username: the Wristband user ID (`sub`), which is also the Django username given by
+      WristbandAuthBackend
+    - request.user.tenant_id, .roles and .claims: from the token
+    - request.user.is_authenticated: True, which is all DRF's IsAuthenticated checks
+
+Views that need the User model instance ask for it explicitly with request.user.get_model() (or
+aget_model()); that's the only time the database is queried.
+"""
+
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest
+from wristband.django_auth import JWTAuthConfig, JWTAuthResult
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import AbstractBaseUser
+    from rest_framework.authentication import BaseAuthentication
+
+_NOT_LOADED: Any = object()
+
+
+class ClaimsUser:
+    """Authenticated user backed by verified JWT claims. Never touches the database unless get_model() is called."""
+
+    __slots__ = ("claims", "id", "tenant_id", "roles", "_model")
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+    is_staff = False
+    is_superuser = False
+
+    def __init__(self, claims: Dict[str, Any]) -> None:
+        self.claims = claims
+        self.id: Optional[str] = claims.get("sub")
+        self.tenant_id: Optional[str] = claims.get("tnt_id")
+        self.roles: Tuple[str, ...] = tuple(
+            role.get("name", "") if isinstance(role, dict) else str(role) for role in claims.get("roles") or ()
+        )
+        self._model: Optional["AbstractBaseUser"] = _NOT_LOADED
+
+    @property
+    def pk(self) -> Optional[str]:
+        return self.id
+
+    @property
+    def username(self) -> Optional[str]:
+        return self.id
+
+    def get_username(self) -> str:
+        return self.id or ""
+
+    def get_model(self) -> Optional["AbstractBaseUser"]:
+        """The Django User for this token's subject, or None if it never logged in. Queried once per request."""
+        if self._model is _NOT_LOADED:
+            self._model = get_user_model()._default_manager.filter(username=self.id).first()
+        return self._model
+
+    async def aget_model(self) -> Optional["AbstractBaseUser"]:
+        """Async get_model()."""
+        if self._model is _NOT_LOADED:
+            self._model = await get_user_model()._default_manager.filter(username=self.id).afirst()
+        return self._model
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, ClaimsUser) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __str__(self) -> str:
+        return self.get_username()
+
+    def __repr__(self) -> str:
+        return f"<ClaimsUser {self.id} tenant={self.tenant_id}>"
+
+
+class ClaimsUserMixin:
+    """
+    WristbandAuth mixin that sets a ClaimsUser as request.user whenever a bearer token is valid.
+
+    Covers the decorators and mixins (they validate through _try_jwt_auth) and replaces the SDK's DRF JWT
+    authentication class with one that returns the ClaimsUser instead of looking up the session's User.
+    """
+
+    def _try_jwt_auth(self, request: HttpRequest, jwt_validator: Any) -> bool:
+        if not super()._try_jwt_auth(request, jwt_validator):  # type: ignore[misc]
+            return False
+        request.user = ClaimsUser(request.auth.payload)  # type: ignore[assignment, attr-defined]
+        return True
+
+    def create_drf_jwt_auth(self, jwt_config: Optional[JWTAuthConfig] = None) -> "type[BaseAuthentication]":
+        from rest_framework.authentication import BaseAuthentication
+
+        wristband_auth = self
+        jwt_validator = self._create_jwt_validator(jwt_config)  # type: ignore[attr-defined]
+
+        class ClaimsDrfJwtAuth(BaseAuthentication):
+            """DRF authentication with Wristband JWTs; request.user is a ClaimsUser, request.auth the JWTAuthResult."""
+
+            def authenticate(self, request: HttpRequest) -> Optional[Tuple[ClaimsUser, JWTAuthResult]]:
+                if not wristband_auth._try_jwt_auth(request, jwt_validator):
+                    return None
+                return request.user, request.auth  # type: ignore[return-value, attr-defined]
+
+            def authenticate_header(self, request: HttpRequest) -> str:
+                return 'Bearer realm="api"'
+
+        return ClaimsDrfJwtAuth
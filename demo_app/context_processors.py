@@ -6,12 +6,67 @@ from typing import Any, Dict
 
 from django.http import HttpRequest
 
+# Explicit list of fields used in demo templates
+SESSION_FIELDS = (
+    "is_authenticated",
+    "user_id",
+    "tenant_id",
+    "tenant_name",
+    "tenant_custom_domain",
+    "identity_provider_name",
+    "email",
+    "given_name",
+    # ⚠️ DEMO ONLY - don't expose tokens in production templates
+    "access_token",
+)
+
+_SNAPSHOT_ATTR = "_wristband_session_snapshot"
+_CONTEXT_ATTR = "_wristband_auth_context"
+
+
+def get_session_snapshot(request: HttpRequest) -> Dict[str, Any]:
+    """
+    Read the template-visible session fields once per request.
+
+    The first call loads (and, with the encrypted cookie engine, decrypts) the session and memoizes the
+    non-empty fields on the request. Later calls, from the same or nested template renders, reuse it.
+    """
+    snapshot = getattr(request, _SNAPSHOT_ATTR, None)
+    if snapshot is None:
+        session = request.session
+        snapshot = {}
+        for field in SESSION_FIELDS:
+            value = session.get(field)
+            if value is not None:
+                snapshot[field] = value
+        setattr(request, _SNAPSHOT_ATTR, snapshot)
+    return snapshot
+
+
+class LazySessionValue:
+    """
+    Template variable that resolves to one session field on first use.
+
+    Django templates call callables when resolving variables, so the session is only touched if a template
+    actually uses the variable. Missing fields resolve to "", the same as an absent context variable.
+    """
+
+    __slots__ = ("_request", "_field")
+
+    def __init__(self, request: HttpRequest, field: str) -> None:
+        self._request = request
+        self._field = field
+
+    def __call__(self) -> Any:
+        return get_session_snapshot(self._request).get(self._field, "")
+
 
 def wristband_auth(request: HttpRequest) -> Dict[str, Any]:
     """
     Add Wristband auth context to templates.
 
-    Exposes session fields directly to templates (no nesting).
+    Exposes session fields directly to templates (no nesting). Values are lazy: a page that never
+    references them never loads the session, and all references share one read of it.
 
     Args:
         request: Django HTTP request with session middleware enabled.
@@ -25,18 +80,8 @@ def wristband_auth(request: HttpRequest) -> Dict[str, Any]:
     if not hasattr(request, "session"):
         return {}
 
-    # Explicit list of fields used in demo templates
-    session_fields = [
-        "is_authenticated",
-        "user_id",
-        "tenant_id",
-        "tenant_name",
-        "tenant_custom_domain",
-        "identity_provider_name",
-        "email",
-        "given_name",
-        # ⚠️ DEMO ONLY - don't expose tokens in production templates
-        "access_token",
-    ]
-
-    return {field: request.session.get(field) for field in session_fields if request.session.get(field) is not None}
+    context = getattr(request, _CONTEXT_ATTR, None)
+    if context is None:
+        context = {field: LazySessionValue(request, field) for field in SESSION_FIELDS}
+        setattr(request, _CONTEXT_ATTR, context)
+    return context
@@ -0,0 +1,49 @@
+"""
+__WRISTBAND__: DRF parser and renderer on top of demo_app.fast_json, registered in REST_FRAMEWORK.
+
+Requests to the DRF views are parsed and rendered with the same loads()/dumps() as the classic views.
+"""
+
+from typing import Any, Mapping, Optional
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from .fast_json import dumps, loads
+
+# Line and paragraph separators are valid JSON but not valid JavaScript, so DRF escapes them
+_JS_UNSAFE = ((b"\xe2\x80\xa8", b"\\u2028"), (b"\xe2\x80\xa9", b"\\u2029"))
+
+
+class FastJSONParser(JSONParser):
+    """DRF JSONParser that decodes with loads()."""
+
+    def parse(
+        self, stream: Any, media_type: Optional[str] = None, parser_context: Optional[Mapping[str, Any]] = None
+    ) -> Any:
+        try:
+            return loads(stream.read())
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class FastJSONRenderer(JSONRenderer):
+    """DRF JSONRenderer that encodes with dumps(). Indented output (the browsable API) uses DRF's own renderer."""
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping[str, Any]] = None,
+    ) -> bytes:
+        if data is None:
+            return b""
+        if self.get_indent(accepted_media_type or "", renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        content = dumps(data)
+        for unsafe, escaped in _JS_UNSAFE:
+            if unsafe in content:
+                content = content.replace(unsafe, escaped)
+        return content
@@ -0,0 +1,78 @@
+"""
+__WRISTBAND__: One JSON encode/decode path for both the classic Django views and the DRF views.
+
+Uses orjson when it is installed (pip install -e ".[fastjson]") and the standard library otherwise, with
+the same output either way: compact, UTF-8, and Django's encoding of dates, decimals and UUIDs.
+
+    - loads() / dumps(): request bodies and response payloads
+    - FastJsonResponse: drop-in JsonResponse for classic views
+    - FastJSONParser / FastJSONRenderer (demo_app/drf_json.py): DRF's JSONParser / JSONRenderer, registered
+      in REST_FRAMEWORK and kept out of this module so the classic views don't import DRF
+    - current_timestamp(): the "YYYY-MM-DD HH:MM:SS" timestamps the hello APIs return, formatted once per second
+"""
+
+import json
+import time
+from datetime import datetime
+from typing import Any, Tuple, Union
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAS_ORJSON = False
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_timestamp: Tuple[int, str] = (0, "")
+
+if HAS_ORJSON:
+    _ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    _django_encoder = DjangoJSONEncoder()
+
+    def dumps(obj: Any) -> bytes:
+        """Encode to compact UTF-8 JSON."""
+        return orjson.dumps(obj, default=_django_encoder.default, option=_ORJSON_OPTIONS)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON. Raises ValueError on malformed input."""
+        return orjson.loads(data)
+
+else:
+    _encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def dumps(obj: Any) -> bytes:
+        """Encode to compact UTF-8 JSON."""
+        return _encoder.encode(obj).encode("utf-8")
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Decode JSON. Raises ValueError on malformed input."""
+        return json.loads(data)
+
+
+def current_timestamp() -> str:
+    """Local time as "YYYY-MM-DD HH:MM:SS". Formatted at most once per second per process."""
+    global _timestamp
+    now = int(time.time())
+    cached = _timestamp
+    if cached[0] != now:
+        cached = _timestamp = (now, datetime.fromtimestamp(now).strftime(TIMESTAMP_FORMAT))
+    return cached[1]
+
+
+class FastJsonResponse(HttpResponse):
+    """
+    JsonResponse encoded with dumps().
+
+    Like JsonResponse, only dicts are accepted unless `safe=False`.
+    """
+
+    def __init__(self, data: Any, safe: bool = True, **kwargs: Any) -> None:
+        if safe and not isinstance(data, dict):
+            raise TypeError("In order to allow non-dict objects to be serialized set the safe parameter to False.")
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
@@ -0,0 +1,162 @@
+"""
+__WRISTBAND__: Pooled, keep-alive HTTP clients for the calls WristbandAuth makes to Wristband.
+
+The SDK creates its own httpx.Client for the token, userinfo and revoke calls and a second one for SDK
+auto-configuration, each with httpx's default pool (connections idle for more than 5 seconds are closed).
+Logins rarely arrive that close together, so most of them paid a fresh TCP + TLS handshake to the vanity
+domain. PooledHttpClientMixin replaces both with one configurable pool per worker and counts how often a
+request reused a connection.
+
+Configuration (all optional), under WRISTBAND_AUTH["http_client"]:
+    max_connections: 20              # Connections the pool may hold open at once
+    max_keepalive_connections: 10    # Idle connections kept for reuse
+    keepalive_expiry: 300.0          # Seconds an idle connection stays open
+    http2: False                     # Requires the h2 package (pip install -e ".[http2]")
+    connect_timeout: 5.0             # Seconds; the other timeouts bound each read, write and pool wait
+    read_timeout: 15.0
+    write_timeout: 15.0
+    pool_timeout: 5.0
+"""
+
+import importlib.util
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+from django.core.exceptions import ImproperlyConfigured
+
+from .async_auth import AsyncWristbandApiClient
+
+
+@dataclass(frozen=True)
+class HttpClientConfig:
+    """Connection pool and timeout settings for the clients that talk to Wristband."""
+
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 300.0
+    http2: bool = False
+    connect_timeout: float = 5.0
+    read_timeout: float = 15.0
+    write_timeout: float = 15.0
+    pool_timeout: float = 5.0
+
+    def client_options(self) -> Dict[str, Any]:
+        """Keyword arguments shared by httpx.Client and httpx.AsyncClient."""
+        if self.http2 and importlib.util.find_spec("h2") is None:
+            raise ImproperlyConfigured(
+                'WRISTBAND_AUTH["http_client"]["http2"] requires the h2 package: pip install -e ".[http2]"'
+            )
+
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(
+                connect=self.connect_timeout,
+                read=self.read_timeout,
+                write=self.write_timeout,
+                pool=self.pool_timeout,
+            ),
+            "http2": self.http2,
+        }
+
+
+class ConnectionStats:
+    """
+    Thread-safe counters of requests and the connections opened to serve them.
+
+    Updated from httpcore's trace extension: every request passes through the pool, but only requests that
+    found no idle connection open a TCP connection (and, for https, perform a TLS handshake).
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.connections_opened = 0
+        self.tls_handshakes = 0
+        self._lock = threading.Lock()
+
+    def record(self, event_name: str) -> None:
+        """Count a trace event. Only new connections and completed TLS handshakes are of interest."""
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def count_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace extension for sync clients."""
+        self.record(event_name)
+
+    async def atrace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """httpcore trace extension for async clients."""
+        self.record(event_name)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring. `reused` is the number of requests served on an existing connection."""
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connections_opened": self.connections_opened,
+                "tls_handshakes": self.tls_handshakes,
+                "reused": max(self.requests - self.connections_opened, 0),
+            }
+
+
+def build_http_client(config: HttpClientConfig, headers: Dict[str, str], stats: ConnectionStats) -> httpx.Client:
+    """Sync client whose requests are counted in `stats`."""
+
+    def trace_request(request: httpx.Request) -> None:
+        stats.count_request()
+        request.extensions["trace"] = stats.trace
+
+    return httpx.Client(headers=headers, event_hooks={"request": [trace_request]}, **config.client_options())
+
+
+def async_client_options(config: HttpClientConfig, stats: ConnectionStats) -> Dict[str, Any]:
+    """AsyncWristbandApiClient options for clients whose requests are counted in `stats`."""
+
+    async def trace_request(request: httpx.Request) -> None:
+        stats.count_request()
+        request.extensions["trace"] = stats.atrace
+
+    return {"event_hooks": {"request": [trace_request]}, **config.client_options()}
+
+
+class PooledHttpClientMixin:
+    """
+    WristbandAuth mixin that sends every call to Wristband through one configured connection pool per worker.
+
+    The SDK's API client and its auto-configuration client share a single httpx.Client; the async flows get
+    the same pool settings on their per-event-loop httpx.AsyncClient. `connection_stats.stats()` reports how
+    many requests reused a connection.
+    """
+
+    connection_stats: ConnectionStats
+    http_client_config: HttpClientConfig
+
+    def __init__(self, *args: Any, http_client_config: Optional[HttpClientConfig] = None, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.http_client_config = http_client_config or HttpClientConfig()
+        self.connection_stats = ConnectionStats()
+
+        api_client = self._wristband_api  # type: ignore[attr-defined]
+        api_client.client.close()
+        api_client.client = build_http_client(self.http_client_config, api_client.headers, self.connection_stats)
+
+        # Auto-configuration uses the same credentials and vanity domain, so it can share the pool
+        config_api_client = self._config_resolver.wristband_api  # type: ignore[attr-defined]
+        config_api_client.client.close()
+        config_api_client.client = api_client.client
+
+        self._async_wristband_api = AsyncWristbandApiClient(
+            api_client, **async_client_options(self.http_client_config, self.connection_stats)
+        )
@@ -0,0 +1,352 @@
+"""
+__WRISTBAND__: A JWKS (signing key) cache shared by the worker processes on a host.
+
+The SDK gives every JWT validator (one per require_jwt decorator, JwtRequiredMixin and DrfJwtAuth class) its
+own JWKS client, so each worker fetches and parses the Wristband JWKS once per validator, at startup and again
+whenever a token arrives signed with a key it hasn't seen. SharedJwksMixin gives all of them one
+SharedJwksClient, whose keys live in a file that every worker on the host reads:
+
+    - keys are fetched by one process at a time: the file is rewritten atomically under an exclusive lock,
+      and workers that were waiting for the lock use the keys just written instead of fetching again
+    - keys are fresh for WRISTBAND_JWKS_CACHE_TTL seconds; for WRISTBAND_JWKS_STALE_TTL seconds after that
+      they're still used while a background thread refreshes them (stale-while-revalidate), so a refresh
+      never holds up a request
+    - a token whose `kid` isn't cached triggers a refetch, unless the JWKS was fetched (by any worker) in the
+      last WRISTBAND_JWKS_MISS_REFETCH_INTERVAL seconds: tokens with made-up key IDs can't flood Wristband
+    - only the worker that needs a missing key waits for it; the others keep validating with the keys they have
+
+The file holds the public keys in PEM form, already checked for strength, in WRISTBAND_JWKS_CACHE_DIR (a
+directory only this user may write to; otherwise each worker keeps its keys to itself). Hits, fetches and
+rate-limited misses are published on /metrics as demo_jwks_*, and fetch time as the jwks_fetch auth phase.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import stat
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import httpx
+from django.conf import settings
+from wristband.django_auth import JWTAuthConfig
+
+from .metrics import timed_phase
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, each worker may fetch on its own
+    fcntl = None  # type: ignore[assignment]
+
+if TYPE_CHECKING:
+    from wristband.python_jwt import WristbandJwtValidator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 3600.0
+DEFAULT_STALE_TTL = 86400.0
+DEFAULT_MISS_REFETCH_INTERVAL = 10.0
+FETCH_TIMEOUT = 10.0
+
+
+@dataclass(frozen=True)
+class JwksSnapshot:
+    """The shared keys as of one read of the cache file. Times are epoch seconds; 0 means never."""
+
+    keys: Dict[str, str] = field(default_factory=dict)
+    fetched_at: float = 0.0
+    attempted_at: float = 0.0
+
+
+def _secure_directory(directory: Path) -> bool:
+    """Create the cache directory if needed; whether it's safe to trust keys read from it."""
+    try:
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        info = directory.stat()
+    except OSError as e:
+        logger.warning("JWKS cache directory %s is unusable, keys won't be shared: %s", directory, e)
+        return False
+    getuid = getattr(os, "getuid", None)
+    if (getuid is not None and info.st_uid != getuid()) or info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        logger.warning("JWKS cache directory %s is writable by other users, keys won't be shared", directory)
+        return False
+    return True
+
+
+class SharedJwksClient:
+    """
+    Stand-in for the SDK's JWKSClient whose keys are shared through a file by every worker on the host.
+
+    Thread-safe. Keys are converted and checked for strength by the SDK client's own code.
+    """
+
+    def __init__(
+        self,
+        jwks_uri: str,
+        cache_dir: Optional[Path] = None,
+        ttl: float = DEFAULT_CACHE_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        miss_refetch_interval: float = DEFAULT_MISS_REFETCH_INTERVAL,
+    ) -> None:
+        self.jwks_uri = jwks_uri
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.miss_refetch_interval = miss_refetch_interval
+        self.hits = 0
+        self.stale_hits = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+        self.shared_refreshes = 0
+        self.rate_limited = 0
+
+        directory = Path(cache_dir or tempfile.gettempdir()) / "wristband-jwks"
+        self.path: Optional[Path] = None
+        if _secure_directory(directory):
+            self.path = directory / f"{hashlib.sha256(jwks_uri.encode('utf-8')).hexdigest()[:32]}.json"
+        self._snapshot = JwksSnapshot()
+        self._file_signature: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def get_signing_key(self, kid: str) -> str:
+        snapshot = self._read()
+        pem = snapshot.keys.get(kid)
+        age = time.time() - snapshot.fetched_at
+        if pem is not None and age < self.ttl + self.stale_ttl:
+            if age < self.ttl:
+                self._count("hits")
+            else:
+                self._count("stale_hits")
+                self._refresh_in_background(snapshot)
+            return pem
+
+        if pem is None and time.time() - snapshot.attempted_at < self.miss_refetch_interval:
+            self._count("rate_limited")
+            raise ValueError(f"Unable to find a signing key that matches '{kid}'")
+
+        try:
+            snapshot = self._refresh(snapshot, wait=True)
+        except ValueError:
+            if pem is None:
+                raise
+            # Wristband is unreachable: an expired copy of a known key beats rejecting every token
+            logger.warning("Using JWKS fetched %.0f seconds ago, refreshing it failed", age)
+            return pem
+
+        pem = snapshot.keys.get(kid)
+        if pem is None:
+            raise ValueError(f"Unable to find a signing key that matches '{kid}'")
+        return pem
+
+    def clear(self) -> None:
+        """Forget this process's copy of the keys; the next lookup reads the shared file again."""
+        with self._lock:
+            self._snapshot = JwksSnapshot()
+            self._file_signature = None
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return {"size": len(self._read().keys), "max_size": 0}
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "keys": len(self._snapshot.keys),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "fetches": self.fetches,
+                "fetch_errors": self.fetch_errors,
+                "shared_refreshes": self.shared_refreshes,
+                "rate_limited": self.rate_limited,
+            }
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _read(self) -> JwksSnapshot:
+        """The latest snapshot: this process's copy, re-read from the shared file if another worker rewrote it."""
+        if self.path is None:
+            return self._snapshot
+        try:
+            info = os.stat(self.path)
+        except FileNotFoundError:
+            return self._snapshot
+        signature = (info.st_ino, info.st_mtime_ns, info.st_size)
+        if signature == self._file_signature:
+            return self._snapshot
+
+        try:
+            with open(self.path, "rb") as f:
+                data = json.load(f)
+            snapshot = JwksSnapshot(
+                keys=dict(data["keys"]), fetched_at=float(data["fetched_at"]), attempted_at=float(data["attempted_at"])
+            )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable JWKS cache file %s: %s", self.path, e)
+            return self._snapshot
+        with self._lock:
+            # Keep whichever is newer: a write by this process may have raced with the read
+            if snapshot.attempted_at >= self._snapshot.attempted_at:
+                self._snapshot = snapshot
+            self._file_signature = signature
+            return self._snapshot
+
+    def _write(self, snapshot: JwksSnapshot) -> None:
+        with self._lock:
+            self._snapshot = snapshot
+        if self.path is None:
+            return
+        data = {"keys": snapshot.keys, "fetched_at": snapshot.fetched_at, "attempted_at": snapshot.attempted_at}
+        fd, temp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".jwks-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning("Couldn't write the JWKS cache file %s: %s", self.path, e)
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def _fetch(self) -> Dict[str, str]:
+        """
+        Kid to PEM for the RSA keys in Wristband's JWKS.
+
+        A key the SDK rejects (too weak or malformed) is logged and left out, so it can't hide the good ones;
+        its kid then fails validation, as it would with the SDK. Raises ValueError if no key is usable.
+        """
+        # Imported here, like the SDK does when it creates the first JWT validator
+        from wristband.python_jwt.jwks_client import JWKSClient
+        from wristband.python_jwt.models import JWKSResponse
+
+        with timed_phase("jwks_fetch"):
+            response = httpx.get(self.jwks_uri, timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            jwks = JWKSResponse(response.json())
+        # _jwk_to_pem() doesn't use the client's state
+        jwk_to_pem = JWKSClient._jwk_to_pem
+        keys = {}
+        for key in jwks.keys:
+            if key.kty != "RSA":
+                continue
+            try:
+                keys[key.kid] = jwk_to_pem(self, key)  # type: ignore[arg-type]
+            except ValueError as e:
+                logger.warning("Skipping JWKS signing key %s: %s", key.kid, e)
+        if not keys:
+            # Keep serving the keys cached so far rather than replacing them with none
+            raise ValueError("No usable RSA signing keys in the JWKS")
+        return keys
+
+    def _refresh(self, seen: JwksSnapshot, wait: bool) -> JwksSnapshot:
+        """
+        Fetch the JWKS into the shared file, unless another thread or worker did so since `seen` was read.
+
+        Without `wait`, gives up (returning the current snapshot) if another process is already fetching.
+        Raises ValueError if the fetch fails.
+        """
+        with self._refresh_lock, self._file_lock(wait) as locked:
+            current = self._read()
+            if current.attempted_at > seen.attempted_at:
+                self._count("shared_refreshes")
+                return current
+            if not locked:
+                return current
+
+            now = time.time()
+            try:
+                keys = self._fetch()
+            except Exception as e:
+                self._count("fetch_errors")
+                # Recorded, so that the other workers' key misses don't all retry right away
+                self._write(JwksSnapshot(current.keys, current.fetched_at, now))
+                raise ValueError(f"Failed to fetch JWKS: {e}") from e
+            self._count("fetches")
+            snapshot = JwksSnapshot(keys, now, now)
+            self._write(snapshot)
+            return snapshot
+
+    def _refresh_in_background(self, seen: JwksSnapshot) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def refresh() -> None:
+            try:
+                self._refresh(seen, wait=False)
+            except ValueError as e:
+                logger.warning("Background JWKS refresh failed: %s", e)
+            finally:
+                with self._lock:
+                    self._refreshing = False
+
+        threading.Thread(target=refresh, name="jwks-refresh", daemon=True).start()
+
+    def _file_lock(self, wait: bool) -> "_LockContext":
+        return _LockContext(None if self.path is None else self.path.with_suffix(".lock"), wait)
+
+
+class _LockContext:
+    """Exclusive lock on a file shared by the host's workers; yields whether it was acquired."""
+
+    def __init__(self, path: Optional[Path], wait: bool) -> None:
+        self.path = path
+        self.wait = wait
+        self.fd: Optional[int] = None
+
+    def __enter__(self) -> bool:
+        if self.path is None or fcntl is None:
+            return True
+        self.fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(self.fd, fcntl.LOCK_EX if self.wait else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(self.fd)
+            self.fd = None
+            return False
+        return True
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self.fd is not None:
+            os.close(self.fd)  # Releases the lock
+            self.fd = None
+
+
+class SharedJwksMixin:
+    """
+    WristbandAuth mixin whose JWT validators all get their signing keys from one SharedJwksClient.
+
+    WRISTBAND_JWKS_SHARED = False restores the SDK's per-validator JWKS clients.
+    """
+
+    jwks_client: Optional[SharedJwksClient]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.jwks_client = None
+        if getattr(settings, "WRISTBAND_JWKS_SHARED", True):
+            config_resolver = self._config_resolver  # type: ignore[attr-defined]
+            vanity_domain = config_resolver.get_wristband_application_vanity_domain()
+            self.jwks_client = SharedJwksClient(
+                f"https://{vanity_domain}/api/v1/oauth2/jwks",
+                cache_dir=getattr(settings, "WRISTBAND_JWKS_CACHE_DIR", None),
+                ttl=getattr(settings, "WRISTBAND_JWKS_CACHE_TTL", DEFAULT_CACHE_TTL),
+                stale_ttl=getattr(settings, "WRISTBAND_JWKS_STALE_TTL", DEFAULT_STALE_TTL),
+                miss_refetch_interval=getattr(
+                    settings, "WRISTBAND_JWKS_MISS_REFETCH_INTERVAL", DEFAULT_MISS_REFETCH_INTERVAL
+                ),
+            )
+
+    def _create_jwt_validator(self, jwt_config: Optional[JWTAuthConfig]) -> "WristbandJwtValidator":
+        validator = super()._create_jwt_validator(jwt_config)  # type: ignore[misc]
+        if self.jwks_client is not None:
+            validator._jwks_client = self.jwks_client
+        return validator  # type: ignore[no-any-return]
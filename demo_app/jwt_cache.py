@@ -0,0 +1,90 @@
+"""
+__WRISTBAND__: In-process cache of verified JWT validation results.
+
+SPA clients send the same access token on every API call until it expires, and each call would otherwise
+re-parse the token and re-check its RS256 signature. The cache keeps successful validation results keyed by
+a SHA-256 digest of the token, so repeat requests skip the crypto until the token's `exp` passes.
+"""
+
+import hashlib
+from typing import TYPE_CHECKING, Any, List, Optional, Union
+
+from django.conf import settings
+from wristband.django_auth import JWTAuthConfig
+
+from .lru_cache import ExpiringLRUCache
+
+if TYPE_CHECKING:
+    # Imported by the SDK when it creates the first JWT validator
+    from wristband.python_jwt import JwtValidationResult, WristbandJwtValidator
+
+DEFAULT_JWT_CACHE_SIZE = 1024
+
+
+class VerifiedJwtCache(ExpiringLRUCache[bytes, "JwtValidationResult"]):
+    """
+    Thread-safe, bounded LRU of verified JWT validation results.
+
+    Entries expire at the token's `exp` claim. When the cache is full, the least recently used entry is evicted.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_JWT_CACHE_SIZE) -> None:
+        super().__init__(max_size)
+
+    @staticmethod
+    def token_digest(token: str) -> bytes:
+        """Cache key for a raw token. Raw tokens are never kept in memory as keys."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get_result(self, token: str) -> Optional["JwtValidationResult"]:
+        """Return the cached result for a token, or None if it is unknown or has expired."""
+        return self.get(self.token_digest(token))
+
+    def set_result(self, token: str, result: "JwtValidationResult") -> None:
+        """Cache a successful validation result until the token's `exp` claim."""
+        if not result.is_valid or result.payload is None or not result.payload.exp:
+            return
+        self.set(self.token_digest(token), result, float(result.payload.exp))
+
+
+class CachingJwtValidator:
+    """
+    Wraps a WristbandJwtValidator so that successful validations are served from a VerifiedJwtCache.
+
+    Failed validations are never cached, so an invalid token is re-checked on every request.
+    """
+
+    def __init__(self, validator: "WristbandJwtValidator", cache: VerifiedJwtCache) -> None:
+        self._validator = validator
+        self._cache = cache
+
+    def extract_bearer_token(self, authorization_header: Optional[Union[str, List[str]]] = None) -> str:
+        return self._validator.extract_bearer_token(authorization_header)
+
+    def validate(self, token: str) -> "JwtValidationResult":
+        result = self._cache.get_result(token)
+        if result is not None:
+            return result
+
+        result = self._validator.validate(token)
+        self._cache.set_result(token, result)
+        return result
+
+
+class JwtResultCacheMixin:
+    """
+    WristbandAuth mixin that puts a shared VerifiedJwtCache in front of every JWT validator it creates.
+
+    The SDK builds one validator per decorator, mixin and DRF auth class. They all validate tokens from the same
+    issuer, so they share one cache. The size comes from the WRISTBAND_JWT_CACHE_SIZE setting (0 disables it).
+    """
+
+    jwt_result_cache: VerifiedJwtCache
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.jwt_result_cache = VerifiedJwtCache(getattr(settings, "WRISTBAND_JWT_CACHE_SIZE", DEFAULT_JWT_CACHE_SIZE))
+
+    def _create_jwt_validator(self, jwt_config: Optional[JWTAuthConfig]) -> Any:
+        validator = super()._create_jwt_validator(jwt_config)  # type: ignore[misc]
+        return CachingJwtValidator(validator, self.jwt_result_cache)
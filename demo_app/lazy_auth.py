@@ -0,0 +1,106 @@
+"""
+__WRISTBAND__: Lazy stand-ins for the auth decorators, mixins and DRF classes in demo_app/wristband.py.
+
+Creating them through WristbandAuth builds the SDK instance (HTTP clients, TLS contexts) and, for JWT auth,
+a validator. Defined with these helpers, nothing is built when a worker imports the views; the SDK objects
+are created by the first request that needs them.
+
+    - LazyAuthDecorator: a view decorator whose SDK decorator is created on the first decorated request
+    - lazy_auth_mixin(): a class-based view mixin that authenticates through a LazyAuthDecorator
+    - lazy_drf_auth(): a DRF authentication class whose SDK class is created when DRF first instantiates it
+"""
+
+import functools
+import threading
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Optional, Type, cast
+
+from django.http import HttpRequest, HttpResponse
+
+if TYPE_CHECKING:
+    from rest_framework.authentication import BaseAuthentication
+
+ViewFunc = Callable[..., HttpResponse]
+AuthDecorator = Callable[[ViewFunc], ViewFunc]
+
+
+class LazyAuthDecorator:
+    """
+    View decorator that defers creating the SDK decorator until a decorated view is first called.
+
+    `factory` returns the real decorator, e.g. `lambda: wristband_auth.create_auth_decorator(...)`.
+    """
+
+    def __init__(self, factory: Callable[[], AuthDecorator]) -> None:
+        self._factory = factory
+        self._decorator: Optional[AuthDecorator] = None
+        self._lock = threading.Lock()
+
+    @property
+    def decorator(self) -> AuthDecorator:
+        """The SDK decorator, created on first access."""
+        decorator = self._decorator
+        if decorator is None:
+            with self._lock:
+                if self._decorator is None:
+                    self._decorator = self._factory()
+                decorator = self._decorator
+        return decorator
+
+    def __call__(self, view_func: ViewFunc) -> ViewFunc:
+        decorated: Optional[ViewFunc] = None
+
+        @functools.wraps(view_func)
+        def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            nonlocal decorated
+            if decorated is None:
+                decorated = self.decorator(view_func)
+            return decorated(request, *args, **kwargs)
+
+        return view
+
+
+class LazyAuthMixin:
+    """
+    Class-based view mixin that runs dispatch() behind `auth_decorator`.
+
+    The decorator enforces the same strategies and unauthenticated behavior as the SDK's mixins. Like them,
+    it must be the leftmost class in the inheritance chain.
+    """
+
+    auth_decorator: ClassVar[LazyAuthDecorator]
+
+    def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return self.auth_decorator.decorator(super().dispatch)(request, *args, **kwargs)  # type: ignore[misc]
+
+
+def lazy_auth_mixin(name: str, factory: Callable[[], AuthDecorator]) -> Type[LazyAuthMixin]:
+    """A LazyAuthMixin subclass authenticating with the decorator `factory` returns."""
+    return type(name, (LazyAuthMixin,), {"auth_decorator": LazyAuthDecorator(factory), "__module__": __name__})
+
+
+class LazyDrfAuth:
+    """
+    Stand-in for a DRF authentication class: instantiating it returns an instance of the real class.
+
+    DRF instantiates each of a view's `authentication_classes` per request, so the SDK class is created by
+    the first request to a view that uses it.
+    """
+
+    create_auth_class: ClassVar[Callable[[], type]]
+    _auth_class: ClassVar[Optional[type]] = None
+    _lock: ClassVar[threading.Lock]
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> Any:
+        auth_class = cls._auth_class
+        if auth_class is None:
+            with cls._lock:
+                if cls._auth_class is None:
+                    cls._auth_class = cls.create_auth_class()
+                auth_class = cls._auth_class
+        return auth_class(*args, **kwargs)
+
+
+def lazy_drf_auth(name: str, factory: Callable[[], Type["BaseAuthentication"]]) -> Type["BaseAuthentication"]:
+    """A LazyDrfAuth subclass standing in for the class `factory` returns. Typed as that class."""
+    attributes = {"create_auth_class": staticmethod(factory), "_lock": threading.Lock(), "__module__": __name__}
+    return cast(Type["BaseAuthentication"], type(name, (LazyDrfAuth,), attributes))
@@ -0,0 +1,97 @@
+"""
+__WRISTBAND__: Bounded, thread-safe LRU with per-entry expiry, shared by the demo's in-process caches.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class ExpiringLRUCache(Generic[K, V]):
+    """
+    Thread-safe, bounded LRU whose entries expire at an absolute wall-clock time.
+
+    When the cache is full, the least recently used entry is evicted. A max_size of 0 disables caching.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 0:
+            raise ValueError("max_size must be zero or greater")
+
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[K, Tuple[V, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: K) -> Optional[V]:
+        """Return the cached value, or None if the key is unknown or has expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                self.evictions += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: K, value: V, expires_at: float) -> None:
+        """Cache a value until the given Unix timestamp."""
+        if self.max_size == 0:
+            return
+
+        with self._lock:
+            self._insert(key, value, expires_at)
+
+    def add(self, key: K, value: V, expires_at: float) -> bool:
+        """Cache a value unless the key already holds one that hasn't expired. True if the value was added."""
+        if self.max_size == 0:
+            return False
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() < entry[1]:
+                return False
+            self._insert(key, value, expires_at)
+            return True
+
+    def _insert(self, key: K, value: V, expires_at: float) -> None:
+        """With the lock held: store the entry as the most recently used and evict beyond max_size."""
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard(self, key: K) -> None:
+        """Remove a key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters for monitoring."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
@@ -0,0 +1,400 @@
+"""
+Time the auth building blocks one at a time, with no Wristband application, browser or server in the loop.
+
+Each benchmark calls one piece of the login, session and JWT paths repeatedly, on synthetic data:
+
+    - CallbackData for a made-up user, as the callback view receives it, with an RS256 access token signed by
+      a key generated for the run; DrfJwtAuth validates tokens against that key in place of the JWKS endpoint
+    - sessions encoded and decoded by the configured SESSION_ENGINE
+    - MyWristbandAdapter.populate_user() against an in-memory SQLite test database, as on a repeat login
+    - the home, classic and DRF page templates, rendered for a logged-in session
+
+Times are per call: the best of --repeat rounds, each long enough to be measured reliably (the best round is
+the one least disturbed by other work on the machine). With --baseline, the command fails if any benchmark is
+more than --max-regression percent slower than in that file; --save-baseline writes the results as one.
+
+Usage:
+    python manage.py authbench [--only session_decode drf_jwt_auth] [--repeat 5] [--json]
+                               [--baseline authbench.json] [--max-regression 25] [--save-baseline authbench.json]
+"""
+
+import base64
+import json
+import platform
+import statistics
+import time
+import timeit
+from dataclasses import asdict, dataclass
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import django
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.http import HttpRequest
+from django.template.loader import render_to_string
+from django.test import RequestFactory
+from django.urls import resolve
+from rest_framework.request import Request
+from wristband.django_auth import CallbackData, UserInfo, get_session_response, get_token_response
+from wristband.django_auth import session_from_callback as store_callback_session
+
+from ... import context_processors
+from ...adapters import MyWristbandAdapter
+from ...session_events import LOGIN_ID_SESSION_KEY, new_login_id
+from ...wristband import DrfJwtAuth, wristband_auth
+
+SIGNING_KEY_ID = "authbench-signing-key"
+USER_ID = "authbench-user"
+TOKEN_LIFETIME = 1800
+
+# Benchmark name -> (page path, template) of the pages rendered by the template benchmarks
+PAGES = {
+    "template_home": ("/", "demo_app/home.html"),
+    "template_classic": ("/classic/", "demo_app/classic.html"),
+    "template_drf": ("/django-rest-framework/", "demo_app/drf.html"),
+}
+BENCHMARKS = (
+    "session_encode",
+    "session_decode",
+    "session_from_callback",
+    "get_session_response",
+    "get_token_response",
+    "drf_jwt_auth",
+    "drf_jwt_auth_uncached",
+    "context_processor",
+    "populate_user",
+    *PAGES,
+)
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    best_us: float
+    median_us: float
+    calls_per_round: int
+
+
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def sign_access_token(key: rsa.RSAPrivateKey, issuer: str, user_id: str, expires_in: int) -> str:
+    """RS256 access token shaped like Wristband's, signed with the run's key."""
+    now = int(time.time())
+    header = {"alg": "RS256", "typ": "JWT", "kid": SIGNING_KEY_ID}
+    claims = {
+        "iss": issuer,
+        "sub": user_id,
+        "tnt_id": "authbench-tenant",
+        "app_id": "authbench-app",
+        "client_id": "authbench-client",
+        "iat": now,
+        "exp": now + expires_in,
+    }
+    signing_input = f"{_b64url(json.dumps(header).encode())}.{_b64url(json.dumps(claims).encode())}"
+    signature = key.sign(signing_input.encode("ascii"), padding.PKCS1v15(), hashes.SHA256())
+    return f"{signing_input}.{_b64url(signature)}"
+
+
+class LocalJwksClient:
+    """Serves the run's public key to the JWT validators, in place of the Wristband JWKS endpoint."""
+
+    def __init__(self, key: rsa.RSAPrivateKey) -> None:
+        self._pem = (
+            key.public_key()
+            .public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+            .decode("ascii")
+        )
+
+    def get_signing_key(self, kid: str) -> str:
+        if kid != SIGNING_KEY_ID:
+            raise ValueError(f"Unable to find signing key {kid}")
+        return self._pem
+
+    def clear(self) -> None:
+        pass
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        return {"keys": 1}
+
+
+def synthetic_callback_data(access_token: str) -> CallbackData:
+    """CallbackData as acallback() returns it for an owner of a made-up tenant."""
+    user_info = UserInfo.from_api_response(
+        {
+            "user_id": USER_ID,
+            "tenant_id": "authbench-tenant",
+            "application_id": "authbench-app",
+            "identity_provider_name": "wristband",
+            "email": f"{USER_ID}@example.com",
+            "given_name": "Authbench",
+            "roles": [{"id": "authbench-role", "name": "app:authbench:owner", "displayName": "Owner"}],
+        }
+    )
+    return CallbackData(
+        access_token=access_token,
+        id_token="authbench-id-token",  # nosec B106 - synthetic
+        expires_at=int((time.time() + TOKEN_LIFETIME) * 1000),
+        expires_in=TOKEN_LIFETIME,
+        tenant_name="authbench",
+        user_info=user_info,
+        refresh_token="authbench-refresh-token",  # nosec B106 - synthetic
+    )
+
+
+class AuthBenchmarks:
+    """Shared fixtures (signed token, callback data, stored session) and a method per benchmark in BENCHMARKS."""
+
+    def __init__(self) -> None:
+        self.session_store: Callable[..., SessionBase] = import_module(settings.SESSION_ENGINE).SessionStore
+        self.request_factory = RequestFactory()
+
+        signing_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        vanity_domain = wristband_auth._config_resolver.get_wristband_application_vanity_domain()
+        self.access_token = sign_access_token(signing_key, f"https://{vanity_domain}", USER_ID, TOKEN_LIFETIME)
+        # Set before DrfJwtAuth is first used, so its validator is created with the local key
+        wristband_auth.jwks_client = LocalJwksClient(signing_key)  # type: ignore[assignment]
+        self.callback_data = synthetic_callback_data(self.access_token)
+        self.session_data: Dict[str, Any] = {}
+        self.session_key: Optional[str] = None
+
+    def setup(self, name: str) -> Callable[[], Any]:
+        """Build the fixtures of the named benchmark and return the function to time."""
+        # Stored afresh for each benchmark: server-side stores are bounded, and the sessions that earlier
+        # benchmarks saved (session_encode saves thousands) may have evicted the last one
+        self._store_fixture_session()
+        if name in PAGES:
+            return self.template(*PAGES[name])
+        return getattr(self, name)()  # type: ignore[no-any-return]
+
+    def _session_request(self, session: SessionBase, path: str = "/") -> HttpRequest:
+        request = self.request_factory.get(path)
+        request.session = session
+        return request
+
+    def _store_fixture_session(self) -> None:
+        """Save a session as the callback view stores it; its key is in self.session_key."""
+        request = self._session_request(self.session_store())
+        self._store_callback_session(request)
+        self.session_data = dict(request.session.items())
+        request.session.save()
+        self.session_key = request.session.session_key
+
+    def _loaded_session(self) -> SessionBase:
+        """The callback's session, decoded ahead of time."""
+        session = self.session_store(session_key=self.session_key)
+        if not session.get("access_token"):
+            raise CommandError(f"The fixture session didn't load from {settings.SESSION_ENGINE}")
+        return session
+
+    def _store_callback_session(self, request: HttpRequest) -> None:
+        # As the callback view does
+        user_info = self.callback_data.user_info
+        store_callback_session(
+            request=request,
+            callback_data=self.callback_data,
+            custom_fields={
+                "email": user_info.email,
+                "given_name": user_info.given_name,
+                LOGIN_ID_SESSION_KEY: new_login_id(),
+            },
+        )
+
+    def session_encode(self) -> Callable[[], Any]:
+        def encode() -> None:
+            session = self.session_store()
+            session.update(self.session_data)
+            session.save()
+
+        return encode
+
+    def session_decode(self) -> Callable[[], Any]:
+        self._loaded_session()
+        return lambda: self.session_store(session_key=self.session_key).load()
+
+    def session_from_callback(self) -> Callable[[], Any]:
+        request = self._session_request(self.session_store())
+        return lambda: self._store_callback_session(request)
+
+    def get_session_response(self) -> Callable[[], Any]:
+        request = self._session_request(self._loaded_session())
+        # As SessionEndpoint builds it
+        return lambda: get_session_response(request, metadata={"email": request.session.get("email")}).to_dict()
+
+    def get_token_response(self) -> Callable[[], Any]:
+        request = self._session_request(self._loaded_session())
+        return lambda: get_token_response(request).to_dict()
+
+    def _jwt_request(self) -> Request:
+        return Request(self.request_factory.get("/", HTTP_AUTHORIZATION=f"Bearer {self.access_token}"))
+
+    def drf_jwt_auth(self) -> Callable[[], Any]:
+        """A token seen before: served by the verified JWT cache, if it's on."""
+        request = self._jwt_request()
+        authenticate = DrfJwtAuth().authenticate
+        if authenticate(request) is None:
+            raise CommandError("DrfJwtAuth rejected the synthetic access token")
+        return lambda: authenticate(request)
+
+    def drf_jwt_auth_uncached(self) -> Callable[[], Any]:
+        """A token validated from scratch: parsing, claim checks and the RS256 signature."""
+        request = self._jwt_request()
+        authenticate = DrfJwtAuth().authenticate
+        cache = wristband_auth.jwt_result_cache
+
+        def validate() -> None:
+            cache.clear()
+            authenticate(request)
+
+        return validate
+
+    def context_processor(self) -> Callable[[], Any]:
+        session = self._loaded_session()
+
+        def context() -> None:
+            # A new request each time, since the snapshot is memoized per request; every field is read
+            request = HttpRequest()
+            request.session = session
+            for value in context_processors.wristband_auth(request).values():
+                value()
+
+        return context
+
+    def populate_user(self) -> Callable[[], Any]:
+        adapter = MyWristbandAdapter()
+        user = User.objects.create(username=USER_ID)
+        # The first login adds the group; repeat logins, the common case, find it in place
+        adapter.populate_user(user, self.callback_data)
+        return lambda: adapter.populate_user(user, self.callback_data)
+
+    def template(self, path: str, template_name: str) -> Callable[[], Any]:
+        session = self._loaded_session()
+        resolver_match = resolve(path)
+
+        def render() -> None:
+            request = self._session_request(session, path)
+            request.resolver_match = resolver_match
+            render_to_string(template_name, request=request)
+
+        return render
+
+
+def run_benchmark(function: Callable[[], Any], repeat: int) -> Tuple[float, float, int]:
+    """(best, median) microseconds per call over `repeat` rounds, and the calls per round."""
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    rounds = [elapsed / number * 1_000_000 for elapsed in timer.repeat(repeat, number)]
+    return min(rounds), statistics.median(rounds), number
+
+
+class Command(BaseCommand):
+    help = "Time session, token, JWT, user sync and template building blocks, and check them against a baseline."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--only", nargs="+", choices=BENCHMARKS, metavar="NAME", help=f"Benchmarks to run: {', '.join(BENCHMARKS)}"
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Timed rounds per benchmark (default: 5)")
+        parser.add_argument("--baseline", help="Fail if a benchmark regressed against this results file")
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=25.0,
+            help="Percent slower than the baseline that counts as a regression (default: 25)",
+        )
+        parser.add_argument("--save-baseline", help="Write the results to this file, for later --baseline runs")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        baseline = self._load_baseline(options["baseline"]) if options["baseline"] else None
+        if connection.vendor != "sqlite":
+            raise CommandError("authbench runs populate_user against an in-memory SQLite database")
+
+        # The test database for SQLite lives in memory, and is gone when the command ends
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = self._run(options["only"], max(options["repeat"], 1))
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report: Dict[str, Any] = {
+            "session_engine": settings.SESSION_ENGINE,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "repeat": options["repeat"],
+            "benchmarks": [asdict(result) for result in results],
+        }
+        regressions = []
+        if baseline is not None:
+            regressions = compare_to_baseline(results, baseline, options["max_regression"])
+            report["baseline"] = {
+                "path": options["baseline"],
+                "max_regression_percent": options["max_regression"],
+                "regressions": regressions,
+            }
+
+        if options["save_baseline"]:
+            Path(options["save_baseline"]).write_text(json.dumps(report, indent=2) + "\n")
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(f"SESSION_ENGINE = {settings.SESSION_ENGINE}")
+            self.stdout.write(f"{'benchmark':<24}{'best us':>11}{'median us':>11}{'baseline':>11}")
+            for result in results:
+                reference = baseline.get(result.name) if baseline else None
+                change = f"{(result.best_us / reference - 1) * 100:>+10.1f}%" if reference else f"{'-':>11}"
+                self.stdout.write(f"{result.name:<24}{result.best_us:>11.2f}{result.median_us:>11.2f}{change}")
+
+        if regressions:
+            names = ", ".join(f"{item['name']} ({item['change_percent']:+.1f}%)" for item in regressions)
+            raise CommandError(f"Slower than the baseline by more than {options['max_regression']}%: {names}")
+
+    def _run(self, only: Optional[List[str]], repeat: int) -> List[BenchmarkResult]:
+        benchmarks = AuthBenchmarks()
+        results = []
+        for name in BENCHMARKS:
+            if only and name not in only:
+                continue
+            best_us, median_us, calls = run_benchmark(benchmarks.setup(name), repeat)
+            results.append(BenchmarkResult(name, round(best_us, 3), round(median_us, 3), calls))
+        return results
+
+    @staticmethod
+    def _load_baseline(path: str) -> Dict[str, float]:
+        """Best time per benchmark in a results file written by --save-baseline (or --json)."""
+        try:
+            report = json.loads(Path(path).read_text())
+            return {item["name"]: float(item["best_us"]) for item in report["benchmarks"]}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            raise CommandError(f"Can't read the baseline {path}: {e}")
+
+
+def compare_to_baseline(
+    results: List[BenchmarkResult], baseline: Dict[str, float], max_regression: float
+) -> List[Dict[str, Any]]:
+    """Benchmarks more than `max_regression` percent slower than their baseline time."""
+    regressions = []
+    for result in results:
+        reference = baseline.get(result.name)
+        if not reference:
+            continue
+        change = (result.best_us / reference - 1) * 100
+        if change > max_regression:
+            regressions.append(
+                {
+                    "name": result.name,
+                    "baseline_us": reference,
+                    "best_us": result.best_us,
+                    "change_percent": round(change, 1),
+                }
+            )
+    return regressions
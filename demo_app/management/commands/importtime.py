@@ -0,0 +1,115 @@
+"""
+Report what a new worker spends importing modules before it can serve requests.
+
+Runs a fresh interpreter under `python -X importtime` that does what a uvicorn/gunicorn worker does at
+startup: set up Django, build the ASGI (or WSGI) application and load the URLconf. The modules already
+imported by manage.py itself don't skew the numbers.
+
+Usage:
+    python manage.py importtime [--limit 25] [--sort self] [--prefix demo_app] [--budget-ms 800] [--json]
+"""
+
+import json
+import re
+import subprocess  # nosec B404 - runs this interpreter on a fixed script
+import sys
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+# What a worker imports before serving its first request
+WORKER_STARTUP = """
+import os
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", {settings_module!r})
+from django.core.{interface} import get_{interface}_application
+get_{interface}_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+@dataclass
+class ModuleImport:
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def measure_worker_imports(interface: str = "asgi") -> List[ModuleImport]:
+    """Import times of a fresh worker process, in the order the modules finished importing."""
+    code = WORKER_STARTUP.format(settings_module=settings.SETTINGS_MODULE, interface=interface)
+    result = subprocess.run(  # nosec B603
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.BASE_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise CommandError(f"Worker startup failed:\n{result.stderr[-2000:]}")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            imports.append(ModuleImport(module, int(self_us) / 1000, int(cumulative_us) / 1000, len(indent) // 2))
+    return imports
+
+
+class Command(BaseCommand):
+    help = "Report per-module import time of a new worker process, slowest first."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--limit", type=int, default=25, help="Number of modules to list (default: 25)")
+        parser.add_argument(
+            "--sort",
+            choices=("cumulative", "self"),
+            default="cumulative",
+            help="Rank by time including submodules (cumulative) or by the module's own code (self)",
+        )
+        parser.add_argument("--prefix", default="", help="Only list modules under this package, e.g. demo_app")
+        parser.add_argument("--wsgi", action="store_true", help="Start a WSGI worker instead of an ASGI one")
+        parser.add_argument("--runs", type=int, default=3, help="Startups to measure; the fastest is reported")
+        parser.add_argument("--budget-ms", type=float, help="Exit with an error if total import time exceeds this")
+        parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        interface = "wsgi" if options["wsgi"] else "asgi"
+        runs = [measure_worker_imports(interface) for _ in range(max(options["runs"], 1))]
+        imports = min(runs, key=total_ms)
+        total = total_ms(imports)
+
+        key = "cumulative_ms" if options["sort"] == "cumulative" else "self_ms"
+        listed = [item for item in imports if item.module.startswith(options["prefix"])]
+        listed.sort(key=lambda item: getattr(item, key), reverse=True)
+        listed = listed[: options["limit"]]
+
+        if options["json"]:
+            report: Dict[str, Any] = {
+                "interface": interface,
+                "total_ms": round(total, 1),
+                "modules_imported": len(imports),
+                "budget_ms": options["budget_ms"],
+                "modules": [asdict(item) for item in listed],
+            }
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(f"{interface.upper()} worker startup: {total:.1f}ms importing {len(imports)} modules")
+            self.stdout.write(f"{'cumulative ms':>14}{'self ms':>10}  module")
+            for item in listed:
+                self.stdout.write(f"{item.cumulative_ms:>14.1f}{item.self_ms:>10.1f}  {item.module}")
+
+        budget = options["budget_ms"]
+        if budget is not None and total > budget:
+            raise CommandError(f"Import time {total:.1f}ms exceeds the budget of {budget:.1f}ms")
+
+
+def total_ms(imports: List[ModuleImport]) -> float:
+    """Total import time: the cumulative times of the top-level imports."""
+    return sum(item.cumulative_ms for item in imports if item.depth == 0)
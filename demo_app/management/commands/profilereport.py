@@ -0,0 +1,135 @@
+"""
+Aggregate the request profiles written by ProfilingMiddleware into per-route hot-function reports.
+
+For each route (URL name), lists the functions that take the most time per profiled request, by their own
+code (self) or including what they call (cumulative), with their share of the route's request time.
+
+Usage:
+    python manage.py profilereport [--dir profiles] [--route demo_app:callback] [--auth jwt] [--limit 15]
+                                   [--sort cumulative] [--since-minutes 60] [--include-overlapped] [--json]
+
+Profiles of async requests that overlapped other requests (see demo_app/profiling.py) are left out unless
+--include-overlapped is given: they include the other requests' work.
+"""
+
+import json
+import statistics
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, DefaultDict, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from ...profiling import load_profiles, merge_function_times
+
+
+class Command(BaseCommand):
+    help = "Report the hottest functions per route from the profiles of sampled requests."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--dir", help="Profile directory (default: REQUEST_PROFILING_DIR)")
+        parser.add_argument("--route", help="Only report this URL name, e.g. demo_app:callback")
+        parser.add_argument("--auth", choices=("jwt", "session", "none"), help="Only profiles of this auth strategy")
+        parser.add_argument("--limit", type=int, default=15, help="Functions to list per route (default: 15)")
+        parser.add_argument(
+            "--sort",
+            choices=("self", "cumulative"),
+            default="self",
+            help="Rank by time in the function's own code (self) or including its callees (cumulative)",
+        )
+        parser.add_argument("--since-minutes", type=float, help="Only profiles taken in the last N minutes")
+        parser.add_argument(
+            "--include-overlapped",
+            action="store_true",
+            help="Include async profiles taken while other requests were in progress",
+        )
+        parser.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        directory = Path(
+            options["dir"] or getattr(settings, "REQUEST_PROFILING_DIR", Path(settings.BASE_DIR) / "profiles")
+        )
+        if not directory.is_dir():
+            raise CommandError(f"No profile directory at {directory}")
+
+        profiles = load_profiles(directory)
+        if options["route"]:
+            profiles = [profile for profile in profiles if profile["route"] == options["route"]]
+        if options["auth"]:
+            profiles = [profile for profile in profiles if profile["auth"] == options["auth"]]
+        if not options["include_overlapped"]:
+            profiles = [profile for profile in profiles if not profile.get("overlapped", False)]
+        if options["since_minutes"] is not None:
+            cutoff = time.time() - options["since_minutes"] * 60
+            profiles = [profile for profile in profiles if profile["timestamp"] >= cutoff]
+        if not profiles:
+            raise CommandError(f"No matching profiles in {directory}")
+
+        by_route: DefaultDict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for profile in profiles:
+            by_route[profile["route"]].append(profile)
+
+        # Routes where profiled requests spent the most time in total come first
+        reports = [
+            route_report(route, route_profiles, options["sort"], options["limit"])
+            for route, route_profiles in by_route.items()
+        ]
+        reports.sort(key=lambda report: report["total_ms"], reverse=True)
+
+        if options["json"]:
+            self.stdout.write(json.dumps({"directory": str(directory), "routes": reports}, indent=2))
+            return
+
+        for report in reports:
+            auth = ", ".join(f"{strategy} {count}" for strategy, count in sorted(report["auth"].items()))
+            self.stdout.write(
+                f"{report['route']}: {report['profiles']} profiles ({auth}), "
+                f"p50 {report['p50_ms']:.1f}ms, max {report['max_ms']:.1f}ms"
+            )
+            self.stdout.write(f"{'self ms/req':>13}{'cum ms/req':>12}{'% of req':>10}  function")
+            for function in report["functions"]:
+                share = function["self_percent"] if options["sort"] == "self" else function["cumulative_percent"]
+                self.stdout.write(
+                    f"{function['self_ms']:>13.3f}{function['cumulative_ms']:>12.3f}{share:>9.1f}%"
+                    f"  {function['function']}"
+                )
+            self.stdout.write("")
+
+
+def route_report(route: str, profiles: List[Dict[str, Any]], sort: str, limit: int) -> Dict[str, Any]:
+    """Durations and the top functions, in ms per profiled request, of one route's profiles."""
+    durations = [profile["duration_ms"] for profile in profiles]
+    auth: DefaultDict[str, int] = defaultdict(int)
+    for profile in profiles:
+        auth[profile["auth"]] += 1
+
+    count = len(profiles)
+    total_ms = sum(durations)
+    index = 0 if sort == "self" else 1
+    times = sorted(merge_function_times(profiles).items(), key=lambda item: item[1][index], reverse=True)
+
+    functions = []
+    for label, (self_seconds, cumulative_seconds) in times[:limit]:
+        self_ms = self_seconds * 1000 / count
+        cumulative_ms = cumulative_seconds * 1000 / count
+        functions.append(
+            {
+                "function": label,
+                "self_ms": round(self_ms, 3),
+                "cumulative_ms": round(cumulative_ms, 3),
+                "self_percent": round(self_ms * count / total_ms * 100, 1) if total_ms else 0.0,
+                "cumulative_percent": round(cumulative_ms * count / total_ms * 100, 1) if total_ms else 0.0,
+            }
+        )
+
+    return {
+        "route": route,
+        "profiles": count,
+        "auth": dict(auth),
+        "total_ms": round(total_ms, 3),
+        "p50_ms": round(statistics.median(durations), 3),
+        "max_ms": round(max(durations), 3),
+        "functions": functions,
+    }
@@ -0,0 +1,241 @@
+"""
+__WRISTBAND__: Request and auth-phase latency metrics, exposed in Prometheus text format at /metrics.
+
+Two histograms are recorded in memory by each worker process:
+
+    - demo_request_duration_seconds{view, method, status}: every request, labeled by URL name
+      (e.g. "demo_app:callback"), recorded by MetricsMiddleware
+    - demo_auth_phase_duration_seconds{phase}: the auth work inside those requests:
+        session_decrypt  decrypting the session cookie
+        session_load     looking up a server-side session (demo_app/sessions/backends/server_side.py)
+        jwt_verify       validating a bearer token in require_jwt / JwtRequiredMixin / DrfJwtAuth
+        jwks_fetch       fetching Wristband's signing keys (demo_app/jwks_cache.py)
+        token_exchange   exchanging the authorization code during the login callback
+        userinfo         fetching userinfo during the login callback
+        token_refresh    refreshing an expired access token during session auth
+        token_revoke     revoking the refresh token during logout
+        user_sync        the adapter's database work when a user logs in
+        user_sync_wait   request.user waiting for a deferred user sync (demo_app/user_sync.py)
+
+Recording costs a bisect and a short critical section per observation. Each worker keeps its own numbers,
+so scrape every worker (or run one per container) to see the whole picture.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.http import HttpRequest, HttpResponse
+from wristband.django_auth import JWTAuthConfig
+
+# Upper bounds in seconds; fine-grained at the low end for sub-millisecond auth phases
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_bound(bound: float) -> str:
+    return repr(float(bound))
+
+
+class Histogram:
+    """Thread-safe Prometheus-style histogram keyed by a tuple of label values."""
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Sequence[str], buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf)..., sum]
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self) -> Dict[Tuple[str, ...], List[float]]:
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def render(self) -> List[str]:
+        """Exposition-format lines for this histogram."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        bounds = [*map(_format_bound, self.buckets), "+Inf"]
+        for label_values, series in sorted(self.snapshot().items()):
+            labels = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, label_values))
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0.0
+            for bound, count in zip(bounds, series[:-1]):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative:.0f}')
+            lines.append(f"{self.name}_sum{{{labels}}} {series[-1]!r}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative:.0f}")
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    "demo_request_duration_seconds", "Time to serve a request, by URL name.", ("view", "method", "status")
+)
+AUTH_PHASE_DURATION = Histogram("demo_auth_phase_duration_seconds", "Time spent in auth work, by phase.", ("phase",))
+
+# Extra lines for /metrics, e.g. cache and connection counters: name -> callable returning {metric: value}
+_stats_collectors: Dict[str, Callable[[], Dict[str, int]]] = {}
+
+
+def register_stats(prefix: str, collect: Callable[[], Dict[str, int]]) -> None:
+    """Expose a component's stats() counters on /metrics as `<prefix>_<counter>` gauges."""
+    _stats_collectors[prefix] = collect
+
+
+class timed_phase:
+    """Context manager recording the duration of the enclosed block as an auth phase."""
+
+    __slots__ = ("phase", "start")
+
+    def __init__(self, phase: str) -> None:
+        self.phase = phase
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        AUTH_PHASE_DURATION.observe(time.perf_counter() - self.start, self.phase)
+
+
+def time_phase(phase: str, func: F) -> F:
+    """Wrap a sync or async callable so each call is recorded as an auth phase."""
+    if iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            with timed_phase(phase):
+                return await func(*args, **kwargs)
+
+        return cast(F, async_wrapper)
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with timed_phase(phase):
+            return func(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def render_metrics() -> str:
+    """All metrics of this process in Prometheus text format."""
+    lines = [*REQUEST_DURATION.render(), *AUTH_PHASE_DURATION.render()]
+    for prefix, collect in sorted(_stats_collectors.items()):
+        for counter, value in collect().items():
+            name = f"{prefix}_{counter}"
+            lines.extend((f"# TYPE {name} gauge", f"{name} {value}"))
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Records every request's duration in REQUEST_DURATION, labeled by the resolved URL name.
+
+    Place it first in MIDDLEWARE so the timing covers the rest of the stack. Requests that didn't resolve to a
+    named URL (404s, static files) share the "<unmatched>" label.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        start = time.perf_counter()
+        response = await cast(Callable[[HttpRequest], Awaitable[HttpResponse]], self.get_response)(request)
+        self._observe(request, response, time.perf_counter() - start)
+        return response
+
+    @staticmethod
+    def _observe(request: HttpRequest, response: HttpResponse, seconds: float) -> None:
+        match = request.resolver_match
+        view = match.view_name if match is not None and match.url_name else "<unmatched>"
+        REQUEST_DURATION.observe(seconds, view, request.method or "", str(response.status_code))
+
+
+class _TimedJwtValidator:
+    """Records each validate() call of the wrapped validator as the jwt_verify phase."""
+
+    def __init__(self, validator: Any) -> None:
+        self._validator = validator
+
+    def extract_bearer_token(self, *args: Any, **kwargs: Any) -> Any:
+        return self._validator.extract_bearer_token(*args, **kwargs)
+
+    def validate(self, token: str) -> Any:
+        with timed_phase("jwt_verify"):
+            return self._validator.validate(token)
+
+
+class MetricsMixin:
+    """
+    WristbandAuth mixin that records the auth phases it runs: calls to Wristband and JWT validation.
+
+    The API client methods are wrapped on this instance's clients only. Its components' stats() counters are
+    registered for /metrics as well.
+    """
+
+    _API_PHASES = {
+        "get_tokens": "token_exchange",
+        "get_userinfo": "userinfo",
+        "refresh_token": "token_refresh",
+        "revoke_refresh_token": "token_revoke",
+    }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        for client in (getattr(self, "_wristband_api", None), getattr(self, "_async_wristband_api", None)):
+            for method_name, phase in self._API_PHASES.items():
+                method: Optional[Callable[..., Any]] = getattr(client, method_name, None)
+                if method is not None:
+                    setattr(client, method_name, time_phase(phase, method))
+
+        for prefix, attribute in (
+            ("demo_jwt_cache", "jwt_result_cache"),
+            ("demo_jwks", "jwks_client"),
+            ("demo_wristband_connections", "connection_stats"),
+            ("demo_token_refresh", "token_refresh_coordinator"),
+            ("demo_token_revocation", "revocation_queue"),
+        ):
+            component = getattr(self, attribute, None)
+            if component is not None:
+                register_stats(prefix, component.stats)
+
+    def _create_jwt_validator(self, jwt_config: Optional[JWTAuthConfig]) -> Any:
+        return _TimedJwtValidator(super()._create_jwt_validator(jwt_config))  # type: ignore[misc]
@@ -0,0 +1,128 @@
+"""
+__WRISTBAND__: Route-scoped middleware profiles: a shorter middleware chain for stateless API routes.
+
+Every request runs the whole MIDDLEWARE chain, including the JWT API routes, which authenticate with a bearer
+token alone: SessionMiddleware, with the session cookie the browser sends along, ready to be decrypted by
+anything that reads the session; CSRF, which @csrf_exempt then skips; AuthenticationMiddleware, messages and
+clickjacking. RouteMiddlewareProfileMiddleware sends requests whose path starts with one of a profile's
+prefixes through that profile's own, minimal chain instead, and the rest of the stack as usual:
+
+    MIDDLEWARE_PROFILES = {
+        "jwt_api": {
+            "path_prefixes": ["/api/classic/jwt-", "/api/drf/jwt-", "/api/drf/batch/"],
+            "middleware": ["django.middleware.common.CommonMiddleware"],
+        },
+    }
+
+Place it after the middleware that every request should run (metrics, security, static files, admission
+control, profiling) and before SessionMiddleware. The middleware it skips are simply absent on profiled routes:
+request.session isn't set, so the session cookie is never decrypted, and request.user is only what the view's
+auth sets (a ClaimsUser for a valid token, see demo_app/claims_user.py), never a database lookup. Only list
+views here that need neither. benchmarks/bench_middleware_profiles.py measures the difference.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.core.handlers.base import BaseHandler
+from django.core.handlers.exception import convert_exception_to_response
+from django.http import HttpRequest, HttpResponse
+from django.utils.module_loading import import_string
+
+
+class ProfileHandler(BaseHandler):
+    """
+    The end of a request's trip through Django (URL resolution, view middleware, the view) behind its own chain.
+
+    load_profile() does what BaseHandler.load_middleware() does for settings.MIDDLEWARE, for a profile's list.
+    """
+
+    def load_profile(self, middleware_paths: Sequence[str], is_async: bool) -> Callable[[HttpRequest], Any]:
+        self._view_middleware: List[Callable[..., Any]] = []
+        self._template_response_middleware: List[Callable[..., Any]] = []
+        self._exception_middleware: List[Callable[..., Any]] = []
+
+        # Private in BaseHandler, so missing from django-stubs
+        get_response = self._get_response_async if is_async else self._get_response  # type: ignore[attr-defined]
+        handler = convert_exception_to_response(get_response)
+        handler_is_async = is_async
+        for middleware_path in reversed(middleware_paths):
+            middleware = import_string(middleware_path)
+            middleware_is_async = getattr(middleware, "async_capable", False) and (
+                handler_is_async or not getattr(middleware, "sync_capable", True)
+            )
+            adapted_handler = self.adapt_method_mode(
+                middleware_is_async, handler, handler_is_async, name=f"middleware {middleware_path}"
+            )
+            try:
+                mw_instance = middleware(adapted_handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(mw_instance, "process_view"):
+                self._view_middleware.insert(0, self.adapt_method_mode(is_async, mw_instance.process_view))
+            if hasattr(mw_instance, "process_template_response"):
+                self._template_response_middleware.append(
+                    self.adapt_method_mode(is_async, mw_instance.process_template_response)
+                )
+            if hasattr(mw_instance, "process_exception"):
+                self._exception_middleware.append(self.adapt_method_mode(False, mw_instance.process_exception))
+
+            handler = convert_exception_to_response(mw_instance)
+            handler_is_async = middleware_is_async
+
+        self._middleware_chain = self.adapt_method_mode(is_async, handler, handler_is_async)
+        return self._middleware_chain
+
+
+class RouteMiddlewareProfileMiddleware:
+    """
+    Runs requests to the path prefixes in MIDDLEWARE_PROFILES through the profile's middleware chain.
+
+    Prefixes are matched against the path, longest first, without resolving the URL.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        profiles: Mapping[str, Mapping[str, Any]] = getattr(settings, "MIDDLEWARE_PROFILES", {})
+        if not profiles:
+            raise MiddlewareNotUsed("No middleware profiles configured")
+
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        chains: Dict[str, Tuple[str, Callable[[HttpRequest], Any]]] = {}
+        for name, config in profiles.items():
+            chain = ProfileHandler().load_profile(config.get("middleware", []), self.is_async)
+            for prefix in config["path_prefixes"]:
+                if not prefix.startswith("/"):
+                    raise ImproperlyConfigured(f'MIDDLEWARE_PROFILES["{name}"] path prefixes must start with "/"')
+                if prefix in chains:
+                    raise ImproperlyConfigured(f"Path prefix {prefix} is in both {chains[prefix][0]} and {name}")
+                chains[prefix] = (name, chain)
+        self.routes = sorted(
+            ((prefix, chain) for prefix, (_, chain) in chains.items()), key=lambda route: len(route[0]), reverse=True
+        )
+
+    def _chain(self, request: HttpRequest) -> Optional[Callable[[HttpRequest], Any]]:
+        path = request.path_info
+        for prefix, chain in self.routes:
+            if path.startswith(prefix):
+                return chain
+        return None
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        chain = self._chain(request) or self.get_response
+        return chain(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        chain = cast(Callable[[HttpRequest], Awaitable[HttpResponse]], self._chain(request) or self.get_response)
+        return await chain(request)
@@ -0,0 +1,157 @@
+"""
+__WRISTBAND__: Production rendering for the HTML pages.
+
+Enabled by the FAST_PAGE_RENDERING setting (on unless DEBUG). Together with the cached template loader and
+the {% cache %} fragments in the templates (stored in the "page_fragments" cache), a page request only
+renders the small per-user block that comes from the wristband_auth context processor. On top of that:
+
+    - ConditionalPageMixin: weak ETag headers, and 304 responses to matching conditional GETs. The ETag covers
+      the templates' version and the session fields the templates show, so it is computed without rendering
+      anything. Pages that are the same for every visitor also get Last-Modified; per-user pages don't, since
+      a template date can't tell one session's page (and access token) from another's.
+    - PrecompressedPage: a page that is the same for every visitor (the anonymous HomePage), rendered once
+      per process and kept gzip- and, with the brotli extra, brotli-compressed in memory.
+
+Templates only change on deploy, so both the version and the precompressed copy live for the process.
+"""
+
+import gzip
+import hashlib
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .context_processors import get_session_snapshot
+
+try:
+    import brotli
+
+    HAS_BROTLI = True
+except ImportError:  # pragma: no cover - depends on the environment
+    HAS_BROTLI = False
+
+
+def fast_page_rendering() -> bool:
+    return bool(getattr(settings, "FAST_PAGE_RENDERING", False))
+
+
+@lru_cache(maxsize=None)
+def template_version() -> Tuple[str, int]:
+    """Digest and newest modification time (epoch seconds) of the project's templates, read once per process."""
+    digest = hashlib.sha256()
+    newest = 0
+    for directory in settings.TEMPLATES[0].get("DIRS", []):
+        for path in sorted(Path(directory).rglob("*.html")):
+            stat = path.stat()
+            digest.update(f"{path.relative_to(directory)}:{stat.st_size}:{stat.st_mtime_ns}\0".encode("utf-8"))
+            newest = max(newest, int(stat.st_mtime))
+    return digest.hexdigest()[:16], newest
+
+
+def page_etag(request: HttpRequest, page: str) -> str:
+    """Weak ETag for a page as the current visitor sees it: same templates and same session fields, same page."""
+    digest = hashlib.sha256(f"{template_version()[0]}:{page}".encode("utf-8"))
+    for field, value in sorted(get_session_snapshot(request).items()):
+        digest.update(f"\0{field}\0{value}".encode("utf-8"))
+    return f'W/"{digest.hexdigest()[:32]}"'
+
+
+def accepted_encodings(request: HttpRequest) -> FrozenSet[str]:
+    """Content codings the client accepts, ignoring ones it explicitly refuses with q=0."""
+    encodings = set()
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        coding, _, params = item.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        if coding.strip():
+            encodings.add(coding.strip().lower())
+    return frozenset(encodings)
+
+
+class PrecompressedPage:
+    """
+    In-memory copy of a page that is identical for every visitor, in identity, gzip and brotli encodings.
+
+    The page is rendered by the first request that needs it; later requests get the variant that matches
+    their Accept-Encoding without rendering or compressing anything.
+    """
+
+    def __init__(self) -> None:
+        self._variants: Optional[Dict[str, bytes]] = None
+        self._headers: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def response(self, request: HttpRequest, render: Callable[[], HttpResponse]) -> HttpResponse:
+        variants = self._variants
+        if variants is None:
+            with self._lock:
+                variants = self._variants
+                if variants is None:
+                    variants = self._variants = self._build(render())
+
+        accepted = accepted_encodings(request)
+        encoding = next((coding for coding in ("br", "gzip") if coding in variants and coding in accepted), "")
+        response = HttpResponse(variants[encoding], headers=self._headers)
+        if encoding:
+            response["Content-Encoding"] = encoding
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._variants = None
+
+    def _build(self, response: HttpResponse) -> Dict[str, bytes]:
+        if hasattr(response, "render"):
+            response.render()
+        self._headers = {"Content-Type": response["Content-Type"]}
+        body = response.content
+        variants = {"": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+        if HAS_BROTLI:
+            variants["br"] = brotli.compress(body, mode=brotli.MODE_TEXT)
+        return variants
+
+
+class ConditionalPageMixin:
+    """
+    TemplateView mixin for FAST_PAGE_RENDERING: ETag headers and 304s for unchanged pages.
+
+    Pages are marked `private, no-cache`, so browsers revalidate on every visit and shared caches don't keep
+    them. Subclasses render through render_page(), which defaults to the TemplateView's get(), and override
+    last_modified() for pages that don't depend on the session.
+    """
+
+    template_name: str
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        if not fast_page_rendering():
+            return self.render_page(request, *args, **kwargs)
+
+        etag = page_etag(request, self.template_name)
+        last_modified = self.last_modified(request)
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = self.render_page(request, *args, **kwargs)
+
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def last_modified(self, request: HttpRequest) -> Optional[int]:
+        """
+        Last-Modified (epoch seconds) of the page as this visitor sees it, or None to send only the ETag.
+
+        None by default: If-Modified-Since alone would get a 304 for a page rendered for another session.
+        """
+        return None
+
+    def render_page(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        return super().get(request, *args, **kwargs)  # type: ignore[misc, no-any-return]
@@ -0,0 +1,365 @@
+"""
+__WRISTBAND__: Sampled request profiling: call profiles of real requests, ready for flamegraphs.
+
+ProfilingMiddleware runs a request under cProfile when
+
+    - a random draw falls under REQUEST_PROFILING_SAMPLE_RATE (e.g. 0.01 profiles 1% of requests), or
+    - the request sends REQUEST_PROFILING_TOKEN in the REQUEST_PROFILING_HEADER header (X-Demo-Profile), so an
+      admin holding the token can profile a single request on demand
+
+With neither configured, Django drops the middleware at startup and it costs nothing.
+
+Each profile is written to REQUEST_PROFILING_DIR, in one of two formats (REQUEST_PROFILING_FORMAT):
+
+    <name>.collapsed  "frame;frame;frame <microseconds>" lines, the input of flamegraph.pl, inferno or speedscope
+    <name>.prof       a pstats file, for python -m pstats or snakeviz
+
+next to a <name>.json with its tags: route (URL name), auth (jwt, session or none), method, status and
+duration_ms. Only the newest REQUEST_PROFILING_MAX_FILES profiles are kept. `python manage.py profilereport`
+aggregates them into per-route reports of the hottest functions.
+
+Profiles are saved by a background thread, after the response has been returned. A process profiles one
+request at a time, until its profile is saved; a sampled request that arrives meanwhile is served unprofiled.
+
+cProfile only sees the thread it runs in, which is the thread that runs the middleware: the event loop under
+ASGI, a worker thread under WSGI. Views of the other kind (sync views under ASGI, async views under WSGI) run in
+another thread, so their own code shows up as time spent waiting for them; profile them under the server they
+run natively in (make run for async views, make run-wsgi for sync ones) to see inside them.
+
+Under ASGI the profiler also sees everything else the event loop runs while the request awaits, including the
+code of other requests being served concurrently. The middleware counts the requests in flight, and tags a
+profile overlapped: true when another request was in progress at any point during it. profilereport leaves
+overlapped profiles out unless asked for them (--include-overlapped), so one route isn't blamed for another's
+work. WSGI profiles never overlap: each request has its thread to itself.
+"""
+
+import cProfile
+import hmac
+import itertools
+import json
+import logging
+import os
+import pstats
+import random
+import sys
+import sysconfig
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Awaitable, Callable, DefaultDict, Dict, List, Optional, Set, Tuple, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, MiddlewareNotUsed
+from django.http import HttpRequest, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# pstats key of a function: (filename, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+PROFILE_SUFFIXES = {"collapsed": ".collapsed", "pstats": ".prof"}
+
+# Path prefixes left out of frame labels, so the same function has the same label on every machine
+_PATH_PREFIXES = sorted(
+    {
+        str(Path(settings.BASE_DIR)) + os.sep,
+        sysconfig.get_paths()["stdlib"] + os.sep,
+        *(path + os.sep for path in sys.path if path.endswith("-packages")),
+    },
+    key=len,
+    reverse=True,
+)
+
+# collapsed_stacks() stops splitting time between callers below this share of the profile (too thin to see)
+_MIN_STACK_SHARE = 0.0001
+_MAX_STACK_DEPTH = 200
+
+
+def frame_label(function: FunctionKey) -> str:
+    """Readable name of a profiled function, e.g. "demo_app/views/auth_views.py:callback_endpoint"."""
+    filename, _, name = function
+    if filename == "~":  # Built-ins, e.g. "<method 'read' of '_io.BufferedReader' objects>"
+        return name
+    for prefix in _PATH_PREFIXES:
+        if filename.startswith(prefix):
+            filename = filename[len(prefix) :]
+            break
+    return f"{filename}:{name}"
+
+
+def collapsed_stacks(stats: Dict[FunctionKey, Any]) -> Dict[str, float]:
+    """
+    Rebuild call stacks from a pstats call graph: {"frame;frame;frame": self seconds}.
+
+    cProfile records time per caller/callee pair, not per stack, so (as gprof does) each function's own time is
+    split between its callers in proportion to the time each of them spent calling it, and so on up the call
+    graph. Every function's own time ends up in exactly one stack each, so the stacks add up to the profile.
+    """
+    stacks: DefaultDict[str, float] = defaultdict(float)
+    min_seconds = sum(function_stats[2] for function_stats in stats.values()) * _MIN_STACK_SHARE
+    labels = {function: frame_label(function) for function in stats}
+
+    def climb(function: FunctionKey, frames: List[str], on_path: Set[FunctionKey], seconds: float) -> None:
+        _, _, _, cumulative_seconds, callers = stats[function]
+        # Recursion is folded into the outermost call
+        calls = [(caller, caller_stats[3]) for caller, caller_stats in callers.items() if caller not in on_path]
+        called_seconds = sum(caller_seconds for _, caller_seconds in calls)
+        if called_seconds <= 0 or seconds < min_seconds or len(frames) >= _MAX_STACK_DEPTH:
+            stacks[";".join(reversed(frames))] += seconds
+            return
+
+        # Time not spent under any caller was entered from outside the profile, so its stack starts here, as
+        # do shares too thin to show on a flamegraph
+        total_seconds = max(cumulative_seconds, called_seconds)
+        starts_here = seconds * (total_seconds - called_seconds) / total_seconds
+        for caller, caller_seconds in calls:
+            share = seconds * caller_seconds / total_seconds
+            if share < min_seconds:
+                starts_here += share
+                continue
+            on_path.add(caller)
+            frames.append(labels[caller])
+            climb(caller, frames, on_path, share)
+            frames.pop()
+            on_path.discard(caller)
+        if starts_here > 0:
+            stacks[";".join(reversed(frames))] += starts_here
+
+    for function, (_, _, self_seconds, _, _) in stats.items():
+        if self_seconds > 0:
+            climb(function, [labels[function]], {function}, self_seconds)
+    return dict(stacks)
+
+
+def auth_strategy(request: HttpRequest) -> str:
+    """How the request authenticated: "jwt" (a bearer token was validated), "session" (it sent a cookie) or "none"."""
+    if getattr(request, "auth", None) is not None:
+        return "jwt"
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        return "session"
+    return "none"
+
+
+class ProfileWriter:
+    """Writes profiles and their tags to a directory, keeping only the newest `max_files`."""
+
+    def __init__(self, directory: Path, output_format: str, max_files: int) -> None:
+        if output_format not in PROFILE_SUFFIXES:
+            raise ImproperlyConfigured(f"REQUEST_PROFILING_FORMAT must be one of {sorted(PROFILE_SUFFIXES)}")
+        self.directory = directory
+        self.output_format = output_format
+        self.max_files = max_files
+        self._sequence = itertools.count()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def write(self, profiler: cProfile.Profile, tags: Dict[str, Any]) -> Path:
+        """Save one profile; returns the path of its tags file."""
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(self._sequence)}"
+        profile_path = self.directory / (name + PROFILE_SUFFIXES[self.output_format])
+
+        if self.output_format == "pstats":
+            profiler.dump_stats(profile_path)
+        else:
+            stats = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+            lines = (f"{stack} {round(seconds * 1_000_000)}" for stack, seconds in collapsed_stacks(stats).items())
+            profile_path.write_text("\n".join(line for line in lines if not line.endswith(" 0")) + "\n")
+
+        # The tags file goes last: profilereport only reads profiles whose tags exist
+        tags_path = self.directory / (name + ".json")
+        tags_path.write_text(json.dumps({**tags, "profile": profile_path.name, "format": self.output_format}))
+        self._rotate()
+        return tags_path
+
+    def _rotate(self) -> None:
+        tag_files = sorted(self.directory.glob("*.json"))
+        for tags_path in tag_files[: max(len(tag_files) - self.max_files, 0)]:
+            for suffix in (".json", *PROFILE_SUFFIXES.values()):
+                # Other workers rotate the same directory
+                tags_path.with_suffix(suffix).unlink(missing_ok=True)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles sampled requests (see REQUEST_PROFILING_* settings) and writes the profiles for profilereport.
+
+    Place it after AdmissionControlMiddleware, so shed requests aren't profiled, and before SessionMiddleware,
+    so loading the session is part of the profile.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    # One profile per process at a time, from the start of the request until the profile is saved: cProfile
+    # can't run two at once in a thread, concurrent profiles would skew each other, and the writer can't fall
+    # behind
+    _lock = threading.Lock()
+    # Turning a profile into collapsed stacks takes a while, so profiles are saved off the request path
+    _writer_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="request-profiler")
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        self.sample_rate = float(getattr(settings, "REQUEST_PROFILING_SAMPLE_RATE", 0))
+        self.token: str = getattr(settings, "REQUEST_PROFILING_TOKEN", "")
+        if self.sample_rate <= 0 and not self.token:
+            raise MiddlewareNotUsed("Request profiling is off")
+
+        # Async requests in progress, and whether one ran alongside the current async profile. Only touched
+        # from the event loop thread.
+        self._in_flight = 0
+        self._profiling = False
+        self._overlapped = False
+
+        self.header: str = getattr(settings, "REQUEST_PROFILING_HEADER", "X-Demo-Profile")
+        self.writer = ProfileWriter(
+            Path(getattr(settings, "REQUEST_PROFILING_DIR", Path(settings.BASE_DIR) / "profiles")),
+            getattr(settings, "REQUEST_PROFILING_FORMAT", "collapsed"),
+            int(getattr(settings, "REQUEST_PROFILING_MAX_FILES", 500)),
+        )
+
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def _should_profile(self, request: HttpRequest) -> bool:
+        if self.token:
+            requested = request.headers.get(self.header)
+            if requested is not None and hmac.compare_digest(requested.encode(), self.token.encode()):
+                return True
+        return random.random() < self.sample_rate  # nosec B311 - sampling, not security
+
+    def _tags(self, request: HttpRequest, response: HttpResponse, seconds: float, overlapped: bool) -> Dict[str, Any]:
+        match = request.resolver_match
+        return {
+            "route": match.view_name if match is not None and match.url_name else "<unmatched>",
+            "auth": auth_strategy(request),
+            "method": request.method,
+            "status": response.status_code,
+            "duration_ms": round(seconds * 1000, 3),
+            "overlapped": overlapped,
+            "timestamp": time.time(),
+        }
+
+    def _save(self, profiler: cProfile.Profile, tags: Dict[str, Any]) -> None:
+        try:
+            self.writer.write(profiler, tags)
+        except OSError:
+            logger.exception("Could not save the profile of a %s request", tags["route"])
+        finally:
+            self._lock.release()
+
+    def _start_profile(self, request: HttpRequest) -> Optional[cProfile.Profile]:
+        """A profiler to run the request under, or None if it isn't sampled or another profile is in progress."""
+        if not self._should_profile(request) or not self._lock.acquire(blocking=False):
+            return None
+        return cProfile.Profile()
+
+    def _finish_profile(
+        self,
+        profiler: cProfile.Profile,
+        request: HttpRequest,
+        response: Optional[HttpResponse],
+        seconds: float,
+        overlapped: bool = False,
+    ) -> None:
+        if response is None:  # The request raised: nothing worth keeping
+            self._lock.release()
+            return
+        # Hand the profile to the writer thread, which releases the lock once it's saved
+        self._writer_thread.submit(self._save, profiler, self._tags(request, response, seconds, overlapped))
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        profiler = self._start_profile(request)
+        if profiler is None:
+            return self.get_response(request)
+
+        response = None
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            self._finish_profile(profiler, request, response, time.perf_counter() - start)
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        self._in_flight += 1
+        if self._profiling:
+            self._overlapped = True
+        try:
+            return await self._aprofile(request)
+        finally:
+            self._in_flight -= 1
+
+    async def _aprofile(self, request: HttpRequest) -> HttpResponse:
+        get_response = cast(Callable[[HttpRequest], Awaitable[HttpResponse]], self.get_response)
+        profiler = self._start_profile(request)
+        if profiler is None:
+            return await get_response(request)
+
+        # Requests already in progress resume on the event loop while this one awaits
+        self._profiling, self._overlapped = True, self._in_flight > 1
+        response = None
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = await get_response(request)
+        finally:
+            profiler.disable()
+            self._profiling = False
+            self._finish_profile(profiler, request, response, time.perf_counter() - start, self._overlapped)
+        return response
+
+
+def load_profiles(directory: Path) -> List[Dict[str, Any]]:
+    """Tags of the profiles in a directory, oldest first, each with the path of its profile under "path"."""
+    profiles = []
+    for tags_path in sorted(directory.glob("*.json")):
+        try:
+            tags = json.loads(tags_path.read_text())
+        except (OSError, ValueError):
+            continue  # Rotated away or half-written by another worker
+        tags["path"] = directory / tags["profile"]
+        if tags["path"].exists():
+            profiles.append(tags)
+    return profiles
+
+
+def function_times(profile: Dict[str, Any]) -> Dict[str, Tuple[float, float]]:
+    """{frame label: (self seconds, cumulative seconds)} of one profile, in either format."""
+    times: Dict[str, Tuple[float, float]] = {}
+    if profile["format"] == "pstats":
+        stats = pstats.Stats(str(profile["path"])).stats  # type: ignore[attr-defined]
+        for function, (_, _, self_seconds, cumulative_seconds, _) in stats.items():
+            label = frame_label(function)
+            previous_self, previous_cumulative = times.get(label, (0.0, 0.0))
+            times[label] = (previous_self + self_seconds, previous_cumulative + cumulative_seconds)
+        return times
+
+    self_times: DefaultDict[str, float] = defaultdict(float)
+    cumulative_times: DefaultDict[str, float] = defaultdict(float)
+    for line in Path(profile["path"]).read_text().splitlines():
+        stack, _, microseconds = line.rpartition(" ")
+        if not stack:
+            continue
+        seconds = int(microseconds) / 1_000_000
+        frames = stack.split(";")
+        self_times[frames[-1]] += seconds
+        for frame in set(frames):
+            cumulative_times[frame] += seconds
+    return {label: (self_times.get(label, 0.0), seconds) for label, seconds in cumulative_times.items()}
+
+
+def merge_function_times(profiles: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+    """function_times() summed over several profiles."""
+    totals: Dict[str, Tuple[float, float]] = {}
+    for profile in profiles:
+        for label, (self_seconds, cumulative_seconds) in function_times(profile).items():
+            previous_self, previous_cumulative = totals.get(label, (0.0, 0.0))
+            totals[label] = (previous_self + self_seconds, previous_cumulative + cumulative_seconds)
+    return totals
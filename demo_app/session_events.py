@@ -0,0 +1,140 @@
+"""
+__WRISTBAND__: Server-Sent Events about a login session, pushed to the pages' EventSource connections.
+
+GET /api/session/events/ (see views/session_events_views.py) streams, for the session of the request:
+
+    event: session   on connect: {"authenticated": true, "userId", "tenantId", "expiresAt"}
+    event: token     on connect and every SESSION_EVENTS_HEARTBEAT seconds: {"expiresAt", "expiresIn"}, the
+                     access token's expiry countdown; also keeps proxies from closing the idle connection
+    event: logout    when the session is logged out elsewhere, e.g. from another tab: {"reason": "logout"};
+                     the stream ends after it
+
+The stream is closed after SESSION_EVENTS_IDLE_TIMEOUT seconds without session events; the browser reconnects
+after the `retry` delay with its current session cookie, so a refreshed or expired session is picked up.
+
+Logout events are delivered through SessionEventHub, which is per process: a logout reaches the streams held
+open by the same worker. Streams are grouped by a random login ID that the callback stores in the session, so
+a token refresh, which replaces the session's refresh token, doesn't cut open streams off from its logout.
+"""
+
+import asyncio
+import hashlib
+import secrets
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+
+from django.conf import settings
+
+from .fast_json import dumps
+from .metrics import register_stats
+
+# Session field holding the login's ID, set by the callback view
+LOGIN_ID_SESSION_KEY = "login_id"
+
+
+def new_login_id() -> str:
+    """A random ID for a new login session, stored in the session as LOGIN_ID_SESSION_KEY."""
+    return secrets.token_urlsafe()
+
+
+def session_channel(login_id: str) -> str:
+    """Channel for one login session: the same in every tab of the browser, different for other logins."""
+    return hashlib.sha256(login_id.encode("utf-8")).hexdigest()[:32]
+
+
+class _Subscriber:
+    __slots__ = ("loop", "queue")
+
+    def __init__(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Tuple[str, Dict[str, Any]]]" = asyncio.Queue()
+
+
+class SessionEventHub:
+    """In-process publish/subscribe of events per session channel. publish() may be called from any thread."""
+
+    def __init__(self) -> None:
+        self._subscribers: Dict[str, Set[_Subscriber]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel: str) -> _Subscriber:
+        """Subscribe the running event loop's current task to a channel."""
+        subscriber = _Subscriber()
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, channel: str, subscriber: _Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[channel]
+
+    def publish(self, channel: str, event: str, data: Dict[str, Any]) -> int:
+        """Send an event to every stream subscribed to the channel; returns how many there were."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(subscriber.queue.put_nowait, (event, data))
+        return len(subscribers)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "channels": len(self._subscribers),
+                "streams": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            }
+
+
+session_event_hub = SessionEventHub()
+register_stats("demo_session_events", session_event_hub.stats)
+
+
+def format_event(event: str, data: Dict[str, Any]) -> bytes:
+    return b"event: " + event.encode("ascii") + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+def token_event(expires_at: Optional[int]) -> bytes:
+    """The access token's expiry countdown; expires_at is in milliseconds since the epoch, as in the session."""
+    expires_in = max(0, int(expires_at / 1000 - time.time())) if expires_at else 0
+    return format_event("token", {"expiresAt": expires_at, "expiresIn": expires_in})
+
+
+def opening_events(session_state: Dict[str, Any]) -> bytes:
+    """Reconnect delay, session status and token countdown: what every stream starts with."""
+    retry_ms = int(getattr(settings, "SESSION_EVENTS_RETRY", 5) * 1000)
+    return (
+        f"retry: {retry_ms}\n\n".encode("ascii")
+        + format_event("session", session_state)
+        + token_event(session_state["expiresAt"])
+    )
+
+
+async def stream_session_events(channel: str, session_state: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """Event stream for one connection; runs on the event loop, so an open stream doesn't hold a thread."""
+    heartbeat = float(getattr(settings, "SESSION_EVENTS_HEARTBEAT", 15))
+    idle_timeout = float(getattr(settings, "SESSION_EVENTS_IDLE_TIMEOUT", 300))
+    loop = asyncio.get_running_loop()
+
+    subscriber = session_event_hub.subscribe(channel)
+    try:
+        yield opening_events(session_state)
+        idle_deadline = loop.time() + idle_timeout
+        while True:
+            remaining = idle_deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                event, data = await asyncio.wait_for(subscriber.queue.get(), timeout=min(heartbeat, remaining))
+            except asyncio.TimeoutError:
+                yield token_event(session_state["expiresAt"])
+                continue
+            yield format_event(event, data)
+            if event == "logout":
+                return
+            idle_deadline = loop.time() + idle_timeout
+    finally:
+        session_event_hub.unsubscribe(channel, subscriber)
@@ -0,0 +1,121 @@
+"""
+__WRISTBAND__: Encrypted cookie session backend with an in-process cache of decrypted sessions.
+
+A drop-in replacement for the SDK's encrypted cookie engine. Every request that touches `request.session`
+otherwise decrypts the cookie, even when the browser sends back the exact cookie it was given moments ago
+(e.g. the back-to-back session and token calls the DRF page makes). This engine keeps the decoded payloads
+in a bounded, TTL-limited LRU keyed by an HMAC of the cookie value, so an unchanged cookie skips the decrypt.
+
+Configuration:
+    SESSION_ENGINE = "demo_app.sessions.backends.cached_encrypted_cookies"
+    WRISTBAND_SESSION_CACHE_SIZE = 1024  # Max cached sessions per process (0 disables the cache)
+    WRISTBAND_SESSION_CACHE_TTL = 300  # Seconds a decrypted session may be served from memory
+
+Every save() drops the entry for the old cookie and caches the payload under the new one, and delete() (which
+flush() calls) drops it, so a cookie is never served data other than what it encrypts. Cache misses are
+decrypted by demo_app.sessions.backends.encrypted_cookies, so /metrics only records the decrypts that happen.
+"""
+
+import copy
+import hashlib
+import hmac
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from ...lru_cache import ExpiringLRUCache
+from .encrypted_cookies import SessionStore as EncryptedCookieSessionStore
+
+DEFAULT_SESSION_CACHE_SIZE = 1024
+DEFAULT_SESSION_CACHE_TTL = 300
+
+# Session values of these types can be shared between the cache and a request without copying
+_IMMUTABLE_TYPES = (str, int, float, bool, type(None), tuple, frozenset, bytes)
+
+
+def copy_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a session dict so a request can't mutate the cached one. Only mutable values are deep-copied."""
+    return {
+        key: value if isinstance(value, _IMMUTABLE_TYPES) else copy.deepcopy(value) for key, value in payload.items()
+    }
+
+
+class DecodedSessionCache(ExpiringLRUCache[bytes, Dict[str, Any]]):
+    """
+    LRU of decrypted session payloads keyed by an HMAC-SHA256 of the encrypted cookie value.
+
+    Keys are MACs rather than the cookies themselves, so the cache never holds a usable session cookie. Payloads
+    are copied on the way in and out, so no request sees another request's uncommitted changes.
+    """
+
+    def __init__(self, max_size: int, ttl: float, secret: str) -> None:
+        super().__init__(max_size)
+        self.ttl = ttl
+        self._mac_key = hashlib.sha256(f"demo_app.sessions.cache:{secret}".encode("utf-8")).digest()
+
+    def cookie_mac(self, cookie_value: str) -> bytes:
+        return hmac.new(self._mac_key, cookie_value.encode("utf-8"), hashlib.sha256).digest()
+
+    def get_payload(self, cookie_value: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the decrypted session for a cookie, or None on a miss."""
+        payload = self.get(self.cookie_mac(cookie_value))
+        return None if payload is None else copy_payload(payload)
+
+    def set_payload(self, cookie_value: str, payload: Dict[str, Any]) -> None:
+        if self.max_size:
+            self.set(self.cookie_mac(cookie_value), copy_payload(payload), time.time() + self.ttl)
+
+    def discard_payload(self, cookie_value: str) -> None:
+        self.discard(self.cookie_mac(cookie_value))
+
+
+def _create_session_cache() -> DecodedSessionCache:
+    secret = getattr(settings, "WRISTBAND_SESSION_SECRET", settings.SECRET_KEY)
+    if isinstance(secret, list):
+        secret = secret[0]
+    return DecodedSessionCache(
+        max_size=getattr(settings, "WRISTBAND_SESSION_CACHE_SIZE", DEFAULT_SESSION_CACHE_SIZE),
+        ttl=getattr(settings, "WRISTBAND_SESSION_CACHE_TTL", DEFAULT_SESSION_CACHE_TTL),
+        secret=secret,
+    )
+
+
+# Shared by every SessionStore in this process; stats() reports hits and misses
+session_cache = _create_session_cache()
+
+
+class SessionStore(EncryptedCookieSessionStore):
+    """
+    Encrypted cookie session store that serves repeat cookies from `session_cache` instead of decrypting them.
+    """
+
+    def load(self) -> Dict[str, Any]:
+        cookie_value = self.session_key
+        if cookie_value:
+            payload = session_cache.get_payload(cookie_value)
+            if payload is not None:
+                return payload
+
+        payload = super().load()
+
+        # The parent clears the session key when the cookie can't be decrypted; only cache real sessions
+        if cookie_value and self.session_key:
+            session_cache.set_payload(cookie_value, payload)
+        return payload
+
+    def save(self, must_create: bool = False) -> None:
+        previous_cookie = self.session_key
+        super().save(must_create)
+
+        if previous_cookie:
+            session_cache.discard_payload(previous_cookie)
+        # The response carries the new cookie, so the browser's next request can skip the decrypt too
+        if self.session_key:
+            session_cache.set_payload(self.session_key, self._session_cache)
+
+    def delete(self, session_key: Optional[str] = None) -> None:
+        cookie_value = session_key or self.session_key
+        if cookie_value:
+            session_cache.discard_payload(cookie_value)
+        super().delete(session_key)
@@ -0,0 +1,26 @@
+"""
+__WRISTBAND__: The SDK's encrypted cookie session backend, with cookie decryption timed for /metrics.
+
+Configuration:
+    SESSION_ENGINE = "demo_app.sessions.backends.encrypted_cookies"
+
+Behaves exactly like "wristband.django_auth.sessions.backends.encrypted_cookies"; each decrypt of a session
+cookie is recorded as the session_decrypt auth phase (see demo_app/metrics.py).
+"""
+
+from typing import Any, Dict
+
+from wristband.django_auth.sessions.backends.encrypted_cookies import SessionStore as EncryptedCookieSessionStore
+
+from ...metrics import timed_phase
+
+
+class SessionStore(EncryptedCookieSessionStore):
+    """Encrypted cookie session store that records how long decrypting the cookie takes."""
+
+    def load(self) -> Dict[str, Any]:
+        # Requests without a session cookie have nothing to decrypt
+        if not self.session_key:
+            return super().load()
+        with timed_phase("session_decrypt"):
+            return super().load()
@@ -0,0 +1,153 @@
+"""
+__WRISTBAND__: Server-side session backend: the session lives in a store, the cookie carries only a signed ID.
+
+The encrypted cookie engines put the whole session (access and refresh tokens, tenant fields, the custom fields
+from session_from_callback) in the cookie, so every request, static and API calls included, uploads a few KB
+and has the cookie decrypted. With this engine the cookie is a random session ID plus its HMAC signature,
+around 80 bytes, and the payload is looked up in one of two stores:
+
+    - "memory" (default): a bounded LRU in each worker process. Nothing to run, but sessions aren't shared
+      between workers and are lost on restart, so use it with a single worker (e.g. uvicorn in development).
+    - "cache": the cache named by SESSION_CACHE_ALIAS. Point it at Django's Redis cache backend (or any
+      Redis-compatible server, such as Valkey) to share sessions between workers and hosts.
+
+Configuration:
+    SESSION_ENGINE = "demo_app.sessions.backends.server_side"
+    WRISTBAND_SESSION_STORE = "memory"  # or "cache"
+    WRISTBAND_SESSION_STORE_SIZE = 10000  # Max sessions per process in the "memory" store
+
+Session IDs are signed with WRISTBAND_SESSION_SECRET (or SECRET_KEY; with a list of secrets, the first signs and
+the others are still accepted), so a forged or mistyped cookie is rejected without a store lookup. Sessions
+expire from the store after SESSION_COOKIE_AGE. Lookups are recorded as the session_load auth phase on
+/metrics, and the memory store's counters as demo_session_store_*.
+
+The session behaves like any other Django session, so session_from_callback, get_session_response and
+get_token_response work unchanged; login() moves the session to a new ID, so a session ID set before login
+can't be used after it.
+"""
+
+import time
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.contrib.sessions.backends.base import VALID_KEY_CHARS, SessionBase
+from django.contrib.sessions.backends.cache import SessionStore as CacheSessionStore
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signing import BadSignature, Signer
+from django.utils.crypto import get_random_string
+
+from ...lru_cache import ExpiringLRUCache
+from ...metrics import register_stats, timed_phase
+from .cached_encrypted_cookies import copy_payload
+
+DEFAULT_SESSION_STORE_SIZE = 10000
+
+
+class MemorySessionStorage:
+    """
+    Process-local session storage with the part of Django's cache API that the cache session store uses.
+
+    Payloads are copied on the way in and out, so no request sees another request's uncommitted changes.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ImproperlyConfigured("WRISTBAND_SESSION_STORE_SIZE must be at least 1")
+        self._sessions: ExpiringLRUCache[str, Dict[str, Any]] = ExpiringLRUCache(max_size)
+
+    def get(self, key: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        payload = self._sessions.get(key)
+        return default if payload is None else copy_payload(payload)
+
+    def set(self, key: str, value: Dict[str, Any], timeout: int) -> None:
+        self._sessions.set(key, copy_payload(value), time.time() + timeout)
+
+    def add(self, key: str, value: Dict[str, Any], timeout: int) -> bool:
+        return self._sessions.add(key, copy_payload(value), time.time() + timeout)
+
+    def delete(self, key: str) -> None:
+        self._sessions.discard(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self._sessions.get(key) is not None
+
+    # Nothing here blocks, so the async API used by async views (e.g. alogin, alogout) just calls the sync one
+
+    async def aget(self, key: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        return self.get(key, default)
+
+    async def aset(self, key: str, value: Dict[str, Any], timeout: int) -> None:
+        self.set(key, value, timeout)
+
+    async def aadd(self, key: str, value: Dict[str, Any], timeout: int) -> bool:
+        return self.add(key, value, timeout)
+
+    async def adelete(self, key: str) -> None:
+        self.delete(key)
+
+    async def ahas_key(self, key: str) -> bool:
+        return key in self
+
+    def clear(self) -> None:
+        self._sessions.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._sessions.stats()
+
+
+def _create_signer() -> Signer:
+    secret = getattr(settings, "WRISTBAND_SESSION_SECRET", settings.SECRET_KEY)
+    secrets = secret if isinstance(secret, list) else [secret]
+    return Signer(key=secrets[0], fallback_keys=secrets[1:], salt="demo_app.sessions.server_side")
+
+
+_signer = _create_signer()
+
+# Shared by every SessionStore in this process when WRISTBAND_SESSION_STORE is "memory"
+memory_storage = MemorySessionStorage(getattr(settings, "WRISTBAND_SESSION_STORE_SIZE", DEFAULT_SESSION_STORE_SIZE))
+register_stats("demo_session_store", memory_storage.stats)
+
+
+class SessionStore(CacheSessionStore):
+    """
+    Django's cache session store with signed session IDs and a choice of storage (see WRISTBAND_SESSION_STORE).
+    """
+
+    cache_key_prefix = "demo_app.sessions.server_side:"
+
+    def __init__(self, session_key: Optional[str] = None) -> None:
+        # Skip the parent's __init__: it would look up SESSION_CACHE_ALIAS even for the memory store
+        SessionBase.__init__(self, session_key)
+        store = getattr(settings, "WRISTBAND_SESSION_STORE", "memory")
+        self._cache: Any
+        if store == "memory":
+            self._cache = memory_storage
+        elif store == "cache":
+            self._cache = caches[settings.SESSION_CACHE_ALIAS]
+        else:
+            raise ImproperlyConfigured(f'WRISTBAND_SESSION_STORE must be "memory" or "cache", not {store!r}')
+
+    def _validate_session_key(self, key: Optional[str]) -> bool:
+        if not key:
+            return False
+        try:
+            _signer.unsign(key)
+        except BadSignature:
+            return False
+        return True
+
+    def _get_new_session_key(self) -> str:
+        # create() adds the key to the store only if it's unused, so there's no need to check for it here
+        return _signer.sign(get_random_string(32, VALID_KEY_CHARS))
+
+    async def _aget_new_session_key(self) -> str:
+        return self._get_new_session_key()
+
+    def load(self) -> Dict[str, Any]:
+        with timed_phase("session_load"):
+            return super().load()
+
+    async def aload(self) -> Dict[str, Any]:
+        with timed_phase("session_load"):
+            return await super().aload()
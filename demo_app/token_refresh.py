@@ -0,0 +1,184 @@
+"""
+__WRISTBAND__: Single-flight, proactive refresh of session access tokens.
+
+Session auth (require_session, SessionRequiredMixin, DrfSessionAuth) refreshes the session's access token once
+it has expired. The DRF page fetches the session and token endpoints in parallel, often from several tabs, so
+right at expiry each of those requests would make its own refresh call to Wristband. The coordinator here
+refreshes a little ahead of expiry, lets only one refresh per refresh token run at a time in a worker, and
+hands its result to every request that asked for it, including ones that arrive with the old refresh token
+just after the refresh finished.
+
+Those late arrivals are requests that were already in flight with the old session cookie, so results are only
+kept for WRISTBAND_TOKEN_REFRESH_RESULT_TTL seconds. Logging out forgets them right away: a request replaying
+a pre-refresh cookie after logout can't get live tokens out of the cache.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from wristband.django_auth import LogoutConfig, TokenData, WristbandError
+
+from .lru_cache import ExpiringLRUCache
+
+DEFAULT_REFRESH_SKEW = 30
+DEFAULT_REFRESH_WAIT_TIMEOUT = 30.0
+DEFAULT_REFRESH_RESULT_CACHE_SIZE = 1024
+# Long enough for requests sent with the old refresh token before the refresh finished
+DEFAULT_REFRESH_RESULT_TTL = 10.0
+
+# Any positive expires_at in the past makes the SDK refresh unconditionally
+_ALREADY_EXPIRED = 1
+
+
+class _Flight:
+    """A refresh in progress, and its outcome once it finishes."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[TokenData] = None
+        self.error: Optional[BaseException] = None
+
+
+class TokenRefreshCoordinator:
+    """
+    Runs at most one refresh per refresh token at a time and shares its result.
+
+    The first caller for a refresh token performs the refresh; concurrent callers block until it finishes and
+    get the same TokenData (or the same exception). Successful results stay cached under the old refresh token
+    for `result_ttl` seconds (at most until the new access token expires), so late callers still holding the
+    old token reuse them too, or until forget() is called for either refresh token.
+    """
+
+    def __init__(
+        self,
+        wait_timeout: float = DEFAULT_REFRESH_WAIT_TIMEOUT,
+        result_cache_size: int = DEFAULT_REFRESH_RESULT_CACHE_SIZE,
+        result_ttl: float = DEFAULT_REFRESH_RESULT_TTL,
+    ) -> None:
+        self.wait_timeout = wait_timeout
+        self.result_ttl = result_ttl
+        self.refreshes = 0
+        self.coalesced = 0
+        self._results: ExpiringLRUCache[bytes, TokenData] = ExpiringLRUCache(result_cache_size)
+        # Digest of a refreshed-to refresh token -> digest of the refresh token its result is cached under
+        self._refreshed_from: ExpiringLRUCache[bytes, bytes] = ExpiringLRUCache(result_cache_size)
+        self._flights: Dict[bytes, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def token_digest(refresh_token: str) -> bytes:
+        return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
+    def refresh(self, refresh_token: str, do_refresh: Callable[[], Optional[TokenData]]) -> Optional[TokenData]:
+        """Return fresh tokens for `refresh_token`, calling `do_refresh` only if no other caller is already."""
+        key = self.token_digest(refresh_token)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            if not flight.done.wait(self.wait_timeout):
+                raise WristbandError("unexpected_error", "Timed out waiting for a token refresh in progress")
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = do_refresh()
+            if flight.result is not None:
+                expires_at = min(flight.result.expires_at / 1000, time.time() + self.result_ttl)
+                self._results.set(key, flight.result, expires_at)
+                if flight.result.refresh_token:
+                    self._refreshed_from.set(self.token_digest(flight.result.refresh_token), key, expires_at)
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self.refreshes += 1
+                del self._flights[key]
+            flight.done.set()
+
+    def forget(self, refresh_token: str) -> None:
+        """Drop cached results for a refresh token, or that issued it, e.g. when its session logs out."""
+        key = self.token_digest(refresh_token)
+        self._results.discard(key)
+        # The session holds the newest refresh token; results handed out for the ones before it go too
+        previous = self._refreshed_from.get(key)
+        while previous is not None:
+            self._refreshed_from.discard(key)
+            self._results.discard(previous)
+            key, previous = previous, self._refreshed_from.get(previous)
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for monitoring: refresh calls made, callers that joined one in flight, and cached results."""
+        result_stats = self._results.stats()
+        with self._lock:
+            return {
+                "refreshes": self.refreshes,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._flights),
+                "reused": result_stats["hits"],
+                "cached_results": result_stats["size"],
+            }
+
+
+class SingleFlightRefreshMixin:
+    """
+    WristbandAuth mixin that refreshes session tokens ahead of expiry through a TokenRefreshCoordinator.
+
+    Tokens are refreshed once they are within WRISTBAND_TOKEN_REFRESH_SKEW seconds of `expires_at` (which the
+    SDK already sets `token_expiration_buffer` seconds before the real expiry). Session auth picks this up for
+    every session-protected view, including the DRF session and token endpoints. logout() and alogout() forget
+    the cached refreshes of the session's refresh token.
+    """
+
+    token_refresh_coordinator: TokenRefreshCoordinator
+    token_refresh_skew: float
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.token_refresh_skew = getattr(settings, "WRISTBAND_TOKEN_REFRESH_SKEW", DEFAULT_REFRESH_SKEW)
+        self.token_refresh_coordinator = TokenRefreshCoordinator(
+            result_ttl=getattr(settings, "WRISTBAND_TOKEN_REFRESH_RESULT_TTL", DEFAULT_REFRESH_RESULT_TTL)
+        )
+
+    def refresh_token_if_expired(self, refresh_token: str, expires_at: int) -> Optional[TokenData]:
+        if not refresh_token or not refresh_token.strip():
+            raise TypeError("Refresh token must be a valid string")
+        if not expires_at or expires_at < 0:
+            raise TypeError("The expiresAt field must be an integer greater than 0")
+
+        # Nothing to do here if the access token is valid beyond the skew window
+        if expires_at - self.token_refresh_skew * 1000 > int(time.time() * 1000):
+            return None
+
+        parent_refresh = super().refresh_token_if_expired  # type: ignore[misc]
+        return self.token_refresh_coordinator.refresh(
+            refresh_token, lambda: parent_refresh(refresh_token, _ALREADY_EXPIRED)
+        )
+
+    def logout(self, request: HttpRequest, config: LogoutConfig = LogoutConfig()) -> HttpResponse:
+        if config.refresh_token:
+            self.token_refresh_coordinator.forget(config.refresh_token)
+        return super().logout(request, config)  # type: ignore[misc, no-any-return]
+
+    async def alogout(self, request: HttpRequest, config: LogoutConfig = LogoutConfig()) -> HttpResponse:
+        if config.refresh_token:
+            self.token_refresh_coordinator.forget(config.refresh_token)
+        return await super().alogout(request, config)  # type: ignore[misc, no-any-return]
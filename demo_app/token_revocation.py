@@ -0,0 +1,240 @@
+"""
+__WRISTBAND__: Refresh token revocation in the background, off the logout request's critical path.
+
+Logging out revokes the session's refresh token with a call to Wristband, and the SDK makes that call before
+it returns the logout redirect, so a slow revoke slows down every logout. With BackgroundRevocationMixin, logout
+hands the token to a RevocationQueue and returns the redirect right away; a worker thread revokes it:
+
+    - the queue is bounded (WRISTBAND_REVOCATION_QUEUE_SIZE); when it's full, logout revokes inline as before
+    - failed revokes (network errors, 429 and 5xx responses) are retried with exponential backoff starting at
+      WRISTBAND_REVOCATION_RETRY_BACKOFF seconds, up to WRISTBAND_REVOCATION_MAX_ATTEMPTS attempts in all
+    - a token that's already queued, or was revoked in the last few minutes, isn't queued again (e.g. logout
+      clicked twice, or from two tabs of the same session)
+    - when the process exits (a graceful uvicorn or gunicorn worker shutdown), the queue is drained, retrying
+      without waiting for backoff, for up to WRISTBAND_REVOCATION_DRAIN_TIMEOUT seconds
+
+Queue depth and the counts of revoked, retried, failed and deduplicated tokens are published on /metrics as
+demo_token_revocation_* (see demo_app/metrics.py). The queue is per worker process and in memory: tokens still
+queued when a process is killed outright are not revoked.
+"""
+
+import atexit
+import hashlib
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import replace
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+from wristband.django_auth import LogoutConfig
+
+from .lru_cache import ExpiringLRUCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_RETRY_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_DRAIN_TIMEOUT = 10.0
+# How long a revoked token is remembered, so that repeated logouts of one session revoke it once
+DEFAULT_DEDUPE_TTL = 600.0
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether a failed revoke may succeed if tried again: network errors, rate limiting and server errors."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+class RevocationQueue:
+    """
+    Bounded queue of refresh tokens that a worker thread revokes, with retries, dedupe and a drain on exit.
+
+    Tokens are only held in memory while queued; dedupe is keyed by their SHA-256 digests.
+    """
+
+    def __init__(
+        self,
+        revoke: Callable[[str], None],
+        max_size: int = DEFAULT_QUEUE_SIZE,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        drain_timeout: float = DEFAULT_DRAIN_TIMEOUT,
+        dedupe_ttl: float = DEFAULT_DEDUPE_TTL,
+    ) -> None:
+        self.max_size = max_size
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.max_backoff = max_backoff
+        self.drain_timeout = drain_timeout
+        self.dedupe_ttl = dedupe_ttl
+        self.submitted = 0
+        self.revoked = 0
+        self.retried = 0
+        self.failed = 0
+        self.deduplicated = 0
+        self.rejected = 0
+        self._revoke = revoke
+        # (due time, sequence, token, attempts made so far); the sequence keeps equal due times in FIFO order
+        self._scheduled: List[Tuple[float, int, str, int]] = []
+        self._sequence = itertools.count()
+        self._pending: Set[bytes] = set()
+        self._recently_revoked: ExpiringLRUCache[bytes, bool] = ExpiringLRUCache(max(max_size, 1))
+        self._in_flight = 0
+        self._draining = False
+        self._worker: Optional[threading.Thread] = None
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def token_digest(refresh_token: str) -> bytes:
+        return hashlib.sha256(refresh_token.encode("utf-8")).digest()
+
+    def submit(self, refresh_token: str) -> bool:
+        """Queue a token for revocation. False if the queue can't take it, and the caller should revoke it."""
+        key = self.token_digest(refresh_token)
+        with self._condition:
+            if key in self._pending or self._recently_revoked.get(key) is not None:
+                self.deduplicated += 1
+                return True
+            if self._draining or len(self._scheduled) + self._in_flight >= self.max_size:
+                self.rejected += 1
+                return False
+
+            self._pending.add(key)
+            heapq.heappush(self._scheduled, (time.monotonic(), next(self._sequence), refresh_token, 0))
+            self.submitted += 1
+            if self._worker is None:
+                self._start_worker()
+            self._condition.notify_all()
+        return True
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        """Revoke everything queued, retrying without backoff. False if tokens were left after the timeout."""
+        deadline = time.monotonic() + (self.drain_timeout if timeout is None else timeout)
+        with self._condition:
+            self._draining = True
+            self._condition.notify_all()
+            while self._scheduled or self._in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(
+                        "Gave up on %d refresh token revocation(s) at shutdown",
+                        len(self._scheduled) + self._in_flight,
+                    )
+                    return False
+                self._condition.wait(remaining)
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                "depth": len(self._scheduled) + self._in_flight,
+                "submitted": self.submitted,
+                "revoked": self.revoked,
+                "retried": self.retried,
+                "failed": self.failed,
+                "deduplicated": self.deduplicated,
+                "rejected": self.rejected,
+            }
+
+    def _start_worker(self) -> None:
+        """With the lock held: start the worker thread and drain the queue when the process exits."""
+        # A daemon, so a hung revoke can't keep the process alive; atexit handlers run before daemons are stopped
+        self._worker = threading.Thread(target=self._run, name="token-revocation", daemon=True)
+        self._worker.start()
+        atexit.register(self.drain)
+
+    def _next_token(self) -> Tuple[str, int]:
+        """Wait for the next token that's due; returns it with the number of attempts already made."""
+        with self._condition:
+            while True:
+                if self._scheduled:
+                    wait = 0.0 if self._draining else self._scheduled[0][0] - time.monotonic()
+                    if wait <= 0:
+                        _, _, refresh_token, attempts = heapq.heappop(self._scheduled)
+                        self._in_flight += 1
+                        return refresh_token, attempts
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            refresh_token, attempts = self._next_token()
+            error: Optional[Exception] = None
+            try:
+                self._revoke(refresh_token)
+            except Exception as e:
+                error = e
+            attempts += 1
+
+            key = self.token_digest(refresh_token)
+            with self._condition:
+                self._in_flight -= 1
+                if error is None:
+                    self.revoked += 1
+                    self._pending.discard(key)
+                    self._recently_revoked.set(key, True, time.time() + self.dedupe_ttl)
+                elif attempts < self.max_attempts and is_retryable(error):
+                    self.retried += 1
+                    # Jitter keeps the retries of many workers from hitting Wristband in lockstep
+                    backoff = min(self.retry_backoff * 2 ** (attempts - 1), self.max_backoff)
+                    due = time.monotonic() + random.uniform(backoff / 2, backoff)  # nosec B311 - jitter
+                    heapq.heappush(self._scheduled, (due, next(self._sequence), refresh_token, attempts))
+                else:
+                    self.failed += 1
+                    self._pending.discard(key)
+                    logger.warning("Revoking a refresh token failed after %d attempt(s): %s", attempts, error)
+                self._condition.notify_all()
+
+
+class BackgroundRevocationMixin:
+    """
+    WristbandAuth mixin whose logout() and alogout() queue the refresh token for background revocation.
+
+    The redirect to the Wristband Logout Endpoint is built without waiting for the revoke. Tokens the queue
+    can't take are revoked inline by the SDK, as without the mixin. WRISTBAND_REVOCATION_QUEUE_SIZE = 0 turns
+    the queue off.
+    """
+
+    revocation_queue: Optional[RevocationQueue]
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        max_size = getattr(settings, "WRISTBAND_REVOCATION_QUEUE_SIZE", DEFAULT_QUEUE_SIZE)
+        self.revocation_queue = None
+        if max_size > 0:
+            self.revocation_queue = RevocationQueue(
+                self._revoke_refresh_token,
+                max_size=max_size,
+                max_attempts=getattr(settings, "WRISTBAND_REVOCATION_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS),
+                retry_backoff=getattr(settings, "WRISTBAND_REVOCATION_RETRY_BACKOFF", DEFAULT_RETRY_BACKOFF),
+                drain_timeout=getattr(settings, "WRISTBAND_REVOCATION_DRAIN_TIMEOUT", DEFAULT_DRAIN_TIMEOUT),
+            )
+
+    def _revoke_refresh_token(self, refresh_token: str) -> None:
+        # Looks the client method up on each call, so MetricsMixin times it like an inline revoke
+        self._wristband_api.revoke_refresh_token(refresh_token)  # type: ignore[attr-defined]
+
+    def _queue_revocation(self, config: LogoutConfig) -> LogoutConfig:
+        """The logout config to continue with: without the refresh token if it was queued."""
+        queue = self.revocation_queue
+        if config.refresh_token and queue is not None and queue.submit(config.refresh_token):
+            return replace(config, refresh_token=None)
+        return config
+
+    def logout(self, request: HttpRequest, config: LogoutConfig = LogoutConfig()) -> HttpResponse:
+        return super().logout(request, self._queue_revocation(config))  # type: ignore[misc, no-any-return]
+
+    async def alogout(self, request: HttpRequest, config: LogoutConfig = LogoutConfig()) -> HttpResponse:
+        return await super().alogout(request, self._queue_revocation(config))  # type: ignore[misc, no-any-return]
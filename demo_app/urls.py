@@ -13,6 +13,7 @@ urlpatterns = [
     path("api/auth/login/", views.login_endpoint, name="login"),
     path("api/auth/callback/", views.callback_endpoint, name="callback"),
     path("api/auth/logout/", views.logout_endpoint, name="logout"),
+    path("api/session/events/", views.session_events_endpoint, name="session_events"),
     # Page Views
     path("", views.HomePage.as_view(), name="home"),
     path("classic/", views.ClassicPage.as_view(), name="classic"),
@@ -20,8 +21,11 @@ urlpatterns = [
     # Classic Django API Views
     path("api/classic/session-hello/", views.classic_session_hello_world_api, name="classic_session_hello"),
     path("api/classic/jwt-hello/", views.classic_jwt_hello_world_api, name="classic_jwt_hello"),
-    # Django REST Framework (DRF) APIs
-    path("api/drf/session/", views.SessionEndpoint.as_view(), name="drf_session"),
-    path("api/drf/token/", views.TokenEndpoint.as_view(), name="drf_token"),
-    path("api/drf/jwt-hello/", views.DrfJwtHelloApi.as_view(), name="drf_jwt_hello"),
+    # Django REST Framework (DRF) APIs, loaded on their first request
+    path("api/drf/session/", views.drf_view("SessionEndpoint"), name="drf_session"),
+    path("api/drf/token/", views.drf_view("TokenEndpoint"), name="drf_token"),
+    path("api/drf/jwt-hello/", views.drf_view("DrfJwtHelloApi"), name="drf_jwt_hello"),
+    path("api/drf/batch/", views.drf_view("DrfJwtBatchApi"), name="drf_batch"),
+    # Prometheus scrape target
+    path("metrics", views.metrics_endpoint, name="metrics"),
 ]
@@ -0,0 +1,300 @@
+"""
+__WRISTBAND__: Deferred Django user sync, so the login callback redirects without waiting on the database.
+
+By default the callback view runs authenticate() and login() before it redirects: WristbandAuthBackend upserts
+the User, and MyWristbandAdapter writes its groups. With WRISTBAND_DEFERRED_USER_SYNC = True, the callback
+stores the Wristband session, marks the Django login as pending and redirects; a UserSyncQueue does the rest:
+
+    - the sync (authenticate() and the user_logged_in signal, which sets last_login) runs on a thread pool of
+      WRISTBAND_USER_SYNC_WORKERS threads
+    - syncs are coalesced per Wristband user: logins that arrive while one is waiting replace its data, and
+      logins that arrive while one is running are synced once more after it, with the latest data
+    - when WRISTBAND_USER_SYNC_QUEUE_SIZE users are already waiting, the callback syncs inline, as without it
+
+The Django login is completed on demand. DeferredUserSyncMiddleware (after AuthenticationMiddleware) makes
+request.user and request.auser() wait for the session's pending sync, for up to WRISTBAND_USER_SYNC_TIMEOUT
+seconds, then store the user in the session as login() would. Pages and APIs that only read the Wristband
+session fields never wait. The queue is per worker process: when the next request lands on another worker,
+the User is looked up by username instead, and request.user stays anonymous until the sync has written it.
+
+Queue depth and the submitted, coalesced, synced and failed counts are published on /metrics as
+demo_user_sync_* (see demo_app/metrics.py), and waits for a pending sync as the user_sync_wait auth phase.
+"""
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, cast
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY, authenticate
+from django.contrib.auth import get_user as get_session_user
+from django.contrib.auth import get_user_model, user_logged_in
+from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import close_old_connections
+from django.http import HttpRequest, HttpResponse
+from django.middleware.csrf import rotate_token
+from django.utils.functional import SimpleLazyObject
+from wristband.django_auth import CallbackData
+
+from .metrics import register_stats, timed_phase
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_TIMEOUT = 5.0
+
+# Session flag set by the callback until request.user completes the Django login
+PENDING_SESSION_KEY = "_wristband_user_sync_pending"
+WRISTBAND_BACKEND = "wristband.django_auth.WristbandAuthBackend"
+
+
+class _PendingSync:
+    """A user's sync: the newest callback data not yet synced, and the future its waiters share."""
+
+    __slots__ = ("callback_data", "future")
+
+    def __init__(self, callback_data: CallbackData) -> None:
+        self.callback_data: Optional[CallbackData] = callback_data
+        self.future: "Future[Optional[AbstractBaseUser]]" = Future()
+
+
+class UserSyncQueue:
+    """
+    Runs WristbandAuthBackend user syncs on a thread pool, at most one at a time per Wristband user.
+
+    Each sync's future resolves to the User once the user's latest callback data has been synced.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS, max_size: int = DEFAULT_QUEUE_SIZE) -> None:
+        self.max_size = max_size
+        self.submitted = 0
+        self.coalesced = 0
+        self.synced = 0
+        self.failed = 0
+        self.rejected = 0
+        self._pending: Dict[str, _PendingSync] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="user-sync")
+
+    def submit(self, callback_data: CallbackData) -> "Optional[Future[Optional[AbstractBaseUser]]]":
+        """Queue a sync of the callback's user. None if the queue is full, and the caller should sync inline."""
+        user_id = callback_data.user_info.user_id
+        with self._lock:
+            pending = self._pending.get(user_id)
+            if pending is not None:
+                pending.callback_data = callback_data
+                self.coalesced += 1
+                return pending.future
+            if len(self._pending) >= self.max_size:
+                self.rejected += 1
+                return None
+
+            pending = self._pending[user_id] = _PendingSync(callback_data)
+            self.submitted += 1
+        self._executor.submit(self._run, user_id, pending)
+        return pending.future
+
+    def pending(self, user_id: Optional[str]) -> "Optional[Future[Optional[AbstractBaseUser]]]":
+        """The future of the user's queued or running sync, if there is one in this process."""
+        with self._lock:
+            pending = self._pending.get(user_id or "")
+            return None if pending is None else pending.future
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "depth": len(self._pending),
+                "submitted": self.submitted,
+                "coalesced": self.coalesced,
+                "synced": self.synced,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def _run(self, user_id: str, pending: _PendingSync) -> None:
+        user: Optional[AbstractBaseUser] = None
+        error: Optional[Exception] = None
+        try:
+            while True:
+                with self._lock:
+                    callback_data = pending.callback_data
+                    if callback_data is None:
+                        # Nothing newer arrived while the last sync ran: this user's sync is done
+                        del self._pending[user_id]
+                        if error is None:
+                            self.synced += 1
+                        else:
+                            self.failed += 1
+                        break
+                    pending.callback_data = None
+                try:
+                    user, error = sync_user(callback_data), None
+                except Exception as e:
+                    logger.exception("Syncing Wristband user %s failed", user_id)
+                    user, error = None, e
+        finally:
+            # Like the end of a request: give back connections that are broken or past CONN_MAX_AGE
+            close_old_connections()
+
+        if error is None:
+            pending.future.set_result(user)
+        else:
+            pending.future.set_exception(error)
+
+
+def sync_user(callback_data: CallbackData, request: Optional[HttpRequest] = None) -> Optional[AbstractBaseUser]:
+    """Create or update the callback's Django User through the auth backends, then signal the login."""
+    user = authenticate(request, callback_data=callback_data)
+    if user is not None:
+        user_logged_in.send(sender=user.__class__, request=request, user=user)
+    return user
+
+
+def _create_queue() -> Optional[UserSyncQueue]:
+    if not getattr(settings, "WRISTBAND_DEFERRED_USER_SYNC", False):
+        return None
+    queue = UserSyncQueue(
+        max_workers=getattr(settings, "WRISTBAND_USER_SYNC_WORKERS", DEFAULT_WORKERS),
+        max_size=getattr(settings, "WRISTBAND_USER_SYNC_QUEUE_SIZE", DEFAULT_QUEUE_SIZE),
+    )
+    register_stats("demo_user_sync", queue.stats)
+    return queue
+
+
+# None unless WRISTBAND_DEFERRED_USER_SYNC is on
+user_sync_queue = _create_queue()
+
+
+async def adefer_login(request: HttpRequest, callback_data: CallbackData) -> bool:
+    """
+    Queue the callback's user sync and leave the Django login pending. False if the caller must log in inline.
+
+    Does what login() does to the session up front (a new session key, a new CSRF token, no trace of an
+    earlier Django login), so the redirect is as safe as after a completed login.
+    """
+    if user_sync_queue is None or user_sync_queue.submit(callback_data) is None:
+        return False
+
+    session = request.session
+    data = dict(await session.aitems())
+    await session.acycle_key()
+    # The encrypted cookie engine's cycle_key() drops the data of a session that already had a key (a re-login)
+    await session.aupdate(data)
+    for key in (SESSION_KEY, BACKEND_SESSION_KEY, HASH_SESSION_KEY):
+        await session.apop(key, None)
+    await session.aset(PENDING_SESSION_KEY, True)
+    rotate_token(request)
+    return True
+
+
+def _complete_login(request: HttpRequest, user: AbstractBaseUser) -> None:
+    """Store the synced user in the session, as login() would have during the callback."""
+    session = request.session
+    session[SESSION_KEY] = user._meta.pk.value_to_string(user)
+    session[BACKEND_SESSION_KEY] = getattr(user, "backend", WRISTBAND_BACKEND)
+    session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+    del session[PENDING_SESSION_KEY]
+
+
+def _find_user(user_id: Optional[str]) -> Optional[AbstractBaseUser]:
+    # WristbandAuthBackend uses the Wristband user ID as the username
+    return get_user_model()._default_manager.filter(username=user_id).first()  # type: ignore[no-any-return]
+
+
+def _timeout() -> float:
+    return float(getattr(settings, "WRISTBAND_USER_SYNC_TIMEOUT", DEFAULT_TIMEOUT))
+
+
+def get_synced_user(request: HttpRequest) -> Any:
+    """request.user: waits for the session's pending user sync, if any, then returns the session's user."""
+    if not request.session.get(PENDING_SESSION_KEY):
+        return get_session_user(request)
+
+    user_id = request.session.get("user_id")
+    future = user_sync_queue.pending(user_id) if user_sync_queue is not None else None
+    user = None
+    if future is not None:
+        with timed_phase("user_sync_wait"):
+            try:
+                user = future.result(_timeout())
+            except Exception:  # nosec B110 - timed out or failed (and logged): fall back to the database
+                pass
+    if user is None:
+        user = _find_user(user_id)
+    if user is None:
+        return AnonymousUser()
+
+    _complete_login(request, user)
+    return user
+
+
+async def aget_synced_user(request: HttpRequest) -> Any:
+    """request.auser(): async get_synced_user()."""
+    if not await request.session.aget(PENDING_SESSION_KEY):
+        return await sync_to_async(get_session_user)(request)
+
+    user_id = await request.session.aget("user_id")
+    future = user_sync_queue.pending(user_id) if user_sync_queue is not None else None
+    user = None
+    if future is not None:
+        with timed_phase("user_sync_wait"):
+            try:
+                user = await asyncio.wait_for(asyncio.wrap_future(future), _timeout())
+            except Exception:  # nosec B110 - timed out or failed (and logged): fall back to the database
+                pass
+    if user is None:
+        user = await sync_to_async(_find_user)(user_id)
+    if user is None:
+        return AnonymousUser()
+
+    await sync_to_async(_complete_login)(request, user)
+    return user
+
+
+class DeferredUserSyncMiddleware:
+    """
+    Makes request.user and request.auser() complete a login whose user sync was deferred by the callback.
+
+    Place it right after AuthenticationMiddleware. Nothing waits unless a view (or template) uses the user.
+    Not used unless WRISTBAND_DEFERRED_USER_SYNC is on.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if user_sync_queue is None:
+            raise MiddlewareNotUsed("Deferred user sync is off")
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    @staticmethod
+    def _install(request: HttpRequest) -> None:
+        cached_user = None
+
+        async def auser() -> Any:
+            nonlocal cached_user
+            if cached_user is None:
+                cached_user = await aget_synced_user(request)
+            return cached_user
+
+        request.user = SimpleLazyObject(lambda: get_synced_user(request))  # type: ignore[assignment]
+        request.auser = auser
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        self._install(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        get_response = cast(Callable[[HttpRequest], Awaitable[HttpResponse]], self.get_response)
+        self._install(request)
+        return await get_response(request)
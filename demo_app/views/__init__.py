@@ -1,7 +1,23 @@
+"""
+Views for the demo app.
+
+The DRF views are imported on first use, so a worker only loads Django REST Framework once a DRF endpoint
+is requested: the URLconf routes to them through drf_view().
+"""
+
+from importlib import import_module
+from typing import Any, Callable
+
+from django.http import HttpRequest, HttpResponseBase
+from django.views.decorators.csrf import csrf_exempt
+
 from .auth_views import callback_endpoint, login_endpoint, logout_endpoint
 from .classic_api_views import classic_jwt_hello_world_api, classic_session_hello_world_api
-from .drf_api_views import DrfJwtHelloApi, SessionEndpoint, TokenEndpoint
+from .metrics_views import metrics_endpoint
 from .page_views import ClassicPage, DrfPage, HomePage
+from .session_events_views import session_events_endpoint
+
+_DRF_VIEWS = ("DrfJwtBatchApi", "DrfJwtHelloApi", "SessionEndpoint", "TokenEndpoint")
 
 # Explicit exports
 __all__ = [
@@ -9,11 +25,43 @@ __all__ = [
     "classic_session_hello_world_api",
     "classic_jwt_hello_world_api",
     "ClassicPage",
+    "drf_view",
     "DrfPage",
+    "DrfJwtBatchApi",
     "DrfJwtHelloApi",
     "HomePage",
     "login_endpoint",
     "logout_endpoint",
+    "metrics_endpoint",
+    "session_events_endpoint",
     "SessionEndpoint",
     "TokenEndpoint",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name in _DRF_VIEWS:
+        return getattr(import_module(".drf_api_views", __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def drf_view(name: str) -> Callable[..., HttpResponseBase]:
+    """
+    View function for one of the DRF views, imported and set up with as_view() on its first request.
+
+    Exempt from CsrfViewMiddleware like every APIView; DRF's session authentication enforces CSRF itself.
+    """
+    if name not in _DRF_VIEWS:
+        raise ValueError(f"Unknown DRF view: {name}")
+
+    view: Any = None
+
+    @csrf_exempt
+    def deferred_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        nonlocal view
+        if view is None:
+            view = __getattr__(name).as_view()
+        return view(request, *args, **kwargs)  # type: ignore[no-any-return]
+
+    deferred_view.__name__ = deferred_view.__qualname__ = name
+    return deferred_view
@@ -1,25 +1,31 @@
-from django.contrib.auth import authenticate, login, logout
+from asgiref.sync import sync_to_async
+from django.contrib.auth import alogin, alogout, authenticate
 from django.http import HttpRequest, HttpResponse
 from django.middleware.csrf import get_token
 from django.views.decorators.http import require_GET
 from wristband.django_auth import LogoutConfig, RedirectRequiredCallbackResult, session_from_callback
 
+from ..session_events import LOGIN_ID_SESSION_KEY, new_login_id, session_channel, session_event_hub
+from ..user_sync import adefer_login
 from ..wristband import wristband_auth
 
+# These views are async so that, under ASGI, the outbound calls to Wristband are awaited on the event loop
+# instead of holding a thread. Under WSGI, Django runs them through async_to_sync transparently.
+
 
 @require_GET
-def login_endpoint(request: HttpRequest) -> HttpResponse:
+async def login_endpoint(request: HttpRequest) -> HttpResponse:
     """Construct the authorize request URL and redirect to the Wristband Authorize Endpoint."""
-    return wristband_auth.login(request)  # __WRISTBAND__
+    return await wristband_auth.alogin(request)  # __WRISTBAND__
 
 
 @require_GET
-def callback_endpoint(request: HttpRequest) -> HttpResponse:
+async def callback_endpoint(request: HttpRequest) -> HttpResponse:
     """
     Wristband SDK will fetch token and user data after the user authenticates, store them
     into a new session, and then this view will redirect into the application.
     """
-    callback_result = wristband_auth.callback(request)  # __WRISTBAND__
+    callback_result = await wristband_auth.acallback(request)  # __WRISTBAND__
 
     # Some edges require an immediate redirect to restart the login flow
     if isinstance(callback_result, RedirectRequiredCallbackResult):
@@ -30,12 +36,22 @@ def callback_endpoint(request: HttpRequest) -> HttpResponse:
     session_from_callback(
         request=request,
         callback_data=callback_data,
-        custom_fields={"email": callback_data.user_info.email, "given_name": callback_data.user_info.given_name},
+        custom_fields={
+            "email": callback_data.user_info.email,
+            "given_name": callback_data.user_info.given_name,
+            # Identifies this login's session event streams, across token refreshes (see demo_app/session_events.py)
+            LOGIN_ID_SESSION_KEY: new_login_id(),
+        },
     )
 
-    # Django's auth system: WristbandAuthBackend handles user syncing with custom adapter
-    user = authenticate(request, callback_data=callback_data)
-    login(request, user)
+    # Django's auth system: WristbandAuthBackend handles user syncing with custom adapter. With
+    # WRISTBAND_DEFERRED_USER_SYNC, the sync runs in the background and request.user completes the login later
+    # (see demo_app/user_sync.py).
+    # NOTE: aauthenticate() can't be used here because WristbandAuthBackend only overrides the sync
+    # authenticate(), and the aauthenticate() it inherits from ModelBackend expects a username/password.
+    if not await adefer_login(request, callback_data):
+        user = await sync_to_async(authenticate)(request, callback_data=callback_data)
+        await alogin(request, user)
 
     # This creates the csrftoken cookie and stores the token in the session.
     get_token(request)
@@ -46,17 +62,23 @@ def callback_endpoint(request: HttpRequest) -> HttpResponse:
 
 
 @require_GET
-def logout_endpoint(request: HttpRequest) -> HttpResponse:
+async def logout_endpoint(request: HttpRequest) -> HttpResponse:
     """Log out the user and redirect to the Wristband Logout Endpoint."""
-    # Wristband SDK revokes the refresh token and creates the proper redirect response
+    # Wristband SDK revokes the refresh token and creates the proper redirect response. The revoke is queued for a
+    # background thread (see demo_app/token_revocation.py), so the redirect doesn't wait on Wristband.
     logout_config = LogoutConfig(
         refresh_token=request.session.get("refresh_token"),  # The refresh token you want to revoke
         tenant_name=request.session.get("tenant_name"),  # Wristband Logout requires a tenant level domain
         tenant_custom_domain=request.session.get("tenant_custom_domain"),  # Custom domains takes precedence, if present
     )
-    response = wristband_auth.logout(request, logout_config)  # __WRISTBAND__
+    response = await wristband_auth.alogout(request, logout_config)  # __WRISTBAND__
+
+    # Tell the session's other open tabs (their session event streams) that it has ended
+    login_id = request.session.get(LOGIN_ID_SESSION_KEY)
+    if login_id:
+        session_event_hub.publish(session_channel(login_id), "logout", {"reason": "logout"})
 
-    logout(request)  # Log user out of Django's auth system
+    await alogout(request)  # Log user out of Django's auth system
 
     # Clear the session as well as CSRF cookie
     request.session.flush()
@@ -2,13 +2,11 @@
 API endpoints for the demo app
 """
 
-import json
-from datetime import datetime
-
-from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.http import HttpRequest, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
 
+from demo_app.fast_json import FastJsonResponse, current_timestamp, loads
 from demo_app.wristband import require_jwt, require_session
 
 
@@ -22,20 +20,20 @@ def classic_session_hello_world_api(request: HttpRequest) -> HttpResponse:
 
     try:
         # Parse JSON body
-        data = json.loads(request.body)
+        data = loads(request.body)
         action = data.get("action")
 
         if action != "hello":
-            return JsonResponse({"error": 'Invalid action. Expected "hello".'}, status=400)
+            return FastJsonResponse({"error": 'Invalid action. Expected "hello".'}, status=400)
 
         response_data = {
             "message": "Hello World!",
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": current_timestamp(),
         }
-        return JsonResponse(response_data, status=200)
+        return FastJsonResponse(response_data, status=200)
 
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+    except ValueError:
+        return FastJsonResponse({"error": "Invalid JSON body"}, status=400)
 
 
 # __WRISTBAND__: Protected View
@@ -47,15 +45,14 @@ def classic_jwt_hello_world_api(request: HttpRequest) -> HttpResponse:
     API endpoint using JWT bearer token authentication.
     """
     try:
-        print(request.user)
         # Parse JSON body
-        data = json.loads(request.body)
+        data = loads(request.body)
         action = data.get("action")
         if action != "hello":
-            return JsonResponse({"error": 'Invalid action. Expected "hello".'}, status=400)
+            return FastJsonResponse({"error": 'Invalid action. Expected "hello".'}, status=400)
 
-        response_data = {"message": "Hello World!", "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-        return JsonResponse(response_data, status=200)
+        response_data = {"message": "Hello World!", "timestamp": current_timestamp()}
+        return FastJsonResponse(response_data, status=200)
 
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+    except ValueError:
+        return FastJsonResponse({"error": "Invalid JSON body"}, status=400)
@@ -1,6 +1,4 @@
-from datetime import datetime
-
-from django.http import HttpRequest
+from django.conf import settings
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Empty, Request
@@ -8,29 +6,33 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from wristband.django_auth import JWTAuthResult, get_session_response, get_token_response
 
+from demo_app.api_cache import ConditionalSessionApiMixin
+from demo_app.batch import jwt_hello, run_batch
 from demo_app.wristband import DrfJwtAuth, DrfSessionAuth
 
 
-class SessionEndpoint(APIView):
-    """Returns session information - uses session auth."""
+class SessionEndpoint(ConditionalSessionApiMixin, APIView):
+    """Returns session information - uses session auth. Cacheable, see demo_app/api_cache.py."""
 
     authentication_classes = [DrfSessionAuth]
     permission_classes = [IsAuthenticated]
+    etag_fields = ("tenant_id", "user_id", "email")
 
-    def get(self, request: Request) -> Response:
+    def render_response(self, request: Request) -> Response:
         email = request.session.get("email")
         session_data = get_session_response(request._request, metadata={"email": email})
         return Response(session_data.to_dict())
 
 
-class TokenEndpoint(APIView):
-    """Returns access token - uses session auth."""
+class TokenEndpoint(ConditionalSessionApiMixin, APIView):
+    """Returns access token - uses session auth. Cacheable, see demo_app/api_cache.py."""
 
     authentication_classes = [DrfSessionAuth]
     permission_classes = [IsAuthenticated]
+    etag_fields = ("access_token",)
 
-    def get(self, request: HttpRequest) -> Response:
-        token_data = get_token_response(request)
+    def render_response(self, request: Request) -> Response:
+        token_data = get_token_response(request._request)
         return Response(token_data.to_dict())
 
 
@@ -51,11 +53,29 @@ class DrfJwtHelloApi(APIView):
 
         assert isinstance(request.auth, JWTAuthResult)  # nosec B101
 
-        return Response(
-            {
-                "message": "Hello World from DRF JWT!",
-                "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "userId": request.auth.payload.get("sub"),
-                "tenantId": request.auth.payload.get("tnt_id"),
-            }
-        )
+        return Response(jwt_hello(request.auth))
+
+
+class DrfJwtBatchApi(APIView):
+    """DRF API endpoint running a batch of operations under one Wristband JWT authentication."""
+
+    authentication_classes = [DrfJwtAuth]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request: Request) -> Response:
+        operations = request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"error": "Request body must be a non-empty array of operations."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        max_operations = getattr(settings, "BATCH_MAX_OPERATIONS", 50)
+        if len(operations) > max_operations:
+            return Response(
+                {"error": f"A batch can have at most {max_operations} operations."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        assert isinstance(request.auth, JWTAuthResult)  # nosec B101
+
+        return Response({"results": run_batch(operations, request.auth)})
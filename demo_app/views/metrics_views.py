@@ -0,0 +1,22 @@
+"""
+Metrics endpoint for the demo app
+"""
+
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.http import require_GET
+
+from demo_app.metrics import render_metrics
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_endpoint(request: HttpRequest) -> HttpResponse:
+    """
+    Request and auth-phase latency histograms of this worker process, in Prometheus text format.
+
+    Unauthenticated, like most scrape targets: in production, keep it off the public internet.
+    """
+    response = HttpResponse(render_metrics(), content_type=PROMETHEUS_CONTENT_TYPE)
+    response["Cache-Control"] = "no-store"
+    return response
@@ -2,21 +2,42 @@
 Page Views for the demo app
 """
 
+from functools import partial
+from typing import Any, Optional
+
+from django.http import HttpRequest, HttpResponse
 from django.views.generic import TemplateView
 
+from demo_app.context_processors import get_session_snapshot
+from demo_app.page_cache import ConditionalPageMixin, PrecompressedPage, fast_page_rendering, template_version
 from demo_app.wristband import SessionRequiredMixin
 
+# The home page as anonymous visitors see it, served from memory under FAST_PAGE_RENDERING
+anonymous_home_page = PrecompressedPage()
+
 
-class HomePage(TemplateView):
+class HomePage(ConditionalPageMixin, TemplateView):
     """
     Home page
     """
 
     template_name = "demo_app/home.html"
 
+    def render_page(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        render = partial(super().render_page, request, *args, **kwargs)
+        if fast_page_rendering() and not get_session_snapshot(request).get("is_authenticated"):
+            return anonymous_home_page.response(request, render)
+        return render()
+
+    def last_modified(self, request: HttpRequest) -> Optional[int]:
+        # Anonymous visitors all get the same page, which only changes with the templates
+        if get_session_snapshot(request).get("is_authenticated"):
+            return None
+        return template_version()[1]
+
 
 # __WRISTBAND__: Protected View
-class ClassicPage(SessionRequiredMixin, TemplateView):  # type: ignore
+class ClassicPage(SessionRequiredMixin, ConditionalPageMixin, TemplateView):  # type: ignore
     """
     Hello World with Classic Django Views
     """
@@ -25,7 +46,7 @@ class ClassicPage(SessionRequiredMixin, TemplateView):  # type: ignore
 
 
 # __WRISTBAND__: Protected View
-class DrfPage(SessionRequiredMixin, TemplateView):  # type: ignore
+class DrfPage(SessionRequiredMixin, ConditionalPageMixin, TemplateView):  # type: ignore
     """
     Hello World with Django REST Framework APIs
     """
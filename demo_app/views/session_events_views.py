@@ -0,0 +1,43 @@
+"""
+Session events endpoint for the demo app
+"""
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponseBase, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from demo_app.fast_json import FastJsonResponse
+from demo_app.session_events import LOGIN_ID_SESSION_KEY, opening_events, session_channel, stream_session_events
+
+
+@require_GET
+async def session_events_endpoint(request: HttpRequest) -> HttpResponseBase:
+    """
+    Server-Sent Events for the current session: status, token expiry countdown and logout (see session_events.py).
+
+    Under ASGI the stream stays open on the event loop. Under WSGI it would hold a worker thread, so the
+    response carries only the opening events and the browser's EventSource reconnects after the retry delay, as
+    it does for sessions stored before login IDs were (which can't be told apart from other logins).
+    """
+    # __WRISTBAND__: Reading the session decrypts the cookie; no call to Wristband is needed
+    session = request.session
+    if not session.get("is_authenticated"):
+        return FastJsonResponse({"error": "Not authenticated."}, status=401)
+
+    session_state = {
+        "authenticated": True,
+        "userId": session.get("user_id"),
+        "tenantId": session.get("tenant_id"),
+        "expiresAt": session.get("expires_at"),
+    }
+    login_id = session.get(LOGIN_ID_SESSION_KEY)
+    if isinstance(request, ASGIRequest) and login_id:
+        events = stream_session_events(session_channel(login_id), session_state)
+        response = StreamingHttpResponse(events, content_type="text/event-stream")
+    else:
+        response = StreamingHttpResponse([opening_events(session_state)], content_type="text/event-stream")
+
+    response["Cache-Control"] = "no-store"
+    # Keep nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -3,16 +3,33 @@ __WRISTBAND__: Wristband Django Auth SDK Configuration
 
 This module initializes the Wristband authentication SDK and creates reusable
 authentication decorators, mixins, and DRF authentication classes for your application.
+
+Everything here is lazy: the SDK instance is built, and each decorator, mixin and DRF class is created,
+by the first request that uses it. Importing the views doesn't pay for HTTP clients, TLS contexts or
+JWT validators, which keeps new workers quick to start.
 """
 
+import threading
+from typing import Optional, cast
+
 from django.conf import settings
+from django.utils.functional import SimpleLazyObject
 from wristband.django_auth import (
     AuthConfig,
     AuthStrategy,
     UnauthenticatedBehavior,
-    WristbandAuth,
 )
 
+from .async_auth import AsyncWristbandAuth
+from .claims_user import ClaimsUserMixin
+from .http_client import HttpClientConfig, PooledHttpClientMixin
+from .jwks_cache import SharedJwksMixin
+from .jwt_cache import JwtResultCacheMixin
+from .lazy_auth import LazyAuthDecorator, lazy_auth_mixin, lazy_drf_auth
+from .metrics import MetricsMixin
+from .token_refresh import SingleFlightRefreshMixin
+from .token_revocation import BackgroundRevocationMixin
+
 __all__ = [
     "wristband_auth",
     "require_session",
@@ -26,8 +43,52 @@ __all__ = [
 # ============================================================================
 # Wristband Auth SDK Instance
 # ============================================================================
+# DemoWristbandAuth is a drop-in WristbandAuth that adds:
+#   - alogin(), acallback() and alogout() for the async auth views served under ASGI
+#   - a shared cache of verified JWTs for require_jwt, JwtRequiredMixin and DrfJwtAuth
+#   - one JWKS (signing key) cache for all of its JWT validators, shared by the workers on a host
+#   - request.user built from the verified JWT's claims on those routes, without a database query
+#   - one keep-alive connection pool per worker for its calls to Wristband, configured by
+#     WRISTBAND_AUTH["http_client"]
+#   - single-flight session token refresh, started WRISTBAND_TOKEN_REFRESH_SKEW seconds before expiry
+#   - refresh token revocation on logout in a background thread, so the logout redirect doesn't wait for it
+#   - timing of its calls to Wristband and of JWT validation, exposed at /metrics
+
+
+class DemoWristbandAuth(
+    MetricsMixin,
+    PooledHttpClientMixin,
+    SingleFlightRefreshMixin,
+    JwtResultCacheMixin,
+    SharedJwksMixin,
+    ClaimsUserMixin,
+    BackgroundRevocationMixin,
+    AsyncWristbandAuth,
+):
+    """WristbandAuth for this demo app, extended with the behaviors listed above."""
+
 
-wristband_auth = WristbandAuth(AuthConfig(**settings.WRISTBAND_AUTH))
+_instance: Optional[DemoWristbandAuth] = None
+_instance_lock = threading.Lock()
+
+
+def get_wristband_auth() -> DemoWristbandAuth:
+    """The process-wide DemoWristbandAuth, built from settings.WRISTBAND_AUTH on first call."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                auth_settings = dict(settings.WRISTBAND_AUTH)
+                http_client_settings = auth_settings.pop("http_client", {})
+                _instance = DemoWristbandAuth(
+                    AuthConfig(**auth_settings),
+                    http_client_config=HttpClientConfig(**http_client_settings),
+                )
+    return _instance
+
+
+# Behaves like the DemoWristbandAuth instance; built on first attribute access
+wristband_auth = cast(DemoWristbandAuth, SimpleLazyObject(get_wristband_auth))
 
 # ============================================================================
 # Function-Based View Decorators
@@ -39,14 +100,18 @@ wristband_auth = WristbandAuth(AuthConfig(**settings.WRISTBAND_AUTH))
 #     def dashboard(request):
 #         return render(request, 'dashboard.html')
 
-require_session = wristband_auth.create_auth_decorator(
-    strategies=[AuthStrategy.SESSION],
-    on_unauthenticated=UnauthenticatedBehavior.JSON,
+require_session = LazyAuthDecorator(
+    lambda: wristband_auth.create_auth_decorator(
+        strategies=[AuthStrategy.SESSION],
+        on_unauthenticated=UnauthenticatedBehavior.JSON,
+    )
 )
 
-require_jwt = wristband_auth.create_auth_decorator(
-    strategies=[AuthStrategy.JWT],
-    on_unauthenticated=UnauthenticatedBehavior.JSON,
+require_jwt = LazyAuthDecorator(
+    lambda: wristband_auth.create_auth_decorator(
+        strategies=[AuthStrategy.JWT],
+        on_unauthenticated=UnauthenticatedBehavior.JSON,
+    )
 )
 
 # ============================================================================
@@ -59,14 +124,20 @@ require_jwt = wristband_auth.create_auth_decorator(
 #     class DashboardView(SessionRequiredMixin, TemplateView):
 #         template_name = 'dashboard.html'
 
-SessionRequiredMixin = wristband_auth.create_auth_mixin(
-    strategies=[AuthStrategy.SESSION],
-    on_unauthenticated=UnauthenticatedBehavior.REDIRECT,
+SessionRequiredMixin = lazy_auth_mixin(
+    "SessionRequiredMixin",
+    lambda: wristband_auth.create_auth_decorator(
+        strategies=[AuthStrategy.SESSION],
+        on_unauthenticated=UnauthenticatedBehavior.REDIRECT,
+    ),
 )
 
-JwtRequiredMixin = wristband_auth.create_auth_mixin(
-    strategies=[AuthStrategy.JWT],
-    on_unauthenticated=UnauthenticatedBehavior.JSON,
+JwtRequiredMixin = lazy_auth_mixin(
+    "JwtRequiredMixin",
+    lambda: wristband_auth.create_auth_decorator(
+        strategies=[AuthStrategy.JWT],
+        on_unauthenticated=UnauthenticatedBehavior.JSON,
+    ),
 )
 
 # ============================================================================
@@ -79,6 +150,6 @@ JwtRequiredMixin = wristband_auth.create_auth_mixin(
 #         authentication_classes = [DrfJwtAuth]
 #         permission_classes = [IsAuthenticated]
 
-DrfSessionAuth = wristband_auth.create_drf_session_auth()
+DrfSessionAuth = lazy_drf_auth("DrfSessionAuth", lambda: wristband_auth.create_drf_session_auth())
 
-DrfJwtAuth = wristband_auth.create_drf_jwt_auth()
+DrfJwtAuth = lazy_drf_auth("DrfJwtAuth", lambda: wristband_auth.create_drf_jwt_auth())
@@ -52,6 +52,11 @@ DEBUG = True
 
 ALLOWED_HOSTS = ["localhost", "127.0.0.1"]
 
+# Production page rendering (see demo_app/page_cache.py): cached template loader, cached page fragments,
+# ETag/Last-Modified 304s and a precompressed anonymous home page. Off under DEBUG so template edits show up
+# on reload; set FAST_PAGE_RENDERING=true to try it in development.
+FAST_PAGE_RENDERING = os.environ.get("FAST_PAGE_RENDERING", str(not DEBUG)).lower() == "true"
+
 # Application definition
 INSTALLED_APPS = [
     "django.contrib.admin",
@@ -71,12 +76,17 @@ AUTHENTICATION_BACKENDS = [
 WRISTBAND_AUTH_BACKEND_ADAPTER = "demo_app.adapters.MyWristbandAdapter"
 
 MIDDLEWARE = [
+    "demo_app.metrics.MetricsMiddleware",  # <-- Request latency by URL name for /metrics (first, to time the rest)
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "demo_app.admission.AdmissionControlMiddleware",  # <-- Concurrency limits per route class, see ADMISSION_CONTROL
+    "demo_app.profiling.ProfilingMiddleware",  # <-- Sampled request profiles, see REQUEST_PROFILING_* (off by default)
+    "demo_app.middleware_profiles.RouteMiddlewareProfileMiddleware",  # <-- Lean chain for JWT APIs, see below
     "django.contrib.sessions.middleware.SessionMiddleware",  # <-- Enables session support
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",  # <-- Enforce CSRF protection (optional)
     "django.contrib.auth.middleware.AuthenticationMiddleware",  # <-- Set Django User on "request.user" (optional)
+    "demo_app.user_sync.DeferredUserSyncMiddleware",  # <-- Completes deferred logins, see WRISTBAND_DEFERRED_USER_SYNC
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -101,6 +111,44 @@ TEMPLATES = [
         },
     },
 ]
+if FAST_PAGE_RENDERING:
+    # Compile each template once per process, even with DEBUG on
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [  # type: ignore[index]
+        (
+            "django.template.loaders.cached.Loader",
+            ["django.template.loaders.filesystem.Loader", "django.template.loaders.app_directories.Loader"],
+        ),
+    ]
+
+# Caches. "page_fragments" holds the {% cache %} fragments of the page templates; without
+# FAST_PAGE_RENDERING it is a dummy cache, so every request renders the whole page.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "page_fragments": {
+        "BACKEND": (
+            "django.core.cache.backends.locmem.LocMemCache"
+            if FAST_PAGE_RENDERING
+            else "django.core.cache.backends.dummy.DummyCache"
+        ),
+        "LOCATION": "page-fragments",
+    },
+}
+
+# Django REST Framework: JSON goes through the same encoder as the classic views (orjson, if installed)
+REST_FRAMEWORK = {
+    "DEFAULT_PARSER_CLASSES": [
+        "demo_app.drf_json.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "demo_app.drf_json.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
 
 # __WRISTBAND__: Database required when using WristbandAuthBackend to store Django User objects (optional)
 DATABASES = {
@@ -146,9 +194,11 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+# __WRISTBAND__: Page CSS/JS bundles are minified, content-hashed and precompressed by collectstatic and served
+# with immutable cache headers (see demo_app/static_storage.py)
 STORAGES = {
     "staticfiles": {
-        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+        "BACKEND": "demo_app.static_storage.MinifiedCompressedManifestStaticFilesStorage",
     },
 }
 
@@ -168,10 +218,129 @@ WRISTBAND_AUTH = {
     "wristband_application_vanity_domain": os.environ.get("APPLICATION_VANITY_DOMAIN"),
     "dangerously_disable_secure_cookies": True,  # IMPORTANT: Set to False in Production!!
     "scopes": ["openid", "offline_access", "email", "profile", "roles"],
+    # Demo app only (not an SDK option): connection pool for calls to Wristband, see demo_app/http_client.py
+    "http_client": {
+        "max_connections": 20,
+        "max_keepalive_connections": 10,
+        "keepalive_expiry": 300.0,  # Keep idle connections to Wristband open between logins
+        "http2": False,  # Requires the h2 package
+        "connect_timeout": 5.0,
+        "read_timeout": 15.0,
+    },
 }
 
+# __WRISTBAND__: Admission control (see demo_app/admission.py). Per worker process and route class: at most
+# "max_concurrent" requests run at once, up to "max_queue" more wait up to "queue_timeout" seconds for a slot,
+# and the rest get a 503 with "Retry-After". Login callbacks wait on Wristband, so they get the tightest limit;
+# JWT APIs are cheap and get the loosest, so they stay responsive during a login storm.
+ADMISSION_CONTROL = {
+    "auth_callback": {
+        "views": ["demo_app:callback"],
+        "max_concurrent": 8,
+        "max_queue": 32,
+        "queue_timeout": 5.0,
+        "retry_after": 2,
+    },
+    "session_api": {
+        "views": ["demo_app:classic_session_hello", "demo_app:drf_session", "demo_app:drf_token"],
+        "max_concurrent": 32,
+        "max_queue": 64,
+        "queue_timeout": 1.0,
+        "retry_after": 1,
+    },
+    "jwt_api": {
+        "views": ["demo_app:classic_jwt_hello", "demo_app:drf_jwt_hello", "demo_app:drf_batch"],
+        "max_concurrent": 64,
+        "max_queue": 128,
+        "queue_timeout": 0.5,
+        "retry_after": 1,
+    },
+    "pages": {
+        "views": ["demo_app:home", "demo_app:classic", "demo_app:drf"],
+        "max_concurrent": 32,
+        "max_queue": 64,
+        "queue_timeout": 1.0,
+        "retry_after": 1,
+    },
+}
+
+# __WRISTBAND__: Route-scoped middleware profiles (demo_app/middleware_profiles.py). The JWT APIs authenticate
+# with a bearer token alone, so they skip the session, CSRF, auth, messages and clickjacking middleware.
+MIDDLEWARE_PROFILES = {
+    "jwt_api": {
+        "path_prefixes": ["/api/classic/jwt-", "/api/drf/jwt-", "/api/drf/batch/"],
+        "middleware": ["django.middleware.common.CommonMiddleware"],
+    },
+}
+
+# Session event stream, GET /api/session/events/ (see demo_app/session_events.py): seconds between token
+# countdown events (which double as heartbeats), seconds without session events before the server closes the
+# stream, and seconds the browser waits before reconnecting.
+SESSION_EVENTS_HEARTBEAT = 15
+SESSION_EVENTS_IDLE_TIMEOUT = 300
+SESSION_EVENTS_RETRY = 5
+
+# Sampled request profiling (demo_app/profiling.py): off unless a sample rate or a token is set.
+# Aggregate the profiles with `python manage.py profilereport`.
+REQUEST_PROFILING_SAMPLE_RATE = float(os.environ.get("REQUEST_PROFILING_SAMPLE_RATE", "0"))  # e.g. 0.01 for 1%
+# Requests sending this value in REQUEST_PROFILING_HEADER are always profiled; keep it to admins
+REQUEST_PROFILING_TOKEN = os.environ.get("REQUEST_PROFILING_TOKEN", "")
+REQUEST_PROFILING_HEADER = "X-Demo-Profile"
+REQUEST_PROFILING_DIR = BASE_DIR / "profiles"
+REQUEST_PROFILING_FORMAT = "collapsed"  # Flamegraph-ready stacks; "pstats" for pstats/snakeviz files
+REQUEST_PROFILING_MAX_FILES = 500  # Oldest profiles are deleted beyond this
+
+# Max operations in one request to the JWT batch endpoint, POST /api/drf/batch/ (see demo_app/batch.py)
+BATCH_MAX_OPERATIONS = 50
+
+# __WRISTBAND__: Max number of verified JWTs kept in memory for require_jwt/DrfJwtAuth (0 disables the cache)
+WRISTBAND_JWT_CACHE_SIZE = 1024
+
+# __WRISTBAND__: Share Wristband's signing keys (JWKS) between the workers on a host, through a file that one
+# worker at a time refreshes (demo_app/jwks_cache.py). With WRISTBAND_JWKS_SHARED = False, each JWT validator
+# in each worker fetches the JWKS on its own, as the SDK does.
+WRISTBAND_JWKS_SHARED = True
+WRISTBAND_JWKS_CACHE_DIR = None  # Defaults to the system temp directory; must be writable by this user only
+WRISTBAND_JWKS_CACHE_TTL = 3600  # Seconds keys are used before they're refreshed
+WRISTBAND_JWKS_STALE_TTL = 86400  # Seconds past the TTL that keys are still used while a refresh runs
+WRISTBAND_JWKS_MISS_REFETCH_INTERVAL = 10  # Min seconds between refetches for tokens with an unknown key ID
+
+# __WRISTBAND__: Refresh session access tokens this many seconds before they expire. Concurrent requests
+# that need the same refresh share a single call to Wristband.
+WRISTBAND_TOKEN_REFRESH_SKEW = 30
+WRISTBAND_TOKEN_REFRESH_RESULT_TTL = 10  # Seconds requests still holding the old refresh token reuse a refresh
+
+# __WRISTBAND__: The DRF session and token endpoints send an ETag and Cache-Control: private, max-age, so clients
+# reuse their copy until the token is due for refresh, for at most this many seconds (demo_app/api_cache.py).
+# With 0, clients revalidate every time and get a 304 while the session is unchanged.
+WRISTBAND_SESSION_API_MAX_AGE = 300
+
+# __WRISTBAND__: Revoke refresh tokens on logout in a background thread, so the logout redirect doesn't wait for
+# Wristband (demo_app/token_revocation.py). With a queue size of 0, logout revokes inline, as the SDK does.
+WRISTBAND_REVOCATION_QUEUE_SIZE = 1000  # Max tokens waiting per process; beyond it, logout revokes inline
+WRISTBAND_REVOCATION_MAX_ATTEMPTS = 5  # Attempts per token, for network errors, 429s and 5xx responses
+WRISTBAND_REVOCATION_RETRY_BACKOFF = 0.5  # Seconds before the first retry; doubles after each, up to 30s
+WRISTBAND_REVOCATION_DRAIN_TIMEOUT = 10  # Seconds a worker spends revoking what's still queued when it exits
+
+# __WRISTBAND__: Sync the Django User and groups in a background thread, so the login callback redirects without
+# waiting on the database (demo_app/user_sync.py). request.user waits for a pending sync when a view uses it.
+WRISTBAND_DEFERRED_USER_SYNC = False
+WRISTBAND_USER_SYNC_WORKERS = 2  # Sync threads per process
+WRISTBAND_USER_SYNC_QUEUE_SIZE = 1000  # Max users waiting per process; beyond it, the callback syncs inline
+WRISTBAND_USER_SYNC_TIMEOUT = 5  # Seconds request.user waits for a pending sync before checking the database
+
 # __WRISTBAND__: Django Session Configurations
-SESSION_ENGINE = "wristband.django_auth.sessions.backends.encrypted_cookies"  # Enables encrypted session cookies
+# Enables encrypted session cookies: the SDK's engine, with cookie decryption timed for /metrics.
+# Without the timing: SESSION_ENGINE = "wristband.django_auth.sessions.backends.encrypted_cookies"
+SESSION_ENGINE = "demo_app.sessions.backends.encrypted_cookies"
+# Opt-in: same encrypted cookies, but each process keeps recently decrypted sessions in memory
+# SESSION_ENGINE = "demo_app.sessions.backends.cached_encrypted_cookies"
+WRISTBAND_SESSION_CACHE_SIZE = 1024  # Max decrypted sessions cached per process (0 disables the cache)
+WRISTBAND_SESSION_CACHE_TTL = 300  # Seconds a decrypted session may be served from memory
+# Opt-in: keep sessions on the server; the cookie carries only a signed session ID
+# SESSION_ENGINE = "demo_app.sessions.backends.server_side"
+WRISTBAND_SESSION_STORE = "memory"  # Per-process LRU; "cache" uses CACHES[SESSION_CACHE_ALIAS], e.g. Redis
+WRISTBAND_SESSION_STORE_SIZE = 10000  # Max sessions kept per process by the "memory" store
 SESSION_COOKIE_AGE = 3600  # 1 hour of inactivity
 SESSION_COOKIE_SECURE = False  # IMPORTANT: Set to True in Production!!
 SESSION_COOKIE_HTTPONLY = True  # Prevent JavaScript access to session cookie
@@ -0,0 +1,149 @@
+// Classic Django views page (classic.html). URLs come from the page's data-*-url attributes; tenantName and
+// accessToken from the per-user <script> block the page renders for every request.
+const demoUrls = document.getElementById('classic-demo').dataset;
+
+// Simple tab functionality
+document.getElementById('cookie-tab').addEventListener('click', function(e) {
+    e.preventDefault();
+    
+    // Update tab active states
+    document.getElementById('cookie-tab').classList.add('active');
+    document.getElementById('token-tab').classList.remove('active');
+    
+    // Show/hide content
+    document.getElementById('cookie-pane').style.display = 'block';
+    document.getElementById('token-pane').style.display = 'none';
+    document.getElementById('cookie-pane').classList.add('active');
+    document.getElementById('token-pane').classList.remove('active');
+});
+
+document.getElementById('token-tab').addEventListener('click', function(e) {
+    e.preventDefault();
+    
+    // Update tab active states
+    document.getElementById('token-tab').classList.add('active');
+    document.getElementById('cookie-tab').classList.remove('active');
+    
+    // Show/hide content
+    document.getElementById('token-pane').style.display = 'block';
+    document.getElementById('cookie-pane').style.display = 'none';
+    document.getElementById('token-pane').classList.add('active');
+    document.getElementById('cookie-pane').classList.remove('active');
+});
+
+// Session Authentication API Call
+document.getElementById('cookieApiBtn').addEventListener('click', async function() {
+    const btn = this;
+    const resultDiv = document.getElementById('cookieApiResult');
+    const responseDiv = document.getElementById('cookieApiResponse');
+    
+    // Show loading state
+    btn.disabled = true;
+    btn.textContent = 'Calling API...';
+    
+    try {
+        const response = await fetch(demoUrls.sessionHelloUrl, {
+            method: 'POST',
+            headers: {
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+                'X-CSRFToken': getCookie('csrftoken'),
+                'X-Requested-With': 'XMLHttpRequest'
+            },
+            body: JSON.stringify({ action: 'hello' })
+        });
+
+        // Check for 401 or 403 and redirect to login
+        if (response.status === 401 || response.status === 403) {
+            const loginUrl = new URL(demoUrls.loginUrl, window.location.origin);
+            loginUrl.searchParams.set('return_url', window.location.href);
+
+            // __WRISTBAND__: Use the current session's tenant name if available at time of redirect.
+            if (tenantName) {
+                loginUrl.searchParams.set('tenant_name', tenantName);
+            }
+
+            window.location.href = loginUrl.toString();
+            return;
+        }
+        
+        const data = await response.json();
+        
+        // Show result
+        responseDiv.textContent = JSON.stringify(data, null, 2);
+        resultDiv.style.display = 'block';
+        
+    } catch (error) {
+        responseDiv.textContent = 'Error: ' + error.message;
+        resultDiv.style.display = 'block';
+    } finally {
+        btn.textContent = 'Call Cookie API';
+        btn.disabled = false;
+    }
+});
+
+// JWT Authentication API Call
+document.getElementById('tokenApiBtn').addEventListener('click', async function() {
+    const btn = this;
+    const resultDiv = document.getElementById('tokenApiResult');
+    const responseDiv = document.getElementById('tokenApiResponse');
+    
+    // Show loading state
+    btn.disabled = true;
+    btn.textContent = 'Calling API...';
+    
+    try {
+        // Access token from the per-user block at the top of the page
+        if (!accessToken || accessToken === 'None') {
+            responseDiv.textContent = 'Error: No access token available. Please ensure you are logged in.';
+            resultDiv.style.display = 'block';
+            return;
+        }
+        
+        const response = await fetch(demoUrls.jwtHelloUrl, {
+            method: 'POST',
+            headers: {
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${accessToken}`
+            },
+            body: JSON.stringify({ action: 'hello' })
+        });
+
+        // Check for 401 and redirect to login
+        if (response.status === 401) {
+            const loginUrl = new URL(demoUrls.loginUrl, window.location.origin);
+            loginUrl.searchParams.set('return_url', window.location.href);
+
+            if (tenantName) {
+                loginUrl.searchParams.set('tenant_name', tenantName);
+            }
+
+            window.location.href = loginUrl.toString();
+            return;
+        }
+        
+        const data = await response.json();
+        
+        // Show result
+        responseDiv.textContent = JSON.stringify(data, null, 2);
+        resultDiv.style.display = 'block';
+        
+    } catch (error) {
+        responseDiv.textContent = 'Error: ' + error.message;
+        resultDiv.style.display = 'block';
+    } finally {
+        btn.textContent = 'Call Token API';
+        btn.disabled = false;
+    }
+});
+
+// Helper function to get CSRF token
+function getCookie(name) {
+    const cookies = document.cookie.split(';');
+    for (let cookie of cookies) {
+        const [key, value] = cookie.trim().split('=');
+        if (key === name) return value;
+    }
+    return '';
+}
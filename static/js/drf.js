@@ -0,0 +1,162 @@
+// Django REST Framework page (drf.html). URLs come from the page's data-*-url attributes.
+const demoUrls = document.getElementById('drf-demo').dataset;
+
+let accessToken = null;
+
+// Tab switching functionality
+document.getElementById('session-endpoint-tab').addEventListener('click', function(e) {
+    e.preventDefault();
+    document.getElementById('session-endpoint-tab').classList.add('active');
+    document.getElementById('jwt-flow-tab').classList.remove('active');
+    document.getElementById('session-endpoint-pane').style.display = 'block';
+    document.getElementById('jwt-flow-pane').style.display = 'none';
+    document.getElementById('session-endpoint-pane').classList.add('active');
+    document.getElementById('jwt-flow-pane').classList.remove('active');
+});
+
+document.getElementById('jwt-flow-tab').addEventListener('click', function(e) {
+    e.preventDefault();
+    document.getElementById('jwt-flow-tab').classList.add('active');
+    document.getElementById('session-endpoint-tab').classList.remove('active');
+    document.getElementById('jwt-flow-pane').style.display = 'block';
+    document.getElementById('session-endpoint-pane').style.display = 'none';
+    document.getElementById('jwt-flow-pane').classList.add('active');
+    document.getElementById('session-endpoint-pane').classList.remove('active');
+});
+
+// Session Endpoint API Call
+document.getElementById('sessionEndpointBtn').addEventListener('click', async function() {
+    const btn = this;
+    const resultDiv = document.getElementById('sessionEndpointResult');
+    const responseDiv = document.getElementById('sessionEndpointResponse');
+    
+    btn.disabled = true;
+    btn.textContent = 'Loading...';
+    
+    try {
+        const response = await fetch(demoUrls.sessionUrl, {
+            method: 'GET',
+            headers: {
+                'Accept': 'application/json',
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        });
+
+        if (response.status === 401 || response.status === 403) {
+            const loginUrl = new URL(demoUrls.loginUrl, window.location.origin);
+            loginUrl.searchParams.set('return_url', window.location.href);
+            window.location.href = loginUrl.toString();
+            return;
+        }
+        
+        const data = await response.json();
+        responseDiv.textContent = JSON.stringify(data, null, 2);
+        resultDiv.style.display = 'block';
+        
+    } catch (error) {
+        responseDiv.textContent = 'Error: ' + error.message;
+        resultDiv.style.display = 'block';
+    } finally {
+        btn.textContent = 'Get Session Data';
+        btn.disabled = false;
+    }
+});
+
+// Step 1: Get Access Token
+document.getElementById('getTokenBtn').addEventListener('click', async function() {
+    const btn = this;
+    const resultDiv = document.getElementById('tokenResult');
+    const responseDiv = document.getElementById('tokenResponse');
+    const callJwtBtn = document.getElementById('callJwtApiBtn');
+    
+    btn.disabled = true;
+    btn.textContent = 'Loading...';
+    
+    try {
+        const response = await fetch(demoUrls.tokenUrl, {
+            method: 'GET',
+            headers: {
+                'Accept': 'application/json',
+                'X-Requested-With': 'XMLHttpRequest'
+            }
+        });
+
+        if (response.status === 401 || response.status === 403) {
+            const loginUrl = new URL(demoUrls.loginUrl, window.location.origin);
+            loginUrl.searchParams.set('return_url', window.location.href);
+            window.location.href = loginUrl.toString();
+            return;
+        }
+        
+        const data = await response.json();
+        accessToken = data.accessToken; // Store token
+        responseDiv.textContent = JSON.stringify(data, null, 2);
+        resultDiv.style.display = 'block';
+        
+        // Enable Step 2
+        callJwtBtn.disabled = false;
+        
+    } catch (error) {
+        responseDiv.textContent = 'Error: ' + error.message;
+        resultDiv.style.display = 'block';
+    } finally {
+        btn.textContent = 'Get Access Token';
+        btn.disabled = false;
+    }
+});
+
+// Step 2: Call JWT API
+document.getElementById('callJwtApiBtn').addEventListener('click', async function() {
+    const btn = this;
+    const resultDiv = document.getElementById('jwtApiResult');
+    const responseDiv = document.getElementById('jwtApiResponse');
+    
+    if (!accessToken) {
+        responseDiv.textContent = 'Error: Please get an access token first (Step 1)';
+        resultDiv.style.display = 'block';
+        return;
+    }
+    
+    btn.disabled = true;
+    btn.textContent = 'Calling API...';
+    
+    try {
+        const response = await fetch(demoUrls.jwtHelloUrl, {
+            method: 'POST',
+            headers: {
+                'Accept': 'application/json',
+                'Content-Type': 'application/json',
+                'Authorization': `Bearer ${accessToken}`
+            },
+            body: JSON.stringify({ action: 'hello' })
+        });
+
+        if (response.status === 401) {
+            responseDiv.textContent = 'Error: Token expired or invalid. Please get a new token (Step 1).';
+            resultDiv.style.display = 'block';
+            btn.disabled = false;
+            return;
+        }
+        
+        const data = await response.json();
+        responseDiv.textContent = JSON.stringify(data, null, 2);
+        resultDiv.style.display = 'block';
+        
+    } catch (error) {
+        responseDiv.textContent = 'Error: ' + error.message;
+        resultDiv.style.display = 'block';
+    } finally {
+        btn.textContent = 'Call JWT API';
+        btn.disabled = false;
+    }
+});
+
+// Helper function to get CSRF token (not needed for GET requests, but keeping for consistency)
+function getCookie(name) {
+    const cookies = document.cookie.split(';');
+    for (let cookie of cookies) {
+        const [key, value] = cookie.trim().split('=');
+        if (key === name) return value;
+    }
+    return '';
+}
@@ -0,0 +1,34 @@
+// Session state pushed by the server over one EventSource connection per tab (see demo_app/session_events.py):
+// the access token's expiry countdown in the navbar, and a redirect home when the session is logged out in
+// another tab. The browser reconnects on its own after the server closes an idle stream.
+(function() {
+    const script = document.currentScript;
+    const countdown = document.getElementById('token-countdown');
+    let expiresAt = null;
+
+    function renderCountdown() {
+        if (!countdown || !expiresAt) return;
+        const seconds = Math.max(0, Math.floor((expiresAt - Date.now()) / 1000));
+        const minutes = Math.floor(seconds / 60);
+        countdown.textContent = seconds > 0
+            ? `Token expires in ${minutes}:${String(seconds % 60).padStart(2, '0')}`
+            : 'Token expired';
+        countdown.hidden = false;
+    }
+
+    const events = new EventSource(script.dataset.url);
+
+    events.addEventListener('token', function(e) {
+        const data = JSON.parse(e.data);
+        // Count down from the server's remaining time so a skewed client clock doesn't matter
+        expiresAt = Date.now() + data.expiresIn * 1000;
+        renderCountdown();
+    });
+
+    events.addEventListener('logout', function() {
+        events.close();
+        window.location.href = script.dataset.homeUrl;
+    });
+
+    setInterval(renderCountdown, 1000);
+})();